@@ -0,0 +1,144 @@
+"""Время старта окна лаунчера: до первой отрисовки и до готовности к работе (Qt offscreen).
+
+    python benchmarks/gui_startup.py --runs 10
+    python benchmarks/gui_startup.py --runs 10 --json --fail-above 1.5
+
+Каждый запуск — отдельный процесс Python с чистой временной папкой (APPDATA/HOME): кэш манифеста
+на --versions версий, часть из них установлена. Манифест обновляется с локального зеркала, поэтому
+замер не зависит от интернета. Время считается от запуска процесса:
+  import       — импорт launcher.py
+  first_paint  — первое событие отрисовки окна
+  interactive  — аккаунты, конфиг и список версий из кэша загружены, Play доступна
+  refreshed    — фоновое обновление манифеста с зеркала завершилось
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic import use_home, write_config
+
+METRICS = ('import', 'first_paint', 'interactive', 'refreshed')
+
+
+def child(started: float, timeout: float):
+    marks = {}
+
+    def mark(name: str):
+        marks.setdefault(name, time.time() - started)
+
+    import launcher
+    mark('import')
+    from PyQt5.QtCore import QObject, QEvent, QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                mark('first_paint')
+            return False
+
+    app = QApplication([])
+    window = launcher.MainWindow()
+    watcher = PaintWatcher()
+    window.installEventFilter(watcher)
+    window.data_loaded_signal.connect(lambda: mark('interactive'))
+
+    def refreshed(*args):
+        mark('refreshed')
+        QTimer.singleShot(0, app.quit)
+
+    window.manifest_thread.versions_loaded_signal.connect(refreshed)
+    window.manifest_thread.versions_failed_signal.connect(refreshed)
+    QTimer.singleShot(int(timeout * 1000), app.quit)
+    window.show()
+    app.exec_()
+    window.manifest_thread.wait()
+    print(json.dumps(marks))
+
+
+def make_home(home: str, versions: int, installed: int) -> str:
+    """Временная папка пользователя: кэш манифеста и установленные версии"""
+    minecraft_directory = use_home(home)
+    entries = [{'id': f"1.{i // 10}.{i % 10}", 'type': 'release' if i % 3 else 'snapshot',
+                'url': f"https://example.invalid/v/{i}.json", 'sha1': '0' * 40} for i in range(versions)]
+    os.makedirs(os.path.join(minecraft_directory, 'cache'))
+    with open(os.path.join(minecraft_directory, 'cache', 'version_manifest_v2.json'), 'w', encoding='utf-8') as f:
+        json.dump({'latest': {}, 'versions': entries}, f)
+    for entry in entries[:installed]:
+        version_dir = os.path.join(minecraft_directory, 'versions', entry['id'])
+        os.makedirs(version_dir)
+        with open(os.path.join(version_dir, f"{entry['id']}.json"), 'w', encoding='utf-8') as f:
+            json.dump({'id': entry['id'], 'type': entry['type']}, f)
+    return minecraft_directory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--versions', type=int, default=800)
+    parser.add_argument('--installed', type=int, default=30)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('--fail-above', type=float, help='код возврата 1, если медиана interactive больше (с)')
+    parser.add_argument('--child', type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child is not None:
+        child(args.child, args.timeout)
+        return 0
+
+    from mjnl.mirror_server import MirrorServer
+    work = tempfile.mkdtemp(prefix='mjnl-bench-')
+    try:
+        home = os.path.join(work, 'home')
+        minecraft_directory = make_home(home, args.versions, args.installed)
+        # Зеркало раздаёт ту же папку: манифест с него не изменится, как и при обычном старте
+        server = MirrorServer(minecraft_directory, ('127.0.0.1', 0)).start()
+        write_config(home, server.url, '1.0.0')
+        # launcher.py берёт логотип относительно рабочей папки
+        run_dir = os.path.join(work, 'run')
+        shutil.copytree(os.path.join(ROOT, 'assets'), os.path.join(run_dir, 'assets'))
+        env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+
+        results = {name: [] for name in METRICS}
+        for run in range(args.runs):
+            started = time.time()
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', repr(started), '--timeout', str(args.timeout)],
+                cwd=run_dir, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True
+            ).stdout
+            marks = json.loads(output.decode('utf-8').strip().splitlines()[-1])
+            for name in METRICS:
+                if name in marks:
+                    results[name].append(marks[name])
+            print(f"запуск {run + 1}/{args.runs}: " +
+                  ', '.join(f"{name} {marks[name]:.3f} с" for name in METRICS if name in marks), file=sys.stderr)
+        server.shutdown()
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    summary = {name: {'median': statistics.median(times), 'min': min(times), 'runs': times}
+               for name, times in results.items() if times}
+    if args.json:
+        print(json.dumps({'versions': args.versions, 'installed': args.installed, 'results': summary}, indent=4))
+    else:
+        print(f"\n{'этап':<12} {'медиана, с':>11} {'минимум, с':>11}")
+        for name, result in summary.items():
+            print(f"{name:<12} {result['median']:>11.3f} {result['min']:>11.3f}")
+    interactive = summary.get('interactive', {}).get('median')
+    if args.fail_above is not None and (interactive is None or interactive > args.fail_above):
+        print(f"interactive {interactive} с больше порога {args.fail_above} с", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Время до главного меню с подбором JVM и архивом CDS и без них.
+
+    python benchmarks/jvm_startup.py 1.21.8 --runs 5
+    python benchmarks/jvm_startup.py "1.20.1 fabric" --runs 3 --json
+
+Игра запускается несколько раз в каждой конфигурации. Замер идёт от старта процесса до строки
+лога с маркером (по умолчанию «Sound engine started» — звук поднимается вместе с главным меню),
+после чего процесс завершается. Первый запуск с CDS создаёт архив и в замер не входит: на
+Java 13–18 архив пишется только при нормальном выходе, поэтому игру нужно закрыть вручную.
+
+Это только инструмент замера: результаты зависят от машины и в репозитории не хранятся.
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mjnl.launch import LauncherCore
+from mjnl.verify import VERIFY_OFF
+from mjnl.jvm import java_major_version
+
+
+CONFIGS = [
+    ('baseline', {'jvm_tuning': False, 'cds': False}),
+    ('tuned', {'jvm_tuning': True, 'cds': False}),
+    ('tuned+cds', {'jvm_tuning': True, 'cds': True}),
+]
+
+
+def time_to_marker(cmd: list, marker, timeout: float, wait_exit: bool = False) -> float:
+    started = time.monotonic()
+    process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    elapsed = None
+    try:
+        for raw in iter(process.stdout.readline, b''):
+            if marker.search(raw.decode('utf-8', errors='replace')):
+                elapsed = time.monotonic() - started
+                break
+            if time.monotonic() - started > timeout:
+                break
+        if wait_exit:
+            print('  Закройте игру, чтобы JVM записала архив CDS...', file=sys.stderr)
+            process.wait()
+    finally:
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('version')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--username', default='Bench')
+    parser.add_argument('--minecraft-directory')
+    parser.add_argument('--marker', default='Sound engine started')
+    parser.add_argument('--timeout', type=float, default=300)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    if args.minecraft_directory:
+        minecraft_directory = args.minecraft_directory
+    else:
+        from mjnl.paths import minecraft_directory
+    core = LauncherCore(minecraft_directory)
+    marker = re.compile(args.marker)
+    # Ставим версию заранее, чтобы установка не попала в замер
+    version_to_launch, _ = core.install(args.version)
+    java_major = java_major_version(version_to_launch, minecraft_directory)
+
+    results = {}
+    for name, flags in CONFIGS:
+        cmd = core.prepare_launch(args.version, args.username, verify_mode=VERIFY_OFF, **flags)
+        if flags['cds']:
+            if not core.cds_archives.supported(java_major):
+                print(f"{name}: Java {java_major} не поддерживает динамические архивы CDS, пропуск", file=sys.stderr)
+                continue
+            print(f"{name}: прогревочный запуск (создание архива)", file=sys.stderr)
+            time_to_marker(cmd, marker, args.timeout, wait_exit=java_major < 19)
+            # После прогрева команда ссылается уже на готовый архив
+            cmd = core.prepare_launch(args.version, args.username, verify_mode=VERIFY_OFF, **flags)
+        times = []
+        for run in range(args.runs):
+            elapsed = time_to_marker(cmd, marker, args.timeout)
+            print(f"{name}: запуск {run + 1}/{args.runs}: "
+                  f"{'нет маркера' if elapsed is None else f'{elapsed:.2f} с'}", file=sys.stderr)
+            if elapsed is not None:
+                times.append(elapsed)
+        results[name] = {
+            'runs': times,
+            'median': statistics.median(times) if times else None,
+            'min': min(times) if times else None,
+        }
+
+    if args.json:
+        print(json.dumps({'version': args.version, 'results': results}, indent=4))
+        return
+    baseline = (results.get('baseline') or {}).get('median')
+    print(f"\n{'конфигурация':<12} {'медиана, с':>11} {'минимум, с':>11} {'к baseline':>11}")
+    for name, result in results.items():
+        if result['median'] is None:
+            print(f"{name:<12} {'—':>11} {'—':>11} {'—':>11}")
+            continue
+        ratio = f"{result['median'] / baseline:.2f}x" if baseline else '—'
+        print(f"{name:<12} {result['median']:>11.2f} {result['min']:>11.2f} {ratio:>11}")
+
+
+if __name__ == '__main__':
+    main()
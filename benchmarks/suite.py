@@ -0,0 +1,248 @@
+"""Сквозной бенчмарк лаунчера на синтетической папке игры и локальной заглушке серверов.
+
+    python benchmarks/suite.py --repeat 5 --output before.json
+    python benchmarks/suite.py --repeat 5 --output after.json --compare before.json
+
+Манифест, JSON версий, библиотеки, ассеты и fabric-meta генерирует benchmarks/synthetic.py, а отдаёт
+MirrorServer на 127.0.0.1, поэтому интернет не нужен. Папка лаунчера — сотни установленных версий,
+fabric-алиасы и профили; окно работает в Qt offscreen. Замеры (медиана и минимум по --repeat, с):
+  refresh_versions.cold/.warm         — обновление списка в окне: без кэша манифеста / ответ 304
+  apply_version_filter                — перестроение списка версий окна
+  get_installed_versions.cold/.warm   — скан versions/ / из индекса
+  find_installed_mod_version          — поиск fabric-сборки для каждой версии с Fabric
+  install.vanilla/.fabric             — полная установка в пустую папку
+  build_command.cold/.disk/.warm      — команда запуска: сборка шаблона / шаблон с диска / из памяти
+  verify.fast/.full                   — проверка установленной версии по прогретому индексу хэшей
+
+Результат — JSON с коммитом и параметрами. --compare сравнивает медианы с прошлым файлом
+и возвращает 1, если замер стал медленнее в --threshold раз и больше чем на --min-delta секунд.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import synthetic
+
+
+def measure(fn, repeat: int, setup=None) -> dict:
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return {'median': statistics.median(times), 'min': min(times), 'runs': times}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, check=True).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def gui_benchmarks(minecraft_directory: str, repeat: int, results: dict):
+    import launcher
+    from PyQt5.QtCore import QEventLoop
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    window = launcher.MainWindow()
+    thread = window.manifest_thread
+    loop = QEventLoop()
+    # Слоты окна подключены раньше, поэтому к выходу из цикла список уже перестроен
+    thread.versions_loaded_signal.connect(loop.quit)
+    thread.versions_failed_signal.connect(loop.quit)
+
+    def wait_refresh():
+        loop.exec_()
+        thread.wait()
+        app.processEvents()
+        if window.offline_mode:
+            raise RuntimeError('Окно не получило манифест с заглушки')
+
+    def refresh():
+        window.refresh_versions()
+        wait_refresh()
+
+    def drop_manifest_cache():
+        cache = launcher.core.manifest_cache
+        for path in (cache.manifest_path, cache.meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+        cache._meta = None
+
+    # load_data сам запускает первое обновление списка
+    window.load_data()
+    wait_refresh()
+    results['refresh_versions.cold'] = measure(refresh, repeat, setup=drop_manifest_cache)
+    results['refresh_versions.warm'] = measure(refresh, repeat)
+    results['apply_version_filter'] = measure(window.apply_version_filter, repeat)
+    window.shutdown()
+    window.close()
+
+
+def core_benchmarks(minecraft_directory: str, work: str, base_url: str, info: dict, repeat: int, results: dict):
+    from mjnl.launch import LauncherCore, split_version
+    from mjnl.mirror import MANIFEST_PATH, FABRIC_PREFIX
+    from mjnl.verify import VERIFY_FAST, VERIFY_FULL
+    from mjnl.download import DownloadEngine
+    from mjnl.command_cache import CommandCache
+
+    urls = {'manifest_url': base_url + MANIFEST_PATH, 'meta_url': base_url + FABRIC_PREFIX,
+            'resources_url': base_url + '/assets/objects'}
+    # Один пул загрузки на все установки, как у окна лаунчера
+    engine = DownloadEngine()
+    core = LauncherCore(minecraft_directory, engine, **urls)
+
+    index = core.installed_index
+    results['get_installed_versions.cold'] = measure(index.ids, repeat, setup=index.invalidate)
+    results['get_installed_versions.warm'] = measure(index.ids, repeat)
+    results['find_installed_mod_version'] = measure(
+        lambda: [index.find_mod_version(version_id, 'fabric') for version_id in info['fabric']], repeat)
+
+    state = {'installs': 0}
+
+    def fresh_core():
+        state['installs'] += 1
+        state['core'] = LauncherCore(os.path.join(work, 'installs', str(state['installs'])), engine, **urls)
+
+    def install(version_id: str):
+        version_to_launch, _ = state['core'].install(version_id)
+        if not state['core'].installed_index.is_installed(version_to_launch):
+            raise RuntimeError(f'{version_id} не установилась')
+
+    vanilla, fabric = info['versions'][0], f"{info['fabric'][0]} fabric"
+    results['install.vanilla'] = measure(lambda: install(vanilla), repeat, setup=fresh_core)
+    results['install.fabric'] = measure(lambda: install(fabric), repeat, setup=fresh_core)
+
+    # Команда fabric-алиаса: цепочка inheritsFrom из трёх JSON
+    game_dir = core.profile_dir(*split_version(fabric))
+
+    def build():
+        core.build_command(fabric, 'Bench', game_dir, jvm_tuning=False)
+
+    def drop_command_cache():
+        shutil.rmtree(core.command_cache.cache_dir, ignore_errors=True)
+        core.command_cache = CommandCache(minecraft_directory)
+
+    results['build_command.cold'] = measure(build, repeat, setup=drop_command_cache)
+    results['build_command.disk'] = measure(build, repeat,
+                                            setup=lambda: setattr(core, 'command_cache', CommandCache(minecraft_directory)))
+    results['build_command.warm'] = measure(build, repeat)
+
+    for name, mode in (('verify.fast', VERIFY_FAST), ('verify.full', VERIFY_FULL)):
+        # Первый проход заполняет индекс хэшей и в замер не входит
+        if core.verify(vanilla, mode, repair=False):
+            raise RuntimeError(f'{vanilla}: проверка нашла битые файлы')
+        results[name] = measure(lambda: core.verify(vanilla, mode, repair=False), repeat)
+
+
+def compare(baseline: dict, results: dict, threshold: float, min_delta: float) -> list:
+    """Печатает сравнение медиан с прошлым прогоном. Возвращает замеры, которые стали медленнее."""
+    old_results = baseline.get('results', {})
+    print(f"\nсравнение с {baseline.get('commit') or 'прошлым прогоном'}")
+    print(f"{'замер':<30} {'было, с':>10} {'стало, с':>10} {'отношение':>10}")
+    regressions = []
+    for name, result in results.items():
+        old = old_results.get(name)
+        if not old:
+            print(f"{name:<30} {'—':>10} {result['median']:>10.4f} {'—':>10}")
+            continue
+        ratio = result['median'] / old['median'] if old['median'] else float('inf')
+        slower = ratio > threshold and result['median'] - old['median'] > min_delta
+        if slower:
+            regressions.append(name)
+        print(f"{name:<30} {old['median']:>10.4f} {result['median']:>10.4f} {ratio:>9.2f}x"
+              f"{'  медленнее' if slower else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--versions', type=int, default=400)
+    parser.add_argument('--installed', type=int, default=200)
+    parser.add_argument('--fabric', type=int, default=50, help='сколько установленных версий с Fabric')
+    parser.add_argument('--assets', type=int, default=3000)
+    parser.add_argument('--libraries', type=int, default=60)
+    parser.add_argument('--output', help='куда записать результат (JSON)')
+    parser.add_argument('--json', action='store_true', help='вывести результат в JSON вместо таблицы')
+    parser.add_argument('--compare', help='прошлый результат (JSON) для сравнения')
+    parser.add_argument('--threshold', type=float, default=1.3)
+    parser.add_argument('--min-delta', type=float, default=0.005)
+    parser.add_argument('--keep', action='store_true', help='не удалять временную папку')
+    args = parser.parse_args()
+    params = {key: getattr(args, key) for key in ('repeat', 'versions', 'installed', 'fabric', 'assets', 'libraries')}
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from mjnl.mirror_server import MirrorServer
+    work = tempfile.mkdtemp(prefix='mjnl-suite-')
+    results = {}
+    try:
+        home = os.path.join(work, 'home')
+        minecraft_directory = synthetic.use_home(home)
+        upstream = os.path.join(work, 'upstream')
+        os.makedirs(upstream)
+        # Адрес заглушки нужен до генерации: он попадает в манифест и JSON версий
+        server = MirrorServer(upstream, ('127.0.0.1', 0)).start()
+        started = time.perf_counter()
+        info = synthetic.build_upstream(upstream, server.url, args.versions, args.assets, args.libraries)
+        synthetic.build_game_directory(minecraft_directory, upstream, info, args.installed, args.fabric)
+        synthetic.write_config(home, server.url, info['versions'][0])
+        print(f"синтетические данные: {time.perf_counter() - started:.1f} с ({work})", file=sys.stderr)
+        # launcher.py берёт логотип относительно рабочей папки
+        run_dir = os.path.join(work, 'run')
+        shutil.copytree(os.path.join(ROOT, 'assets'), os.path.join(run_dir, 'assets'))
+        os.chdir(run_dir)
+
+        core_benchmarks(minecraft_directory, work, server.url, info, args.repeat, results)
+        gui_benchmarks(minecraft_directory, args.repeat, results)
+        server.shutdown()
+    finally:
+        os.chdir(ROOT)
+        if not args.keep:
+            shutil.rmtree(work, ignore_errors=True)
+
+    report = {
+        'commit': git_commit(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': params,
+        'results': dict(sorted(results.items())),
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+    if args.json:
+        print(json.dumps(report, indent=4, ensure_ascii=False))
+    else:
+        print(f"\n{'замер':<30} {'медиана, с':>11} {'минимум, с':>11}")
+        for name, result in report['results'].items():
+            print(f"{name:<30} {result['median']:>11.4f} {result['min']:>11.4f}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report['results'], args.threshold, args.min_delta)
+        if regressions:
+            print(f"медленнее порога: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Синтетические данные для бенчмарков.
+
+upstream — папка в формате папки лаунчера со всеми версиями, библиотеками, ассетами, профилями
+Fabric, манифестом и снимком fabric-meta в cache/. Её отдаёт mjnl.mirror_server.MirrorServer, он же
+служит локальной заглушкой серверов Mojang и fabric-meta: адреса в JSON версий ведут на него.
+Папка лаунчера собирается из upstream жёсткими ссылками: сотни установленных версий,
+fabric-версии с алиасами «<версия> fabric» и профилями.
+"""
+import os
+import json
+import time
+import random
+import shutil
+import hashlib
+
+
+LOADER_VERSION = '0.16.0'
+ASSET_INDEX = 'synthetic'
+MAIN_CLASS = 'net.minecraft.client.main.Main'
+FABRIC_MAIN_CLASS = 'net.fabricmc.loader.impl.launch.knot.KnotClient'
+
+
+def use_home(home: str) -> str:
+    """Делает home папкой пользователя для этого процесса и его потомков. Возвращает папку лаунчера.
+
+    Вызывать до импорта mjnl.paths и launcher: путь к папке лаунчера вычисляется при импорте.
+    """
+    os.environ['HOME'] = os.environ['APPDATA'] = os.environ['USERPROFILE'] = home
+    from mjnl.paths import get_minecraft_directory
+    return get_minecraft_directory().replace('minecraft', 'mjnlauncher')
+
+
+def write_config(home: str, mirror_url: str, selected_version: str = ''):
+    """Конфиг окна лаунчера: все версии в списке, а вместо серверов Mojang и fabric-meta — зеркало"""
+    config_dir = os.path.join(home, '.MjnLauncher', 'client')
+    os.makedirs(config_dir, exist_ok=True)
+    with open(os.path.join(config_dir, 'config.json'), 'w', encoding='utf-8') as f:
+        json.dump({'version_filter': 'Все', 'selected_version': selected_version, 'mirror': mirror_url}, f)
+
+
+def version_ids(count: int) -> list:
+    """Версии от новых к старым, как в манифесте Mojang: каждая пятая — снапшот"""
+    ids = []
+    for i in range(count):
+        major, minor = divmod(i, 10)
+        ids.append(f"{major}w{minor:02}a" if i % 5 == 4 else f"1.{major}.{minor}")
+    return list(reversed(ids))
+
+
+def _write(root: str, rel: str, data: bytes) -> dict:
+    path = os.path.join(root, *rel.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return {'sha1': hashlib.sha1(data).hexdigest(), 'size': len(data)}
+
+
+def _json_bytes(data) -> bytes:
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def build_upstream(root: str, base_url: str, versions: int = 300, assets: int = 3000, libraries: int = 60,
+                   libraries_per_version: int = 30, fabric_every: int = 3, seed: int = 1) -> dict:
+    """Генерирует upstream. Возвращает {'versions': [...], 'fabric': [...]} — id версий от новых к старым."""
+    rng = random.Random(seed)
+    objects = {}
+    for i in range(assets):
+        info = _write(root, 'assets/objects/tmp', rng.randbytes(rng.randint(200, 2000)))
+        h = info['sha1']
+        os.makedirs(os.path.join(root, 'assets', 'objects', h[:2]), exist_ok=True)
+        os.replace(os.path.join(root, 'assets', 'objects', 'tmp'), os.path.join(root, 'assets', 'objects', h[:2], h))
+        objects[f"minecraft/textures/synthetic/{i}.png"] = {'hash': h, 'size': info['size']}
+    index = _write(root, f'assets/indexes/{ASSET_INDEX}.json', _json_bytes({'objects': objects}))
+    asset_index = dict(index, id=ASSET_INDEX, url=f"{base_url}/assets/indexes/{ASSET_INDEX}.json",
+                       totalSize=sum(obj['size'] for obj in objects.values()))
+
+    libs = []
+    for i in range(libraries):
+        rel = f"org/synthetic/lib{i}/1.0/lib{i}-1.0.jar"
+        info = _write(root, f'libraries/{rel}', rng.randbytes(rng.randint(5000, 40000)))
+        libs.append({'name': f"org.synthetic:lib{i}:1.0",
+                     'downloads': {'artifact': dict(info, path=rel, url=f"{base_url}/libraries/{rel}")}})
+    loader_rel = f"net/fabricmc/fabric-loader/{LOADER_VERSION}/fabric-loader-{LOADER_VERSION}.jar"
+    loader_info = _write(root, f'libraries/{loader_rel}', rng.randbytes(20000))
+
+    ids = version_ids(versions)
+    manifest, fabric, game = [], [], []
+    released = time.time()
+    for n, version_id in enumerate(ids):
+        start = n % libraries
+        client = _write(root, f'versions/{version_id}/{version_id}.jar', rng.randbytes(4096))
+        data = {
+            'id': version_id,
+            'type': 'snapshot' if 'w' in version_id else 'release',
+            'mainClass': MAIN_CLASS,
+            'assets': ASSET_INDEX,
+            'assetIndex': asset_index,
+            'downloads': {'client': dict(client, url=f"{base_url}/versions/{version_id}/{version_id}.jar")},
+            'libraries': [libs[(start + k) % libraries] for k in range(libraries_per_version)],
+            'arguments': {
+                'game': ['--username', '${auth_player_name}', '--version', '${version_name}',
+                         '--gameDir', '${game_directory}', '--assetsDir', '${assets_root}',
+                         '--assetIndex', '${assets_index_name}', '--uuid', '${auth_uuid}',
+                         '--accessToken', '${auth_access_token}'],
+                'jvm': ['-Djava.library.path=${natives_directory}', '-cp', '${classpath}'],
+            },
+        }
+        info = _write(root, f'versions/{version_id}/{version_id}.json', _json_bytes(data))
+        manifest.append({'id': version_id, 'type': data['type'],
+                         'url': f"{base_url}/versions/{version_id}/{version_id}.json", 'sha1': info['sha1'],
+                         'releaseTime': time.strftime('%Y-%m-%dT%H:%M:%S+00:00', time.gmtime(released - n * 86400))})
+        game.append({'version': version_id, 'stable': data['type'] == 'release'})
+
+        if n % fabric_every == 0:
+            fabric_id = f"fabric-loader-{LOADER_VERSION}-{version_id}"
+            profile = {
+                'id': fabric_id, 'inheritsFrom': version_id, 'type': 'release', 'mainClass': FABRIC_MAIN_CLASS,
+                'arguments': {'game': [], 'jvm': []},
+                'libraries': [{'name': f"net.fabricmc:fabric-loader:{LOADER_VERSION}",
+                               'url': f"{base_url}/libraries/", **loader_info}],
+            }
+            _write(root, f'versions/{fabric_id}/{fabric_id}.json', _json_bytes(profile))
+            fabric.append(version_id)
+
+    _write(root, 'cache/version_manifest_v2.json',
+           _json_bytes({'latest': {'release': ids[0], 'snapshot': ids[0]}, 'versions': manifest}))
+    _write(root, 'cache/fabric_meta.json', _json_bytes({
+        'fetched_at': time.time(), 'game': game, 'loader': [{'version': LOADER_VERSION, 'stable': True}]
+    }))
+    return {'versions': ids, 'fabric': fabric}
+
+
+def _link_tree(src: str, dst: str):
+    for dirpath, _, filenames in os.walk(src):
+        target_dir = os.path.join(dst, os.path.relpath(dirpath, src))
+        os.makedirs(target_dir, exist_ok=True)
+        for name in filenames:
+            target = os.path.join(target_dir, name)
+            if os.path.exists(target):
+                continue
+            try:
+                os.link(os.path.join(dirpath, name), target)
+            except OSError:
+                shutil.copyfile(os.path.join(dirpath, name), target)
+
+
+def build_game_directory(minecraft_directory: str, upstream: str, info: dict, installed: int = 150,
+                         fabric: int = 40):
+    """Папка лаунчера: installed версий (с библиотеками и ассетами), fabric из них — с алиасами и профилями"""
+    _link_tree(os.path.join(upstream, 'cache'), os.path.join(minecraft_directory, 'cache'))
+    _link_tree(os.path.join(upstream, 'assets'), os.path.join(minecraft_directory, 'assets'))
+    _link_tree(os.path.join(upstream, 'libraries'), os.path.join(minecraft_directory, 'libraries'))
+    chosen = info['versions'][:installed]
+    for version_id in chosen:
+        _link_tree(os.path.join(upstream, 'versions', version_id),
+                   os.path.join(minecraft_directory, 'versions', version_id))
+    for version_id in [v for v in info['fabric'] if v in chosen][:fabric]:
+        fabric_id = f"fabric-loader-{LOADER_VERSION}-{version_id}"
+        _link_tree(os.path.join(upstream, 'versions', fabric_id),
+                   os.path.join(minecraft_directory, 'versions', fabric_id))
+        alias_id = f"{version_id} fabric"
+        alias_dir = os.path.join(minecraft_directory, 'versions', alias_id)
+        os.makedirs(alias_dir, exist_ok=True)
+        with open(os.path.join(alias_dir, f"{alias_id}.json"), 'w', encoding='utf-8') as f:
+            json.dump({'id': alias_id, 'inheritsFrom': fabric_id, 'type': 'release'}, f)
+        for sub in ('mods', 'config', 'resourcepacks', 'saves'):
+            os.makedirs(os.path.join(minecraft_directory, 'profiles', f"{version_id}-fabric", sub), exist_ok=True)
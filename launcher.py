@@ -1,208 +1,288 @@
 import os
-import json
-from subprocess import call
+import time
+import threading
 from sys import argv, exit
 
-from PyQt5.QtCore import QThread, pyqtSignal, QSize, Qt
+from PyQt5.QtCore import (
+    QThread, pyqtSignal, QSize, Qt, QAbstractListModel, QModelIndex,
+    QSortFilterProxyModel, QTimer, QEvent
+)
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QComboBox, QProgressBar,
     QPushButton, QApplication, QMainWindow, QHBoxLayout,
-    QInputDialog, QMessageBox
+    QInputDialog, QMessageBox, QLineEdit, QFileDialog
 )
 
-from minecraft_launcher_lib.utils import get_minecraft_directory, get_version_list
-from minecraft_launcher_lib.install import install_minecraft_version
-from minecraft_launcher_lib.command import get_minecraft_command
-try:
-    from minecraft_launcher_lib.fabric import install_fabric as mll_install_fabric  # type: ignore
-except Exception:
-    mll_install_fabric = None
+from mjnl.paths import minecraft_directory, launcher_directory, logs_directory
+from mjnl.manifest import ManifestCache
+from mjnl.launch import LauncherCore, LaunchError
+from mjnl.download import DownloadEngine, DownloadCancelled
+from mjnl.mirror import MirrorError
+from mjnl.verify import VERIFY_FAST
+from mjnl.progress import ProgressAggregator, ProgressSnapshot, format_transfer
+from mjnl.version_list import build_records, VersionSearchIndex
+from mjnl.process import ProcessManager, GameInstance
+from mjnl.logs import LogPipeline
+from mjnl.settings import Settings, Accounts
+from mjnl.timing import LaunchTrace, LaunchRecorder, format_summary, export_diagnostics
  
 
-# Путь установки Minecraft для MjnLauncher
-minecraft_directory = get_minecraft_directory().replace('minecraft', 'mjnlauncher')
+# Установка, кэши и индексы — общие для окна и потоков
+core = LauncherCore(minecraft_directory)
+
+# Фоновая подготовка выбранной версии: скорость по умолчанию (КБ/с), потоки и пауза после выбора (мс)
+PREWARM_LIMIT_KB = 1024
+PREWARM_WORKERS = 2
+PREWARM_DELAY = 2000
+
+# Через сколько мс после показа окна загружать данные, если оно так и не отрисовалось
+LOAD_FALLBACK_DELAY = 100
+
+
+class ManifestThread(QThread):
+    # (список версий, изменился ли он относительно кэша)
+    versions_loaded_signal = pyqtSignal(list, bool)
+    versions_failed_signal = pyqtSignal(str)
+    fabric_meta_updated_signal = pyqtSignal()
+    fabric_meta_failed_signal = pyqtSignal(str)
+
+    def __init__(self, cache: ManifestCache):
+        super().__init__()
+        self.cache = cache
+
+    def run(self):
+        try:
+            changed, versions = self.cache.refresh()
+        except Exception as e:
+            self.versions_failed_signal.emit(str(e))
+            return
+        self.versions_loaded_signal.emit(versions, changed)
+
+        # fabric-meta обновляется по TTL; без сети остаётся сохранённый снимок
+        try:
+            if core.fabric_meta.refresh():
+                self.fabric_meta_updated_signal.emit()
+        except Exception as e:
+            self.fabric_meta_failed_signal.emit(f"{type(e).__name__}: {e}")
+
+
+class PrewarmThread(QThread):
+    """Заранее ставит выбранную версию и готовит запуск: свой медленный пул загрузки, отмена через cancel()"""
+    # (версия, ошибка: пусто — готово, 'cancelled' — отменено)
+    prewarm_finished_signal = pyqtSignal(str, str)
+
+    def __init__(self):
+        super().__init__()
+        self.engine = DownloadEngine(max_workers=PREWARM_WORKERS, bandwidth_limit=PREWARM_LIMIT_KB * 1024)
+        self.version_id = ''
+        self.cancel_event = threading.Event()
+
+    def start_for(self, version_id: str):
+        self.version_id = version_id
+        self.cancel_event = threading.Event()
+        self.start(QThread.LowestPriority)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            core.prewarm(self.version_id, self.engine, self.cancel_event)
+        except DownloadCancelled:
+            self.prewarm_finished_signal.emit(self.version_id, 'cancelled')
+        except LaunchError as e:
+            self.prewarm_finished_signal.emit(self.version_id, e.text)
+        except Exception as e:
+            self.prewarm_finished_signal.emit(self.version_id, str(e) or type(e).__name__)
+        else:
+            self.prewarm_finished_signal.emit(self.version_id, '')
 
 
 class LaunchThread(QThread):
     launch_setup_signal = pyqtSignal(str, str)
-    progress_update_signal = pyqtSignal(int, int, str)
+    # (прогресс, максимум, подпись, байт/с, секунд до конца или -1)
+    progress_update_signal = pyqtSignal(int, int, str, float, float)
     state_update_signal = pyqtSignal(bool)
     message_signal = pyqtSignal(str, str)
 
-    def __init__(self):
+    def __init__(self, process_manager: ProcessManager, prewarm: PrewarmThread, recorder: LaunchRecorder):
         super().__init__()
+        self.process_manager = process_manager
+        self.prewarm = prewarm
+        self.recorder = recorder
         self.launch_setup_signal.connect(self.launch_setup)
         self.version_id = ''
         self.username = ''
-        self.progress = 0
-        self.progress_max = 0
-        self.progress_label = ''
+        self.verify_mode = VERIFY_FAST
+        self.jvm_tuning = True
+        self.use_cds = False
 
     def launch_setup(self, version_id, username):
         self.version_id = version_id
         self.username = username
 
-    def update_progress_label(self, value):
-        self.progress_label = value
-        self.progress_update_signal.emit(self.progress, self.progress_max, self.progress_label)
-
-    def update_progress(self, value):
-        self.progress = value
-        self.progress_update_signal.emit(self.progress, self.progress_max, self.progress_label)
-
-    def update_progress_max(self, value):
-        self.progress_max = value
-        self.progress_update_signal.emit(self.progress, self.progress_max, self.progress_label)
+    def publish_progress(self, snapshot: ProgressSnapshot):
+        self.progress_update_signal.emit(*snapshot)
 
     def run(self):
         self.state_update_signal.emit(True)
+        trace = LaunchTrace(self.version_id)
 
-        def is_version_installed(version_id: str) -> bool:
-            version_dir = os.path.join(minecraft_directory, 'versions', version_id)
-            version_json = os.path.join(version_dir, f"{version_id}.json")
-            version_jar = os.path.join(version_dir, f"{version_id}.jar")
-            return os.path.isdir(version_dir) and os.path.isfile(version_json)
+        # Фоновая подготовка уже отменена; ждём, пока она отпустит файлы, и докачиваем на полной скорости
+        with trace.span('prewarm_wait'):
+            self.prewarm.cancel()
+            self.prewarm.wait()
 
-        def find_installed_mod_version(base_version: str, loader: str) -> str:
-            versions_dir = os.path.join(minecraft_directory, 'versions')
-            try:
-                candidates = []
-                for entry in os.listdir(versions_dir):
-                    if not os.path.isdir(os.path.join(versions_dir, entry)):
-                        continue
-                    name_lower = entry.lower()
-                    if base_version in entry and loader in name_lower:
-                        # проверяем наличие json
-                        if os.path.isfile(os.path.join(versions_dir, entry, f"{entry}.json")):
-                            candidates.append(entry)
-                if candidates:
-                    # Приоритет fabric-loader-* (реальная сборка), затем алиасы
-                    def candidate_key(e: str) -> tuple:
-                        is_loader = e.startswith('fabric-loader-')
-                        return (0 if is_loader else 1, e)
-                    candidates.sort(key=candidate_key)
-                    return candidates[0]
-            except Exception:
-                pass
-            return ''
-
-        def install_modded_if_needed(base_version: str, loader: str) -> str:
-            # Возвращает реальный id установленной модифицированной версии (или пусто при неуспехе)
-            try:
-                # Установка базовой версии перед модлоадером
-                if not is_version_installed(base_version):
-                    install_minecraft_version(
-                        versionid=base_version,
-                        minecraft_directory=minecraft_directory,
-                        callback={
-                            'setStatus': self.update_progress_label,
-                            'setProgress': self.update_progress,
-                            'setMax': self.update_progress_max
-                        }
-                    )
-                if loader == 'fabric' and mll_install_fabric is not None:
-                    mll_install_fabric(
-                        minecraft_version=base_version,
-                        minecraft_directory=minecraft_directory,
-                        callback={
-                            'setStatus': self.update_progress_label,
-                            'setProgress': self.update_progress,
-                            'setMax': self.update_progress_max
-                        }
-                    )
-                else:
-                    pass
-            except Exception:
-                # Игнорируем, попробуем найти локально установленную
-                pass
-            return find_installed_mod_version(base_version, loader)
-
-        # Поддержка синтаксиса отображаемых версий: "<base> <loader>" или просто "<base>"
-        version_to_launch = self.version_id
-        game_dir_override = None
-        loader = ''
-        if ' ' in self.version_id:
-            parts = self.version_id.split()
-            if len(parts) >= 2 and parts[-1].lower() in {'fabric'}:
-                loader = parts[-1].lower()
-                base_version = ' '.join(parts[:-1])
-                # Пытаемся найти уже установленную мод-версию
-                version_to_launch = find_installed_mod_version(base_version, loader)
-                if not version_to_launch:
-                    # Пытаемся установить мод-версию (если есть интернет/установщик)
-                    version_to_launch = install_modded_if_needed(base_version, loader)
-                if not version_to_launch:
-                    self.message_signal.emit('Ошибка установки', f'Не удалось установить {loader} для {base_version}. Проверьте интернет или совместимость версии.')
-                    self.state_update_signal.emit(False)
-                    return
-                # Создаём алиас-версию с читаемым названием, например "1.21.8 fabric"
-                if 'fabric' in version_to_launch.lower():
-                    alias_id = f"{base_version} {loader}"
-                    try:
-                        alias_dir = os.path.join(minecraft_directory, 'versions', alias_id)
-                        alias_json_path = os.path.join(alias_dir, f"{alias_id}.json")
-                        if not os.path.isfile(alias_json_path):
-                            os.makedirs(alias_dir, exist_ok=True)
-                            alias_data = {
-                                'id': alias_id,
-                                'inheritsFrom': version_to_launch,
-                                'type': 'release'
-                            }
-                            with open(alias_json_path, 'w', encoding='utf-8') as f:
-                                json.dump(alias_data, f, indent=4, ensure_ascii=False)
-                        # Алиас нужен для отображения в списке; запуск оставим на реальный fabric id
-                    except Exception:
-                        pass
-                # Для модовой версии используем отдельную папку профиля
-                game_dir_override = os.path.join(minecraft_directory, 'profiles', f"{base_version}-fabric")
-                try:
-                    os.makedirs(game_dir_override, exist_ok=True)
-                    for sub in ['mods', 'config', 'resourcepacks', 'saves']:
-                        os.makedirs(os.path.join(game_dir_override, sub), exist_ok=True)
-                except Exception:
-                    pass
+        # Колбэки приходят на каждый файл; в GUI уходит не больше 30 обновлений в секунду.
+        # Байты и файлы заодно считаются по этапам запуска
+        progress = ProgressAggregator(self.publish_progress)
+        callback = trace.callback(progress.callback())
+        try:
+            cmd = core.prepare_launch(self.version_id, self.username, callback, self.verify_mode,
+                                      self.jvm_tuning, self.use_cds, trace)
+        except LaunchError as e:
+            self.recorder.finish(trace, 'error', f'{e.title}: {e.text}')
+            self.message_signal.emit(e.title, e.text)
+            self.state_update_signal.emit(False)
+            return
+        except Exception as e:
+            # Непредвиденная ошибка не должна оставить кнопку Play выключенной
+            error = f"{type(e).__name__}: {e}"
+            self.recorder.finish(trace, 'error', error)
+            self.message_signal.emit('Ошибка запуска', f'Не удалось подготовить запуск: {error}')
+            self.state_update_signal.emit(False)
+            return
+
+        # Игра живёт отдельно от потока: кнопка Play снова доступна, можно запустить ещё экземпляр
+        try:
+            with trace.span('spawn'):
+                instance = self.process_manager.launch(cmd, self.version_id, self.username)
+        except OSError as e:
+            self.recorder.finish(trace, 'error', str(e))
+            self.message_signal.emit('Ошибка запуска', f'Не удалось запустить игру: {e}')
         else:
-            # Обычная ванильная версия
-            try:
-                if not is_version_installed(version_to_launch):
-                    install_minecraft_version(
-                        versionid=version_to_launch,
-                        minecraft_directory=minecraft_directory,
-                        callback={
-                            'setStatus': self.update_progress_label,
-                            'setProgress': self.update_progress,
-                            'setMax': self.update_progress_max
-                        }
-                    )
-            except Exception:
-                self.message_signal.emit(
-                    'Оффлайн режим',
-                    'Эта версия не установлена локально и не может быть скачана без интернета.'
-                )
-                self.state_update_signal.emit(False)
-                return
-
-        # Запуск игры с ником (offline-режим)
-        options = {
-            'username': self.username,
-            'uuid': '',
-            'token': ''
-        }
-        if game_dir_override:
-            options['gameDirectory'] = game_dir_override
-
-        cmd = get_minecraft_command(
-            version=version_to_launch,
-            minecraft_directory=minecraft_directory,
-            options=options
-        )
-        call(cmd)
+            # Трасса закончится на первой строке вывода игры
+            self.recorder.started(instance, trace)
 
         self.state_update_signal.emit(False)
 
 
+class VersionListModel(QAbstractListModel):
+    """Записи версий (VersionRecord); обновляется точечно — вставками, удалениями и dataChanged"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._records = []
+        self._rows = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._records)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._records[index.row()]
+        if role == Qt.DisplayRole:
+            return record.display
+        if role == Qt.UserRole:
+            return record.key
+        return None
+
+    def record(self, row: int):
+        return self._records[row]
+
+    def row_of(self, key: str) -> int:
+        return self._rows.get(key, -1)
+
+    def keys(self) -> list:
+        return [record.key for record in self._records]
+
+    def set_records(self, records: list):
+        old_keys = self.keys()
+        new_keys = [record.key for record in records]
+        old_set, new_set = set(old_keys), set(new_keys)
+
+        # Дифф возможен, если общие записи не поменяли взаимный порядок (манифест отсортирован по дате)
+        if len(new_set) != len(new_keys) or \
+                [k for k in old_keys if k in new_set] != [k for k in new_keys if k in old_set]:
+            self.beginResetModel()
+            self._records = list(records)
+            self.endResetModel()
+            self._rows = {key: row for row, key in enumerate(new_keys)}
+            return
+
+        # Удаляем пропавшие записи снизу вверх, непрерывными блоками
+        row = len(old_keys) - 1
+        while row >= 0:
+            if old_keys[row] not in new_set:
+                end = row
+                while row > 0 and old_keys[row - 1] not in new_set:
+                    row -= 1
+                self.beginRemoveRows(QModelIndex(), row, end)
+                del self._records[row:end + 1]
+                self.endRemoveRows()
+            row -= 1
+
+        # Вставляем новые записи на их места
+        row = 0
+        while row < len(new_keys):
+            if new_keys[row] not in old_set:
+                start = row
+                while row + 1 < len(new_keys) and new_keys[row + 1] not in old_set:
+                    row += 1
+                self.beginInsertRows(QModelIndex(), start, row)
+                self._records[start:start] = records[start:row + 1]
+                self.endInsertRows()
+            row += 1
+
+        # Обновляем только изменившиеся строки (например, версия стала установленной)
+        for row, record in enumerate(records):
+            if self._records[row] != record:
+                self._records[row] = record
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+        self._rows = {key: row for row, key in enumerate(new_keys)}
+
+
+class VersionFilterProxy(QSortFilterProxyModel):
+    """Фильтр по типу версии и результатам поиска"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.allowed_types = None
+        self.matches = None
+
+    def set_filter(self, allowed_types, matches):
+        if allowed_types == self.allowed_types and matches == self.matches:
+            return
+        self.allowed_types = allowed_types
+        self.matches = matches
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        record = self.sourceModel().record(source_row)
+        if self.allowed_types is not None and record.type not in self.allowed_types:
+            return False
+        if self.matches is not None and record.key not in self.matches:
+            return False
+        return True
+
+
+def format_uptime(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}"
+
+
 class MainWindow(QMainWindow):
+    # Экземпляр игры запущен или завершился (приходит из потока-читателя)
+    instances_changed_signal = pyqtSignal()
+    # Экземпляр завершился с ошибкой сам, а не по кнопке остановки
+    instance_failed_signal = pyqtSignal(int)
+    # Аккаунты, конфиг и список версий из кэша загружены — окно готово к работе
+    data_loaded_signal = pyqtSignal()
+
     def __init__(self):
         super().__init__()
 
@@ -210,16 +290,10 @@ class MainWindow(QMainWindow):
         self.resize(300, 200)
         self.centralwidget = QWidget(self)
 
-        # Путь к файлу с аккаунтами
-        self.users_path = os.path.join(
-            os.getenv('APPDATA'), '.MjnLauncher', 'client', 'users.json'
-        )
-        os.makedirs(os.path.dirname(self.users_path), exist_ok=True)
-
-        # Путь к конфигу лаунчера
-        self.config_path = os.path.join(
-            os.getenv('APPDATA'), '.MjnLauncher', 'client', 'config.json'
-        )
+        # Аккаунты и конфиг лаунчера: читаются при первом обращении, пишутся с отсрочкой и атомарно
+        client_dir = os.path.join(launcher_directory, 'client')
+        self.accounts = Accounts(os.path.join(client_dir, 'users.json'))
+        self.settings = Settings(os.path.join(client_dir, 'config.json'))
 
         # Логотип
         self.logo = QLabel(self.centralwidget)
@@ -251,7 +325,26 @@ class MainWindow(QMainWindow):
         self.version_layout.addWidget(self.version_filter, 3)
         self.version_layout.addWidget(self.refresh_versions_button, 1)
 
+        # Время этапов последних запусков и архив диагностики
+        self.timings_button = QPushButton('⏱', self.centralwidget)
+        self.timings_button.setFixedWidth(30)
+        self.timings_button.setToolTip('Время последних запусков и диагностика')
+        self.timings_button.clicked.connect(self.show_launch_timings)
+        self.version_layout.addWidget(self.timings_button)
+
+        # Поиск по списку версий
+        self.version_search = QLineEdit(self.centralwidget)
+        self.version_search.setPlaceholderText('Поиск версии...')
+        self.version_search.setClearButtonEnabled(True)
+        self.version_search.textChanged.connect(self.apply_version_search)
+
         self.version_select = QComboBox(self.centralwidget)
+        self.version_model = VersionListModel(self)
+        self.version_proxy = VersionFilterProxy(self)
+        self.version_proxy.setSourceModel(self.version_model)
+        self.version_select.setModel(self.version_proxy)
+        self.version_select.currentIndexChanged.connect(self.on_version_selected)
+        self.version_search_index = VersionSearchIndex([])
         self.all_versions = []
         self.offline_mode = False
 
@@ -264,54 +357,145 @@ class MainWindow(QMainWindow):
         self.time_label = QLabel(self.centralwidget)
         self.time_label.setVisible(False)
 
-        # Кнопка запуска игры
+        # Кнопка запуска игры; доступна после загрузки данных
         self.start_button = QPushButton('Play', self.centralwidget)
+        self.start_button.setEnabled(False)
         self.start_button.clicked.connect(self.launch_game)
 
+        # Запущенные экземпляры игры и управление ими
+        self.instance_select = QComboBox(self.centralwidget)
+        self.stop_instance_button = QPushButton('⏹', self.centralwidget)
+        self.stop_instance_button.setFixedWidth(30)
+        self.stop_instance_button.setToolTip('Остановить (повторно — завершить принудительно) или убрать из списка')
+        self.stop_instance_button.clicked.connect(self.stop_instance)
+        self.restart_instance_button = QPushButton('🔁', self.centralwidget)
+        self.restart_instance_button.setFixedWidth(30)
+        self.restart_instance_button.setToolTip('Перезапустить')
+        self.restart_instance_button.clicked.connect(self.restart_instance)
+        self.instance_output_button = QPushButton('📜', self.centralwidget)
+        self.instance_output_button.setFixedWidth(30)
+        self.instance_output_button.setToolTip('Вывод игры')
+        self.instance_output_button.clicked.connect(self.show_instance_output)
+
+        self.instance_widget = QWidget(self.centralwidget)
+        self.instance_layout = QHBoxLayout(self.instance_widget)
+        self.instance_layout.setContentsMargins(0, 0, 0, 0)
+        self.instance_layout.addWidget(self.instance_select, 4)
+        self.instance_layout.addWidget(self.stop_instance_button)
+        self.instance_layout.addWidget(self.restart_instance_button)
+        self.instance_layout.addWidget(self.instance_output_button)
+        self.instance_widget.setVisible(False)
+
         # Основной вертикальный лэйаут
         layout = QVBoxLayout(self.centralwidget)
         layout.setContentsMargins(15, 15, 15, 15)
         layout.addWidget(self.logo, alignment=Qt.AlignHCenter)
         layout.addLayout(self.account_layout)
         layout.addLayout(self.version_layout)
+        layout.addWidget(self.version_search)
         layout.addWidget(self.version_select)
         layout.addWidget(self.start_progress_label)
         layout.addWidget(self.start_progress)
         layout.addWidget(self.time_label)
         layout.addWidget(self.start_button)
+        layout.addWidget(self.instance_widget)
 
         self.setCentralWidget(self.centralwidget)
 
-        self.load_accounts()
-        self.load_config()
-        self.load_versions()
+        # Кэш манифеста версий и фоновый поток его обновления
+        self.manifest_cache = core.manifest_cache
+        self.manifest_thread = ManifestThread(self.manifest_cache)
+        self.manifest_thread.versions_loaded_signal.connect(self.on_versions_loaded)
+        self.manifest_thread.versions_failed_signal.connect(self.on_versions_failed)
+        self.manifest_thread.fabric_meta_updated_signal.connect(self.apply_version_filter)
+        self.manifest_thread.fabric_meta_failed_signal.connect(
+            lambda error: self.log_pipeline.log(f'fabric-meta недоступен, используется сохранённый снимок: {error}', 'WARN')
+        )
 
-        # Поток для запуска игры
-        self.launch_thread = LaunchThread()
+        # Процессы игры; время работы в списке обновляется раз в секунду
+        self.process_manager = ProcessManager(
+            on_change=self.on_instance_changed,
+            on_output=self.on_instance_output
+        )
+        self.instances_changed_signal.connect(self.update_instances)
+        self.instance_failed_signal.connect(self.on_instance_failed)
+        self.instance_timer = QTimer(self)
+        self.instance_timer.setInterval(1000)
+        self.instance_timer.timeout.connect(self.update_instances)
+
+        # Фоновая подготовка выбранной версии (включается в config.json: prewarm_selected)
+        self.prewarm_thread = PrewarmThread()
+        self.prewarm_thread.prewarm_finished_signal.connect(self.on_prewarm_finished)
+        self.prewarm_timer = QTimer(self)
+        self.prewarm_timer.setSingleShot(True)
+        self.prewarm_timer.setInterval(PREWARM_DELAY)
+        self.prewarm_timer.timeout.connect(self.start_prewarm)
+        self._prewarmed_version = ''
+
+        # Этапы запусков: в лог лаунчера и в историю cache/launch_traces.jsonl
+        self.launch_recorder = LaunchRecorder(core.launch_traces, lambda text: self.log_pipeline.log(text))
+
+        # Поток для установки и запуска игры
+        self.launch_thread = LaunchThread(self.process_manager, self.prewarm_thread, self.launch_recorder)
         self.launch_thread.state_update_signal.connect(self.state_update)
         self.launch_thread.progress_update_signal.connect(self.update_progress)
         self.launch_thread.message_signal.connect(self.show_message)
+        self.launch_thread.message_signal.connect(
+            lambda title, text: self.log_pipeline.log(f'{title}: {text}', 'WARN')
+        )
+
+        # Диск и сеть — только после первой отрисовки окна (load_data)
+        self._loaded = False
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # Окно уже нарисовано — теперь можно читать диск
+        if not self._loaded:
+            QTimer.singleShot(0, self.load_data)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Если отрисовки не будет (например, окно свёрнуто), загружаемся всё равно
+        if not self._loaded:
+            QTimer.singleShot(LOAD_FALLBACK_DELAY, self.load_data)
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        # Аккаунт могли добавить в другом окне лаунчера: проверяем mtime, когда окно снова активно
+        if event.type() == QEvent.ActivationChange and self.isActiveWindow() and self._loaded:
+            if self.accounts.reload():
+                self.load_accounts()
+
+    def load_data(self):
+        """Загрузка по шагам после показа окна: логи, аккаунты, конфиг, версии из кэша, затем сеть в фоне"""
+        if self._loaded:
+            return
+        self._loaded = True
+        # Логи лаунчера и вывод игр пишутся в фоне в %APPDATA%/.MjnLauncher/logs, старые — в архивы .log.gz
+        self.log_pipeline = LogPipeline(logs_directory)
+        self.log_pipeline.log(f'MJNL запущен, папка игры: {minecraft_directory}')
+        core.fabric_meta.load()
+
+        self.load_accounts()
+        self.load_config()
+        self.load_versions()
+        self.start_button.setEnabled(True)
+        self.data_loaded_signal.emit()
 
     def load_accounts(self):
+        # Список из памяти: файл уже прочитан хранилищем
+        current = self.account_type.currentText()
         self.account_type.clear()
-        try:
-            with open(self.users_path, 'r', encoding='utf-8') as f:
-                users = json.load(f)
-                for user in users:
-                    self.account_type.addItem(user.get('nickname', 'Unknown'))
-        except Exception:
-            self.account_type.addItem('Player')
+        self.account_type.addItems(self.accounts.nicknames() or ['Player'])
+        index = self.account_type.findText(current)
+        if index >= 0:
+            self.account_type.setCurrentIndex(index)
 
     def load_config(self):
-        self._config = {}
-        try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self._config = json.load(f)
-        except Exception:
-            self._config = {}
+        config = self.settings
 
         # Восстанавливаем фильтр версий, если сохранён
-        saved_filter = self._config.get('version_filter')
+        saved_filter = config.get('version_filter')
         if isinstance(saved_filter, str):
             self.version_filter.blockSignals(True)
             idx = self.version_filter.findText(saved_filter)
@@ -319,185 +503,263 @@ class MainWindow(QMainWindow):
                 self.version_filter.setCurrentIndex(idx)
             self.version_filter.blockSignals(False)
 
+        # Ограничение скорости загрузки, КБ/с (0 или отсутствие — без ограничения)
+        try:
+            limit_kb = int(config.get('download_limit_kb', 0) or 0)
+        except (TypeError, ValueError):
+            limit_kb = 0
+        core.download_engine.set_bandwidth_limit(limit_kb * 1024 if limit_kb > 0 else None)
+
+        # Фоновая подготовка качает не быстрее prewarm_limit_kb и общего ограничения
+        try:
+            prewarm_kb = int(config.get('prewarm_limit_kb', PREWARM_LIMIT_KB) or PREWARM_LIMIT_KB)
+        except (TypeError, ValueError):
+            prewarm_kb = PREWARM_LIMIT_KB
+        if limit_kb > 0:
+            prewarm_kb = min(prewarm_kb, limit_kb)
+        self.prewarm_thread.engine.set_bandwidth_limit(max(prewarm_kb, 1) * 1024)
+
+        # Зеркало в локальной сети или папка другого лаунчера вместо серверов Mojang и Fabric
+        mirror = config.get('mirror') or None
+        try:
+            core.set_mirror(mirror)
+        except MirrorError as e:
+            self.log_pipeline.log(f'Зеркало недоступно: {e}', 'WARN')
+            QMessageBox.warning(self, 'Зеркало', f'Зеркало не используется: {e}')
+        else:
+            if mirror:
+                self.log_pipeline.log(f'Зеркало: {mirror}')
+        self.prewarm_thread.engine.mirror = core.mirror
+
+        # Проверка файлов перед запуском: 'fast' (jar-файлы), 'full' (всё, включая ассеты) или 'off'
+        self.launch_thread.verify_mode = config.get('verify_before_launch', VERIFY_FAST)
+
+        # Память и GC под систему и версию; архив CDS — только если пользователь согласился
+        self.launch_thread.jvm_tuning = bool(config.get('jvm_auto_tune', True))
+        self.launch_thread.use_cds = bool(config.get('jvm_cds', False))
+
         # Сохраняем желаемую версию для установки после загрузки списка
-        self._desired_version = self._config.get('selected_version')
+        self._desired_version = config.get('selected_version')
 
     def load_versions(self):
+        # Сразу показываем последний сохранённый манифест, сеть опрашиваем в фоне
+        cached = self.manifest_cache.load()
+        if cached:
+            self.all_versions = cached
+            self.offline_mode = False
+            self.version_filter.setDisabled(False)
+            self.apply_version_filter()
+            self.restore_desired_version(keep_pending=True)
         self.refresh_versions()
 
     def refresh_versions(self):
-        """Обновляет список доступных версий из интернета"""
+        """Запускает фоновое обновление списка версий из интернета"""
+        if self.manifest_thread.isRunning():
+            return
         # Показываем прогресс загрузки
         self.refresh_versions_button.setEnabled(False)
         self.refresh_versions_button.setText("🔄 Загрузка...")
-        
-        # Пытаемся получить список доступных версий из сети
-        try:
-            self.all_versions = get_version_list()
-            self.offline_mode = False
-            self.refresh_versions_button.setText("🔄 Обновить")
-            self.refresh_versions_button.setEnabled(True)
-        except Exception as e:
-            # Оффлайн-режим: берём только локально установленные версии
-            self.all_versions = self.get_installed_versions()
-            self.offline_mode = True
-            self.refresh_versions_button.setText("🔄 Обновить (офлайн)")
-            self.refresh_versions_button.setEnabled(True)
-            # Показываем сообщение об ошибке только если это не первая загрузка
-            if hasattr(self, '_first_load_done'):
-                QMessageBox.warning(self, "Ошибка сети", 
-                    f"Не удалось загрузить список версий из интернета.\n"
-                    f"Показываются только установленные версии.\n"
-                    f"Ошибка: {str(e)}")
-
-        # В оффлайне отключаем фильтр типов, в онлайне включаем
-        self.version_filter.setDisabled(self.offline_mode)
+        self.manifest_thread.start()
+
+    def on_versions_loaded(self, versions: list, changed: bool):
+        was_offline = self.offline_mode
+        self.offline_mode = False
+        self.refresh_versions_button.setText("🔄 Обновить")
+        self.refresh_versions_button.setEnabled(True)
+        self.version_filter.setDisabled(False)
+
+        # Перестраиваем список только если что-то поменялось
+        if changed or was_offline or not self.all_versions:
+            self.all_versions = versions
+            self.apply_version_filter()
+            self.restore_desired_version()
+        self._first_load_done = True
+
+    def on_versions_failed(self, error: str):
+        # Оффлайн-режим: берём только локально установленные версии
+        self.all_versions = self.get_installed_versions()
+        self.offline_mode = True
+        self.refresh_versions_button.setText("🔄 Обновить (офлайн)")
+        self.refresh_versions_button.setEnabled(True)
+        # Показываем сообщение об ошибке только если это не первая загрузка
+        if hasattr(self, '_first_load_done'):
+            QMessageBox.warning(self, "Ошибка сети",
+                f"Не удалось загрузить список версий из интернета.\n"
+                f"Показываются только установленные версии.\n"
+                f"Ошибка: {error}")
+
+        # В оффлайне отключаем фильтр типов
+        self.version_filter.setDisabled(True)
 
         self.apply_version_filter()
+        self.restore_desired_version()
 
-        # Восстанавливаем выбранную версию из конфигурации, если она есть в списке
-        if getattr(self, '_desired_version', None):
-            # Ищем версию по чистому имени (без иконки)
-            for i in range(self.version_select.count()):
-                item_text = self.version_select.itemText(i)
-                clean_text = item_text.replace("✅ ", "").replace("⬇️ ", "")
-                if clean_text == self._desired_version:
-                    self.version_select.setCurrentIndex(i)
-                    break
-            self._desired_version = None
-        
         # Отмечаем, что первая загрузка завершена
         self._first_load_done = True
 
-    def apply_version_filter(self):
-        # Сохраняем текущий выбор, чтобы попытаться восстановить после фильтрации
-        previous_selection = self.version_select.currentText() if self.version_select.count() > 0 else ''
+    def restore_desired_version(self, keep_pending: bool = False):
+        # Восстанавливаем выбранную версию из конфигурации, если она есть в списке
+        if getattr(self, '_desired_version', None):
+            if self.select_version(self._desired_version):
+                self._desired_version = None
+                # Сохранённый выбор — вероятная цель следующего запуска
+                self.schedule_prewarm()
+            # В кэше версии может не быть — тогда ждём свежий список из сети
+            if not keep_pending:
+                self._desired_version = None
+
+    def current_version_id(self) -> str:
+        """Выбранная версия без иконки статуса, например "1.21.8 fabric" """
+        return self.version_select.currentData(Qt.UserRole) or ''
+
+    def select_version(self, key: str) -> bool:
+        source_row = self.version_model.row_of(key)
+        if source_row < 0:
+            return False
+        proxy_index = self.version_proxy.mapFromSource(self.version_model.index(source_row))
+        if not proxy_index.isValid():
+            return False
+        self.version_select.setCurrentIndex(proxy_index.row())
+        return True
 
-        # Определяем режим фильтра
+    def current_allowed_types(self):
         if getattr(self, 'offline_mode', False):
             # В офлайне типы неизвестны, показываем все установленное
-            allowed_types = None
-        else:
-            mode = self.version_filter.currentText()
-            if mode == 'Релизы':
-                allowed_types = {'release'}
-            elif mode == 'Снапшоты':
-                allowed_types = {'snapshot'}
-            else:
-                allowed_types = None  # Все
-
-        # Перезаполняем список версий
-        self.version_select.blockSignals(True)
-        self.version_select.clear()
-
-        versions = self.all_versions
-        if allowed_types is not None:
-            versions = [v for v in versions if v.get('type') in allowed_types]
-
-        for version in versions:
-            vid = version.get('id')
-            if not vid:
-                continue
-            
-            # Проверяем, установлена ли версия
-            is_installed = self.is_version_installed(vid)
-            status_icon = "✅" if is_installed else "⬇️"
-            
-            # Добавляем базовую версию с индикатором статуса
-            display_name = f"{status_icon} {vid}"
-            self.version_select.addItem(display_name)
-            
-            # В онлайне добавляем «виртуальные» записи: только fabric (если поддерживается)
-            if not getattr(self, 'offline_mode', False):
-                if self.is_fabric_supported_for(vid):
-                    fabric_display = f"{status_icon} {vid} fabric"
-                    self.version_select.addItem(fabric_display)
+            return None
+        mode = self.version_filter.currentText()
+        if mode == 'Релизы':
+            return {'release'}
+        elif mode == 'Снапшоты':
+            return {'snapshot'}
+        return None  # Все
+
+    def apply_version_filter(self):
+        # Сохраняем текущий выбор, чтобы попытаться восстановить после фильтрации
+        previous_selection = self.current_version_id()
+
+        records = build_records(
+            self.all_versions,
+            core.installed_index.installed_set(),
+            getattr(self, 'offline_mode', False),
+            self.is_fabric_supported_for
+        )
 
+        self.version_select.blockSignals(True)
+        self.version_model.set_records(records)
+        self.version_search_index = VersionSearchIndex(self.version_model.keys())
+        self.version_proxy.set_filter(
+            self.current_allowed_types(),
+            self.version_search_index.match(self.version_search.text())
+        )
         # Восстанавливаем выбор, если возможно
         if previous_selection:
-            # Ищем по чистому имени (без иконки)
-            clean_previous = previous_selection.replace("✅ ", "").replace("⬇️ ", "")
-            for i in range(self.version_select.count()):
-                item_text = self.version_select.itemText(i)
-                clean_text = item_text.replace("✅ ", "").replace("⬇️ ", "")
-                if clean_text == clean_previous:
-                    self.version_select.setCurrentIndex(i)
-                    break
+            self.select_version(previous_selection)
+        self.version_select.blockSignals(False)
+
+    def apply_version_search(self, text: str):
+        previous_selection = self.current_version_id()
+        self.version_select.blockSignals(True)
+        self.version_proxy.set_filter(self.current_allowed_types(), self.version_search_index.match(text))
+        if previous_selection:
+            self.select_version(previous_selection)
         self.version_select.blockSignals(False)
 
     def is_version_installed(self, version_id: str) -> bool:
         """Проверяет, установлена ли версия локально"""
-        version_dir = os.path.join(minecraft_directory, 'versions', version_id)
-        version_json = os.path.join(version_dir, f"{version_id}.json")
-        return os.path.isdir(version_dir) and os.path.isfile(version_json)
+        return core.installed_index.is_installed(version_id)
 
     def is_fabric_supported_for(self, mc_version: str) -> bool:
-        # Грубая эвристика: Fabric официально поддерживает 1.14+; более точно можно опросить fabric-meta
-        try:
-            parts = mc_version.split('.')
-            # Ожидаем формат X.Y[.Z]
-            major = int(parts[0]) if len(parts) > 0 else 0
-            minor = int(parts[1]) if len(parts) > 1 else 0
-            return (major > 1) or (major == 1 and minor >= 14)
-        except Exception:
-            return False
+        # Точный список из fabric-meta (кэш на диске), поиск O(1)
+        return core.fabric_meta.supports(mc_version)
 
     def get_installed_versions(self):
-        versions_dir = os.path.join(minecraft_directory, 'versions')
-        result = []
-        try:
-            if not os.path.isdir(versions_dir):
-                return result
-            for entry in os.listdir(versions_dir):
-                entry_path = os.path.join(versions_dir, entry)
-                if not os.path.isdir(entry_path):
-                    continue
-                # Установленная версия обычно имеет файл <version>/<version>.json
-                json_manifest = os.path.join(entry_path, f"{entry}.json")
-                if os.path.isfile(json_manifest):
-                    result.append({'id': entry})
-        except Exception:
-            pass
-        return result
+        return [{'id': entry} for entry in core.installed_index.ids()]
 
     def on_version_filter_changed(self):
-        self.apply_version_filter()
+        # Смена фильтра не меняет записи — достаточно перефильтровать прокси
+        self.apply_version_search(self.version_search.text())
         self.save_config()
 
     def save_config(self):
-        cfg = dict(self._config) if hasattr(self, '_config') else {}
-        cfg['version_filter'] = self.version_filter.currentText()
+        # До загрузки конфига сохранять нечего: фильтр и выбор ещё не восстановлены
+        if not self._loaded:
+            return
+        values = {'version_filter': self.version_filter.currentText()}
         # Текущая выбранная версия (без иконки)
         if self.version_select.count() > 0:
-            display_text = self.version_select.currentText()
-            clean_version = display_text.replace("✅ ", "").replace("⬇️ ", "")
-            cfg['selected_version'] = clean_version
+            values['selected_version'] = self.current_version_id()
+        # Хранилище пишет файл с отсрочкой и только если значения поменялись
+        self.settings.update(values)
+        self.schedule_prewarm()
+
+    def on_version_selected(self):
+        # Выбор сразу сохраняется; подготовка версии начнётся после короткой паузы
+        if self.current_version_id():
+            self.save_config()
+
+    def schedule_prewarm(self):
+        """Перезапускает отсчёт до фоновой подготовки выбранной версии; прежняя подготовка отменяется"""
+        version_id = self.current_version_id()
+        if self.prewarm_thread.isRunning() and self.prewarm_thread.version_id != version_id:
+            self.prewarm_thread.cancel()
+        if not self.settings.get('prewarm_selected', False) or self.offline_mode:
+            self.prewarm_timer.stop()
+            return
+        if not version_id or version_id == self._prewarmed_version:
+            return
+        if self.prewarm_thread.isRunning() and self.prewarm_thread.version_id == version_id:
+            return
+        self.prewarm_timer.start()
+
+    def start_prewarm(self):
+        version_id = self.current_version_id()
+        # Во время запуска сеть и диск нужны ему; после запуска версия уже готова
+        if not version_id or self.launch_thread.isRunning():
+            return
+        if self.prewarm_thread.isRunning():
+            # Отменённая подготовка ещё дописывает текущий кусок файла — попробуем чуть позже
+            self.prewarm_timer.start()
+            return
+        self.log_pipeline.log(f'Фоновая подготовка {version_id}')
+        self.prewarm_thread.start_for(version_id)
+
+    def on_prewarm_finished(self, version_id: str, error: str):
+        if not error:
+            self._prewarmed_version = version_id
+            self.log_pipeline.log(f'{version_id} подготовлена к запуску')
+            # Иконки установленных версий в списке
+            self.apply_version_filter()
+        elif error == 'cancelled':
+            self.log_pipeline.log(f'Фоновая подготовка {version_id} отменена')
+        else:
+            self.log_pipeline.log(f'Фоновая подготовка {version_id} не удалась: {error}', 'WARN')
+
+    def shutdown(self):
+        # При выходе поток подготовки должен завершиться раньше, чем Qt удалит объект
+        self.prewarm_timer.stop()
+        self.prewarm_thread.cancel()
+        self.prewarm_thread.wait()
+        # Отложенная запись настроек не должна пропасть
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(cfg, f, indent=4, ensure_ascii=False)
-            self._config = cfg
-        except Exception:
+            self.settings.flush()
+        except OSError:
             pass
+        if self._loaded:
+            self.log_pipeline.close()
 
     def add_account(self):
         nick, ok = QInputDialog.getText(self, "Добавить аккаунт", "Введите никнейм:")
         if ok and nick.strip():
             nick = nick.strip()
             try:
-                with open(self.users_path, 'r', encoding='utf-8') as f:
-                    users = json.load(f)
-            except Exception:
-                users = []
-
-            if any(u.get('nickname') == nick for u in users):
+                added = self.accounts.add(nick)
+            except OSError as e:
+                QMessageBox.warning(self, "Ошибка", f"Не удалось сохранить аккаунт: {e}")
+                return
+            if not added:
                 QMessageBox.warning(self, "Ошибка", "Такой аккаунт уже существует.")
                 return
 
-            users.append({'nickname': nick})
-
-            with open(self.users_path, 'w', encoding='utf-8') as f:
-                json.dump(users, f, indent=4, ensure_ascii=False)
-
             self.load_accounts()
             index = self.account_type.findText(nick)
             if index >= 0:
@@ -508,36 +770,164 @@ class MainWindow(QMainWindow):
         self.start_progress.setVisible(value)
         self.start_progress_label.setVisible(value)
         self.time_label.setVisible(False)
+        self.time_label.clear()
 
-    def update_progress(self, progress: int, max_progress: int, label: str):
+    def update_progress(self, progress: int, max_progress: int, label: str, speed: float, eta: float):
         self.start_progress.setMaximum(max_progress)
         self.start_progress.setValue(progress)
         self.start_progress_label.setText(label)
+        transfer = format_transfer(ProgressSnapshot(progress, max_progress, label, speed, eta))
+        self.time_label.setText(transfer)
+        self.time_label.setVisible(bool(transfer))
 
     def launch_game(self):
         nick = self.account_type.currentText()
         if not nick:
             nick = 'Player'
         
-        # Извлекаем чистую версию из отображаемого имени (убираем иконку)
-        display_text = self.version_select.currentText()
-        version_id = display_text.replace("✅ ", "").replace("⬇️ ", "")
+        version_id = self.current_version_id()
+        if not version_id:
+            return
         
+        if 'jvm_cds' not in self.settings:
+            self.offer_cds()
+
+        # Запуск важнее фоновой подготовки: она отменяется, уже скачанное пригодится
+        self.prewarm_timer.stop()
+        self.prewarm_thread.cancel()
+        self.log_pipeline.log(f'Запуск {version_id} ({nick})')
         self.launch_thread.launch_setup_signal.emit(version_id, nick)
         self.launch_thread.start()
+        # Запуск сам подготовит версию — повторная фоновая подготовка не нужна
+        self._prewarmed_version = version_id
         # Сохраняем выбранную версию на момент запуска
-        try:
-            self.save_config()
-        except Exception:
-            pass
+        self.save_config()
+
+    def offer_cds(self):
+        # Спрашиваем один раз, ответ сохраняется в config.json (jvm_cds)
+        answer = QMessageBox.question(
+            self, 'Ускорить запуск',
+            'Создавать для каждой версии архив классов Java (CDS)?\n\n'
+            'Первый запуск версии будет обычным, следующие обычно быстрее. '
+            'Архивы хранятся в cache/cds и занимают десятки мегабайт.'
+        )
+        self.settings.set('jvm_cds', answer == QMessageBox.Yes)
+        self.launch_thread.use_cds = self.settings.get('jvm_cds')
 
     def show_message(self, title: str, text: str):
         QMessageBox.information(self, title, text)
 
+    def on_instance_output(self, instance: GameInstance, line: str):
+        # Вызывается из потока-читателя на каждую строку
+        self.log_pipeline.write(f"[#{instance.id} {instance.version_id}] {line}")
+        self.launch_recorder.on_output(instance)
+
+    def on_instance_changed(self, instance: GameInstance):
+        # Вызывается из потока-читателя: только лог и сигналы
+        if instance.running:
+            self.log_pipeline.log(f'#{instance.id} {instance.version_id} ({instance.username}) запущен, PID {instance.pid}')
+        else:
+            self.log_pipeline.log(f'#{instance.id} {instance.version_id} завершился с кодом {instance.exit_code}')
+            self.launch_recorder.on_exit(instance)
+            if instance.exit_code != 0 and not instance.stop_requested:
+                self.instance_failed_signal.emit(instance.id)
+        self.instances_changed_signal.emit()
+
+    def on_instance_failed(self, instance_id: int):
+        instance = self.process_manager.get(instance_id)
+        if instance is None:
+            return
+        text = f'{instance.version_id} завершилась с кодом {instance.exit_code}.'
+        # Строка краша этого экземпляра из индекса текущего лога, если она есть
+        prefix = f'[#{instance.id} '
+        crashes = [crash['text'] for crash in self.log_pipeline.crashes if crash['text'].startswith(prefix)]
+        if crashes:
+            text += f"\n\n{crashes[-1].split('] ', 1)[-1]}"
+        text += '\n\nПодробности — в logs/latest.log (или кнопка 📜).'
+        self.show_message('Игра завершилась с ошибкой', text)
+
+    def update_instances(self):
+        instances = self.process_manager.instances()
+        current_id = self.instance_select.currentData()
+        self.instance_select.blockSignals(True)
+        self.instance_select.clear()
+        for instance in instances:
+            state = format_uptime(instance.uptime) if instance.running else f"код выхода {instance.exit_code}"
+            self.instance_select.addItem(
+                f"{instance.version_id} — {instance.username} — {state} (PID {instance.pid})", instance.id
+            )
+        index = self.instance_select.findData(current_id)
+        if index >= 0:
+            self.instance_select.setCurrentIndex(index)
+        self.instance_select.blockSignals(False)
+        self.instance_widget.setVisible(bool(instances))
+        if any(instance.running for instance in instances):
+            self.instance_timer.start()
+        else:
+            self.instance_timer.stop()
+
+    def current_instance(self):
+        instance_id = self.instance_select.currentData()
+        return self.process_manager.get(instance_id) if instance_id is not None else None
+
+    def stop_instance(self):
+        instance = self.current_instance()
+        if instance is None:
+            return
+        if instance.running:
+            self.process_manager.stop(instance.id)
+        else:
+            self.process_manager.forget(instance.id)
+            self.update_instances()
+
+    def restart_instance(self):
+        instance = self.current_instance()
+        if instance is None:
+            return
+        try:
+            self.process_manager.restart(instance.id)
+        except OSError as e:
+            self.show_message('Ошибка запуска', f'Не удалось запустить игру: {e}')
+
+    def show_instance_output(self):
+        instance = self.current_instance()
+        if instance is None:
+            return
+        box = QMessageBox(self)
+        box.setWindowTitle(f"{instance.version_id} — {instance.username}")
+        box.setText(f"Последние строки вывода (всего {instance.output.total})")
+        box.setDetailedText('\n'.join(instance.output.lines(500)))
+        box.exec_()
+
+    def show_launch_timings(self):
+        traces = core.launch_traces.recent()
+        box = QMessageBox(self)
+        box.setWindowTitle('Время запусков')
+        box.setText(format_summary(traces, last=5))
+        export_button = box.addButton('Сохранить диагностику…', QMessageBox.ActionRole)
+        box.addButton(QMessageBox.Close)
+        box.exec_()
+        if box.clickedButton() is export_button:
+            self.export_diagnostics(traces)
+
+    def export_diagnostics(self, traces: list):
+        default_path = os.path.join(os.path.expanduser('~'), f"mjnl-diagnostics-{time.strftime('%Y%m%d-%H%M%S')}.zip")
+        path, _ = QFileDialog.getSaveFileName(self, 'Архив диагностики', default_path, 'ZIP (*.zip)')
+        if not path:
+            return
+        try:
+            export_diagnostics(path, minecraft_directory, traces, logs_directory, {'config': self.settings.snapshot()})
+        except OSError as e:
+            self.show_message('Ошибка', f'Не удалось сохранить архив: {e}')
+            return
+        self.log_pipeline.log(f'Диагностика сохранена: {path}')
+        self.show_message('Диагностика', f'Архив сохранён:\n{path}\n\nПриложите его к сообщению о проблеме.')
+
 
 if __name__ == '__main__':
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
     app = QApplication(argv)
     window = MainWindow()
     window.show()
+    app.aboutToQuit.connect(window.shutdown)
     exit(app.exec_())
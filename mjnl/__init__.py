@@ -0,0 +1 @@
+"""Вспомогательные модули MJNL, не зависящие от Qt."""
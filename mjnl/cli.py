@@ -0,0 +1,367 @@
+"""Консольный режим MJNL без Qt: пакетная установка, проверка и запуск версий.
+
+    python -m mjnl.cli install 1.21.8 1.20.1 "1.20.1 fabric" --jobs 4
+    python -m mjnl.cli --json verify 1.21.8 --full --repair
+    python -m mjnl.cli modpack "1.20.1 fabric" https://example.com/pack/modpack.json
+    python -m mjnl.cli serve --port 8765
+    python -m mjnl.cli timings
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+from subprocess import Popen, PIPE, STDOUT
+from concurrent.futures import ThreadPoolExecutor
+
+from mjnl.download import DownloadEngine
+from mjnl.install import RESOURCES_URL, FABRIC_META_URL
+from mjnl.manifest import MANIFEST_URL
+from mjnl.launch import LauncherCore, LaunchError, split_version
+from mjnl.modpack import ModpackError, set_modpack
+from mjnl.mirror import MirrorError, DEFAULT_PORT
+from mjnl.mirror_server import MirrorServer
+from mjnl.verify import VERIFY_OFF, VERIFY_FAST, VERIFY_FULL
+from mjnl.progress import ProgressAggregator, ProgressSnapshot, format_transfer
+from mjnl.timing import LaunchTrace, LaunchRecorder, summarize, format_summary, export_diagnostics
+
+
+# Не чаще одного события прогресса на версию за этот интервал (с)
+PROGRESS_INTERVAL = 0.5
+
+
+class Reporter:
+    """Вывод событий: JSON по строке на событие (--json) или читаемый текст"""
+
+    def __init__(self, as_json: bool, stream=None):
+        self.as_json = as_json
+        self.stream = stream or sys.stdout
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, text: str = '', **fields):
+        with self._lock:
+            if self.as_json:
+                record = {'event': event, 'time': round(time.monotonic() - self.started, 3)}
+                record.update(fields)
+                self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+            elif text:
+                version = fields.get('version')
+                self.stream.write(f"[{version}] {text}\n" if version else text + '\n')
+            self.stream.flush()
+
+    def callback(self, version: str) -> dict:
+        """Словарь колбэков установки для одной версии; прогресс прореживается до PROGRESS_INTERVAL"""
+        state = {'label': None}
+
+        def publish(snapshot: ProgressSnapshot):
+            if snapshot.label != state['label']:
+                state['label'] = snapshot.label
+                self.emit('status', snapshot.label, version=version, message=snapshot.label)
+                return
+            text = f"{snapshot.progress}/{snapshot.max_progress}"
+            transfer = format_transfer(snapshot)
+            if transfer:
+                text += f" ({transfer})"
+            self.emit('progress', text, version=version, done=snapshot.progress, total=snapshot.max_progress,
+                      bytes_per_sec=round(snapshot.speed),
+                      eta=round(snapshot.eta, 1) if snapshot.eta >= 0 else None)
+
+        return ProgressAggregator(publish, rate=1 / PROGRESS_INTERVAL).callback()
+
+
+def _emit_launch_error(reporter: Reporter, e: LaunchError, **fields):
+    # cause — исходная ошибка установки; в текст — если сообщение для пользователя её не содержит
+    hidden = e.cause and e.cause.partition(': ')[2] not in e.text
+    text = f"{e.title}: {e.text}" + (f" ({e.cause})" if hidden else '')
+    reporter.emit('error', text, title=e.title, message=e.text, cause=e.cause, **fields)
+
+
+def _refresh_metadata(core: LauncherCore, reporter: Reporter, fabric: bool):
+    # Без сети работаем по кэшу, как и окно лаунчера
+    try:
+        core.manifest_cache.refresh()
+    except Exception as e:
+        reporter.emit('warning', f"Манифест версий недоступен, используется кэш: {e}", message=str(e))
+    if fabric:
+        try:
+            core.fabric_meta.refresh()
+        except Exception as e:
+            reporter.emit('warning', f"fabric-meta недоступен, используется кэш: {e}", message=str(e))
+
+
+def _run_parallel(versions: list, jobs: int, reporter: Reporter, action) -> int:
+    """Выполняет action(version, callback) для всех версий; возвращает число ошибок"""
+    failed = 0
+
+    def run_one(version: str) -> bool:
+        started = time.monotonic()
+        try:
+            result = action(version, reporter.callback(version))
+        except LaunchError as e:
+            _emit_launch_error(reporter, e, version=version, seconds=round(time.monotonic() - started, 3))
+            return False
+        except Exception as e:
+            reporter.emit('error', f"Ошибка: {e}", version=version, message=str(e),
+                          seconds=round(time.monotonic() - started, 3))
+            return False
+        reporter.emit('done', f"Готово за {time.monotonic() - started:.1f} с", version=version,
+                      seconds=round(time.monotonic() - started, 3), **result)
+        return True
+
+    # Версии ставятся одновременно через общий DownloadEngine: общие библиотеки и ассеты качаются один раз
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        for ok in executor.map(run_one, versions):
+            failed += not ok
+    reporter.emit('summary', f"Успешно: {len(versions) - failed}, с ошибками: {failed}, "
+                             f"время: {time.monotonic() - reporter.started:.1f} с",
+                  ok=len(versions) - failed, failed=failed,
+                  seconds=round(time.monotonic() - reporter.started, 3))
+    return failed
+
+
+def cmd_install(core: LauncherCore, args, reporter: Reporter) -> int:
+    versions = args.versions
+    if args.command == 'install-fabric':
+        versions = [f"{version} fabric" for version in versions]
+    _refresh_metadata(core, reporter, fabric=any(version.endswith(' fabric') for version in versions))
+
+    def install(version: str, callback: dict) -> dict:
+        version_to_launch, game_dir = core.install(version, callback)
+        return {'launch_id': version_to_launch, 'game_dir': game_dir}
+
+    return 1 if _run_parallel(versions, args.jobs, reporter, install) else 0
+
+
+def cmd_verify(core: LauncherCore, args, reporter: Reporter) -> int:
+    mode = VERIFY_FULL if args.full else VERIFY_FAST
+    if args.repair:
+        _refresh_metadata(core, reporter, fabric=False)
+    bad_total = []
+
+    def verify(version: str, callback: dict) -> dict:
+        bad = core.verify(version, mode, callback, repair=args.repair)
+        bad_total.extend(bad)
+        for task in bad:
+            text = 'Восстановлен' if args.repair else 'Повреждён или отсутствует'
+            reporter.emit('bad_file', f"{text}: {task.path}", version=version, path=task.path)
+        return {'bad_files': len(bad), 'repaired': args.repair}
+
+    failed = _run_parallel(args.versions, args.jobs, reporter, verify)
+    # Без --repair найденные битые файлы — тоже ошибка (для скриптов)
+    return 1 if failed or (bad_total and not args.repair) else 0
+
+
+def cmd_list(core: LauncherCore, args, reporter: Reporter) -> int:
+    installed = core.installed_index.installed_set()
+    if args.available:
+        _refresh_metadata(core, reporter, fabric=False)
+        versions = core.manifest_cache.load() or []
+        if args.type:
+            versions = [v for v in versions if v.get('type') == args.type]
+    else:
+        versions = [{'id': version_id} for version_id in core.installed_index.ids()]
+    for version in versions:
+        version_id = version.get('id')
+        reporter.emit('version', version_id, id=version_id, type=version.get('type'),
+                      installed=version_id in installed)
+    return 0
+
+
+def cmd_launch(core: LauncherCore, args, reporter: Reporter) -> int:
+    _refresh_metadata(core, reporter, fabric=args.version.endswith(' fabric'))
+    recorder = LaunchRecorder(core.launch_traces, lambda text: reporter.emit('timings', text, message=text))
+    trace = LaunchTrace(args.version)
+    try:
+        cmd = core.prepare_launch(args.version, args.username, trace.callback(reporter.callback(args.version)),
+                                  args.verify, jvm_tuning=not args.no_jvm_tuning, cds=args.cds, trace=trace)
+    except LaunchError as e:
+        recorder.finish(trace, 'error', f"{e.title}: {e.text}")
+        _emit_launch_error(reporter, e, version=args.version)
+        return 1
+    except Exception as e:
+        # Непредвиденная ошибка — тоже событие error, а не трассировка посреди вывода --json
+        error = f"{type(e).__name__}: {e}"
+        recorder.finish(trace, 'error', error)
+        reporter.emit('error', f"Ошибка запуска: {error}", version=args.version, message=str(e), cause=error)
+        return 1
+    reporter.emit('command', ' '.join(cmd), version=args.version, command=cmd)
+    if args.print_only:
+        recorder.finish(trace, 'ok')
+        return 0
+    try:
+        with trace.span('spawn'):
+            process = Popen(cmd, stdout=PIPE, stderr=STDOUT)
+    except OSError as e:
+        recorder.finish(trace, 'error', str(e))
+        reporter.emit('error', f"Не удалось запустить игру: {e}", version=args.version, message=str(e))
+        return 1
+    started = time.monotonic()
+    # Вывод игры идёт дальше как есть, с --json — событиями output; по первой строке заканчивается замер запуска
+    for raw in iter(process.stdout.readline, b''):
+        if trace.status is None:
+            trace.add_span('first_output', time.monotonic() - started)
+            recorder.finish(trace, 'ok')
+        if reporter.as_json:
+            reporter.emit('output', version=args.version, line=raw.decode('utf-8', errors='replace').rstrip('\r\n'))
+        else:
+            sys.stdout.buffer.write(raw)
+            sys.stdout.flush()
+    code = process.wait()
+    if trace.status is None:
+        error = f"игра завершилась с кодом {code} без вывода"
+        trace.add_span('first_output', time.monotonic() - started, error)
+        recorder.finish(trace, 'error', error)
+    reporter.emit('exit', version=args.version, code=code)
+    return code
+
+
+def cmd_timings(core: LauncherCore, args, reporter: Reporter) -> int:
+    traces = core.launch_traces.recent(args.last)
+    reporter.emit('timings', format_summary(traces), summary=summarize(traces), launches=traces)
+    return 0
+
+
+def cmd_diagnostics(core: LauncherCore, args, reporter: Reporter) -> int:
+    path = args.output or f"mjnl-diagnostics-{time.strftime('%Y%m%d-%H%M%S')}.zip"
+    logs_dir = args.logs_dir
+    if not logs_dir:
+        from mjnl.paths import logs_directory as logs_dir
+    try:
+        export_diagnostics(path, core.minecraft_directory, core.launch_traces.recent(), logs_dir)
+    except OSError as e:
+        reporter.emit('error', f"Не удалось сохранить архив: {e}", message=str(e))
+        return 1
+    reporter.emit('done', f"Архив диагностики: {path}", path=path)
+    return 0
+
+
+def cmd_modpack(core: LauncherCore, args, reporter: Reporter) -> int:
+    base_version, loader = split_version(args.version)
+    if not loader:
+        reporter.emit('error', 'Сборки модов бывают только у версий с загрузчиком, например "1.20.1 fabric"',
+                      version=args.version, message='no loader')
+        return 1
+    try:
+        profile_dir = core.prepare_profile(base_version, loader)
+        if args.source:
+            name = set_modpack(profile_dir, args.source)
+            reporter.emit('status', f"Сборка {name or args.source}", version=args.version, message=name)
+        report = core.sync_modpack(profile_dir, reporter.callback(args.version))
+    except (ModpackError, LaunchError) as e:
+        reporter.emit('error', str(e), version=args.version, message=str(e))
+        return 1
+    if report is None:
+        reporter.emit('error', f"У профиля {args.version} нет сборки ({profile_dir}/modpack.json)",
+                      version=args.version, message='no modpack')
+        return 1
+    reporter.emit('summary', f"Без изменений: {report['unchanged']}, установлено: {report['linked']} "
+                             f"(скачано: {report['downloaded']}), удалено: {report['removed']}",
+                  version=args.version, **report)
+    return 0
+
+
+def cmd_serve(core: LauncherCore, args, reporter: Reporter) -> int:
+    # Свежий манифест и fabric-meta, если у раздающей машины есть интернет
+    _refresh_metadata(core, reporter, fabric=True)
+    try:
+        server = MirrorServer(core.minecraft_directory, (args.host, args.port), verbose=args.verbose)
+    except OSError as e:
+        reporter.emit('error', f"Не удалось открыть порт {args.port}: {e}", message=str(e))
+        return 1
+    reporter.emit('serving', f"Зеркало {core.minecraft_directory} доступно на {server.url} (Ctrl+C — остановить)",
+                  url=server.url, directory=core.minecraft_directory)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m mjnl.cli', description='MJNL без графического интерфейса')
+    parser.add_argument('--json', action='store_true', help='события в формате JSON, по одному на строку')
+    parser.add_argument('--minecraft-directory', help='папка лаунчера (по умолчанию как у окна лаунчера)')
+    parser.add_argument('--limit-kb', type=int, default=0, help='ограничение скорости загрузки, КБ/с')
+    parser.add_argument('--manifest-url', default=MANIFEST_URL)
+    parser.add_argument('--fabric-meta-url', default=FABRIC_META_URL)
+    parser.add_argument('--resources-url', default=RESOURCES_URL)
+    parser.add_argument('--mirror', help='зеркало: адрес `serve` другого лаунчера или его папка')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in (('install', 'установить версии ("1.20.1" или "1.20.1 fabric")'),
+                            ('install-fabric', 'установить Fabric для версий игры')):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('versions', nargs='+')
+        p.add_argument('--jobs', '-j', type=int, default=4, help='сколько версий ставить одновременно')
+
+    p = sub.add_parser('verify', help='проверить файлы установленных версий')
+    p.add_argument('versions', nargs='+')
+    p.add_argument('--full', action='store_true', help='проверять и ассеты')
+    p.add_argument('--repair', action='store_true', help='докачать битые файлы')
+    p.add_argument('--jobs', '-j', type=int, default=4)
+
+    p = sub.add_parser('list', help='список версий')
+    p.add_argument('--available', action='store_true', help='все версии из манифеста, а не только установленные')
+    p.add_argument('--type', help='только версии этого типа (release, snapshot, ...)')
+
+    p = sub.add_parser('launch', help='установить при необходимости и запустить версию')
+    p.add_argument('version')
+    p.add_argument('--username', required=True)
+    p.add_argument('--verify', choices=[VERIFY_OFF, VERIFY_FAST, VERIFY_FULL], default=VERIFY_FAST)
+    p.add_argument('--print-only', action='store_true', help='только вывести команду запуска')
+    p.add_argument('--no-jvm-tuning', action='store_true', help='не подбирать память и GC, как раньше')
+    p.add_argument('--cds', action='store_true', help='создавать и использовать архив классов (CDS)')
+
+    p = sub.add_parser('modpack', help='задать сборку модов профиля и синхронизировать его')
+    p.add_argument('version', help='версия с загрузчиком, например "1.20.1 fabric"')
+    p.add_argument('source', nargs='?', help='файл или адрес modpack.json; без него — синхронизировать текущую')
+
+    p = sub.add_parser('timings', help='время этапов последних запусков')
+    p.add_argument('--last', type=int, help='сколько последних запусков учитывать')
+
+    p = sub.add_parser('diagnostics', help='собрать архив диагностики: замеры запусков, система, лог лаунчера')
+    p.add_argument('--output', '-o', help='путь к .zip (по умолчанию mjnl-diagnostics-<время>.zip)')
+    p.add_argument('--logs-dir', help='папка логов лаунчера (по умолчанию %%APPDATA%%/.MjnLauncher/logs)')
+
+    p = sub.add_parser('serve', help='раздавать папку лаунчера как зеркало для других машин')
+    p.add_argument('--host', default='0.0.0.0')
+    p.add_argument('--port', type=int, default=DEFAULT_PORT)
+    p.add_argument('--verbose', action='store_true', help='печатать каждый запрос')
+    return parser
+
+
+COMMANDS = {
+    'install': cmd_install,
+    'install-fabric': cmd_install,
+    'verify': cmd_verify,
+    'list': cmd_list,
+    'launch': cmd_launch,
+    'modpack': cmd_modpack,
+    'timings': cmd_timings,
+    'diagnostics': cmd_diagnostics,
+    'serve': cmd_serve,
+}
+
+
+def main(argv: list = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.minecraft_directory:
+        minecraft_directory = args.minecraft_directory
+    else:
+        from mjnl.paths import minecraft_directory
+    engine = DownloadEngine(bandwidth_limit=args.limit_kb * 1024 if args.limit_kb > 0 else None)
+    reporter = Reporter(args.json)
+    try:
+        core = LauncherCore(minecraft_directory, engine, manifest_url=args.manifest_url,
+                            meta_url=args.fabric_meta_url, resources_url=args.resources_url, mirror=args.mirror)
+    except MirrorError as e:
+        reporter.emit('error', f"Зеркало недоступно: {e}", message=str(e))
+        return 1
+    return COMMANDS[args.command](core, args, reporter)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+import os
+import json
+import threading
+
+from mjnl.fileio import write_json
+from mjnl.runtime import NativesCache
+
+
+# Значения, которые меняются от запуска к запуску и подставляются в готовый шаблон
+PER_LAUNCH_OPTIONS = {
+    'username': '{mjnl:username}',
+    'uuid': '{mjnl:uuid}',
+    'token': '{mjnl:token}',
+    'gameDirectory': '{mjnl:gameDirectory}',
+}
+
+
+class CommandCache:
+    """Кэш шаблонов команды запуска по версиям.
+
+    Ключ — (путь, mtime, размер) каждого JSON в цепочке inheritsFrom плюс остальные опции.
+    При попадании в кэш остаётся только stat этих JSON и подстановка ника/папки игры.
+    Нативы берутся из общего NativesCache и распаковываются только при сборке шаблона.
+    """
+
+    def __init__(self, minecraft_directory: str, natives: NativesCache = None):
+        self.minecraft_directory = minecraft_directory
+        self.natives = natives or NativesCache(minecraft_directory)
+        self.cache_dir = os.path.join(minecraft_directory, 'cache', 'commands')
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    def _json_path(self, version_id: str) -> str:
+        return os.path.join(self.minecraft_directory, 'versions', version_id, f"{version_id}.json")
+
+    def _entry_path(self, version_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{version_id}.json")
+
+    def _resolve_chain(self, version_id: str) -> list:
+        chain = []
+        current = version_id
+        while current and current not in chain:
+            chain.append(current)
+            with open(self._json_path(current), 'r', encoding='utf-8') as f:
+                current = json.load(f).get('inheritsFrom')
+        return chain
+
+    def _stamp(self, chain: list) -> list:
+        stamp = []
+        for version_id in chain:
+            st = os.stat(self._json_path(version_id))
+            stamp.append([version_id, st.st_mtime_ns, st.st_size])
+        return stamp
+
+    @staticmethod
+    def _options_key(options: dict) -> str:
+        static = {k: v for k, v in options.items() if k not in PER_LAUNCH_OPTIONS}
+        return json.dumps(static, sort_keys=True, ensure_ascii=False)
+
+    def _load_entry(self, version_id: str):
+        entry = self._memory.get(version_id)
+        if entry is None:
+            try:
+                with open(self._entry_path(version_id), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except Exception:
+                return None
+            self._memory[version_id] = entry
+        return entry
+
+    def _is_valid(self, entry: dict, options_key: str) -> bool:
+        # Шаблоны без поля natives собраны с папкой нативов внутри версии
+        if entry.get('options') != options_key or 'natives' not in entry:
+            return False
+        if entry['natives'] and not os.path.isdir(entry['natives']):
+            return False
+        # Java из runtime/ могли удалить или переустановить по другому пути
+        java = entry['command'][0]
+        if os.path.isabs(java) and not os.path.isfile(java):
+            return False
+        try:
+            return self._stamp([item[0] for item in entry['stamp']]) == entry['stamp']
+        except OSError:
+            return False
+
+    def template(self, version_id: str, options: dict) -> list:
+        """Возвращает шаблон команды, пересобирая его только при изменении JSON или опций"""
+        options_key = self._options_key(options)
+        with self._lock:
+            entry = self._load_entry(version_id)
+            if entry is not None and self._is_valid(entry, options_key):
+                return entry['command']
+
+            # minecraft_launcher_lib тянет за собой requests — импортируем только при сборке шаблона
+            from minecraft_launcher_lib.command import get_minecraft_command
+            build_options = dict(options)
+            build_options.update(PER_LAUNCH_OPTIONS)
+            chain = self._resolve_chain(version_id)
+            natives_dir = self.natives.for_version(version_id)
+            if natives_dir:
+                build_options['nativesDirectory'] = natives_dir
+            entry = {
+                'stamp': self._stamp(chain),
+                'options': options_key,
+                'natives': natives_dir or '',
+                'command': get_minecraft_command(version_id, self.minecraft_directory, build_options),
+            }
+            self._memory[version_id] = entry
+            try:
+                write_json(self._entry_path(version_id), entry, ensure_ascii=False)
+            except OSError:
+                # Кэш на диске — оптимизация, без него запуск всё равно работает
+                pass
+            return entry['command']
+
+    def get_command(self, version_id: str, options: dict) -> list:
+        """Команда запуска с подставленными ником, uuid, токеном и папкой игры"""
+        values = {
+            PER_LAUNCH_OPTIONS['username']: options.get('username', ''),
+            PER_LAUNCH_OPTIONS['uuid']: options.get('uuid', ''),
+            PER_LAUNCH_OPTIONS['token']: options.get('token', ''),
+            PER_LAUNCH_OPTIONS['gameDirectory']: options.get('gameDirectory', self.minecraft_directory),
+        }
+        command = []
+        for arg in self.template(version_id, options):
+            if '{mjnl:' in arg:
+                for placeholder, value in values.items():
+                    arg = arg.replace(placeholder, value)
+            command.append(arg)
+        return command
@@ -0,0 +1,278 @@
+import os
+import time
+import hashlib
+import threading
+from typing import NamedTuple, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _empty(*args):
+    pass
+
+
+class DownloadError(Exception):
+    """Не удалось скачать один или несколько файлов"""
+
+    def __init__(self, failures: list):
+        self.failures = failures
+        urls = ', '.join(url for url, _ in failures[:3])
+        super().__init__(f"Не удалось скачать {len(failures)} файл(ов): {urls}")
+
+
+class ChecksumError(Exception):
+    pass
+
+
+class DownloadCancelled(Exception):
+    """Загрузка отменена через cancel (threading.Event); недокачанные .part остаются для докачки"""
+
+
+def check_cancelled(cancel):
+    if cancel is not None and cancel.is_set():
+        raise DownloadCancelled()
+
+
+class DownloadTask(NamedTuple):
+    url: str
+    path: str
+    sha1: Optional[str] = None
+    size: Optional[int] = None
+
+
+class RateLimiter:
+    """Общий для всех потоков ограничитель скорости (token bucket), байт/с"""
+
+    def __init__(self, rate: int):
+        self.rate = rate
+        self._allowance = float(rate)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: int):
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(self.rate, self._allowance + (now - self._last) * self.rate)
+            self._last = now
+            self._allowance -= amount
+            wait = -self._allowance / self.rate if self._allowance < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+def sha1_of_file(path: str) -> str:
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+class DownloadEngine:
+    """Параллельная загрузка файлов: пул потоков, keep-alive, повторы, докачка и общий лимит скорости.
+
+    Прогресс сообщается через тот же словарь колбэков, что и у minecraft_launcher_lib:
+    setStatus / setProgress / setMax, плюс необязательные addBytesTotal / addBytes для скорости и ETA
+    и addFiles — число действительно скачанных файлов.
+    Если задано зеркало (mjnl.mirror.Mirror), файл сначала ищется на нём (одна попытка, без повторов),
+    а при неудаче — по task.url. После первой ошибки соединения зеркало больше не используется.
+    """
+
+    def __init__(self, max_workers: int = 8, retries: int = 3, timeout: float = 30,
+                 bandwidth_limit: Optional[int] = None, mirror=None):
+        self.max_workers = max_workers
+        self.retries = retries
+        self.timeout = timeout
+        self.limiter = RateLimiter(bandwidth_limit) if bandwidth_limit else None
+        self.mirror = mirror
+        # Зеркало, до которого не удалось достучаться: дальше качаем мимо него
+        self._dead_mirror = None
+        self._local = threading.local()
+        # Файлы, которые прямо сейчас качает какой-то поток: параллельные установки
+        # разных версий не скачивают общие библиотеки и ассеты дважды
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    def set_bandwidth_limit(self, rate: Optional[int]):
+        """Ограничение суммарной скорости загрузки в байтах/с (None — без ограничения)"""
+        self.limiter = RateLimiter(rate) if rate else None
+
+    def _session(self):
+        # requests.Session не гарантирует потокобезопасность, поэтому у каждого потока своя
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            # requests импортируется при первой загрузке, а не при старте лаунчера
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return session
+
+    def is_up_to_date(self, task: DownloadTask) -> bool:
+        try:
+            size = os.path.getsize(task.path)
+        except OSError:
+            return False
+        if task.size is not None:
+            return size == task.size
+        if task.sha1 is not None:
+            return sha1_of_file(task.path) == task.sha1
+        return True
+
+    def fetch(self, task: DownloadTask, on_bytes=_empty, cancel=None):
+        """Скачивает один файл с повторами; частично скачанный .part докачивается через Range"""
+        import requests
+        mirror = self.mirror
+        mirror_url = mirror.url_for(task.path) if mirror is not None and mirror is not self._dead_mirror else None
+        if mirror_url:
+            try:
+                self._fetch_retrying(task._replace(url=mirror_url), on_bytes, cancel, retries=0)
+                return
+            except (requests.ConnectionError, requests.Timeout):
+                # Зеркало недоступно: не тратим на него время на каждом следующем файле
+                self._dead_mirror = mirror
+            except (ChecksumError, requests.RequestException, OSError):
+                # На зеркале файла нет или он битый — качаем из основного источника
+                pass
+        self._fetch_retrying(task, on_bytes, cancel)
+
+    def _fetch_retrying(self, task: DownloadTask, on_bytes=_empty, cancel=None, retries: Optional[int] = None):
+        import requests
+        retries = self.retries if retries is None else retries
+        last_error = None
+        for attempt in range(retries + 1):
+            check_cancelled(cancel)
+            try:
+                self._fetch_once(task, on_bytes, cancel)
+                return
+            except requests.HTTPError as e:
+                # Отсутствующий файл не появится от повторов
+                if e.response is not None and e.response.status_code == 404:
+                    raise
+                last_error = e
+            except ChecksumError as e:
+                last_error = e
+                # Битый кусок нельзя докачивать — начинаем заново
+                try:
+                    os.remove(task.path + '.part')
+                except OSError:
+                    pass
+            except (requests.RequestException, OSError) as e:
+                last_error = e
+            if attempt < retries:
+                time.sleep(0.5 * (2 ** attempt))
+        raise last_error
+
+    def _fetch_shared(self, key: str, task: DownloadTask, on_bytes=_empty, cancel=None):
+        # Отменённая загрузка не начинает задачи, которые ещё ждут в очереди пула
+        check_cancelled(cancel)
+        with self._inflight_lock:
+            event = self._inflight.get(key)
+            owner = event is None
+            if owner:
+                event = self._inflight[key] = threading.Event()
+        if not owner:
+            # Файл уже качает другой download_all — ждём его; если у него не вышло, пробуем сами
+            event.wait()
+            if not self.is_up_to_date(task):
+                self.fetch(task, on_bytes, cancel)
+            else:
+                # Файл скачан чужими руками, но для прогресса этой установки он тоже получен
+                on_bytes(task.size or 0)
+            return
+        try:
+            # Пока задача ждала в очереди, файл мог докачать другой download_all
+            if not self.is_up_to_date(task):
+                self.fetch(task, on_bytes, cancel)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            event.set()
+
+    def _fetch_once(self, task: DownloadTask, on_bytes=_empty, cancel=None):
+        os.makedirs(os.path.dirname(task.path), exist_ok=True)
+        part_path = task.path + '.part'
+        sha1 = hashlib.sha1() if task.sha1 else None
+        offset = 0
+        if os.path.isfile(part_path):
+            offset = os.path.getsize(part_path)
+
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+        with self._session().get(task.url, headers=headers, stream=True, timeout=self.timeout) as r:
+            if r.status_code == 416:
+                # Сервер не может отдать диапазон — файл изменился или .part уже полный
+                os.remove(part_path)
+                raise ChecksumError(task.url)
+            r.raise_for_status()
+
+            if r.status_code == 206 and offset:
+                mode = 'ab'
+                if sha1 is not None:
+                    with open(part_path, 'rb') as f:
+                        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                            sha1.update(chunk)
+            else:
+                mode = 'wb'
+
+            with open(part_path, mode) as f:
+                for chunk in r.iter_content(CHUNK_SIZE):
+                    check_cancelled(cancel)
+                    if self.limiter is not None:
+                        self.limiter.consume(len(chunk))
+                    f.write(chunk)
+                    on_bytes(len(chunk))
+                    if sha1 is not None:
+                        sha1.update(chunk)
+
+        if sha1 is not None and sha1.hexdigest() != task.sha1:
+            raise ChecksumError(f"{task.url}: ожидался sha1 {task.sha1}, получен {sha1.hexdigest()}")
+        os.replace(part_path, task.path)
+
+    def download_all(self, tasks: list, callback: Optional[dict] = None, status: str = '', cancel=None):
+        """Скачивает недостающие файлы параллельно. Бросает DownloadError, если что-то не скачалось.
+
+        cancel — threading.Event: если он установлен, загрузка прерывается с DownloadCancelled.
+        """
+        check_cancelled(cancel)
+        callback = callback or {}
+        set_status = callback.get('setStatus', _empty)
+        set_progress = callback.get('setProgress', _empty)
+        set_max = callback.get('setMax', _empty)
+        add_bytes = callback.get('addBytes', _empty)
+        add_files = callback.get('addFiles', _empty)
+
+        # Один и тот же файл (общая библиотека, одинаковый ассет) качаем один раз
+        unique = {}
+        for task in tasks:
+            unique.setdefault(os.path.normcase(os.path.abspath(task.path)), task)
+        pending = [(key, task) for key, task in unique.items() if not self.is_up_to_date(task)]
+
+        if status:
+            set_status(status)
+        set_max(len(unique))
+        done = len(unique) - len(pending)
+        set_progress(done)
+        if not pending:
+            return
+        callback.get('addBytesTotal', _empty)(sum(task.size or 0 for _, task in pending))
+
+        failures = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._fetch_shared, key, task, add_bytes, cancel): task
+                       for key, task in pending}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    add_files(1)
+                except Exception as e:
+                    failures.append((futures[future].url, e))
+                done += 1
+                set_progress(done)
+        check_cancelled(cancel)
+        if failures:
+            raise DownloadError(failures)
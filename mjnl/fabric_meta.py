@@ -0,0 +1,75 @@
+import os
+import json
+import time
+import threading
+
+from mjnl.fileio import write_json
+from mjnl.install import FABRIC_META_URL
+
+
+class FabricMetaCache:
+    """Списки версий игры и загрузчика из fabric-meta, сохранённые на диск с TTL.
+
+    Без сети используется последний сохранённый снимок, каким бы старым он ни был.
+    """
+
+    def __init__(self, minecraft_directory: str, meta_url: str = FABRIC_META_URL,
+                 ttl: float = 6 * 3600, timeout: float = 10):
+        self.meta_url = meta_url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.path = os.path.join(minecraft_directory, 'cache', 'fabric_meta.json')
+        self._lock = threading.Lock()
+        self._data = None
+        self._game_versions = frozenset()
+
+    def _set_data(self, data: dict):
+        self._data = data
+        self._game_versions = frozenset(entry.get('version') for entry in data.get('game', []))
+
+    def load(self) -> bool:
+        """Читает снимок с диска. Возвращает True, если он есть."""
+        with self._lock:
+            if self._data is None:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._set_data(json.load(f))
+                except Exception:
+                    return False
+            return True
+
+    def is_fresh(self) -> bool:
+        self.load()
+        return self._data is not None and time.time() - self._data.get('fetched_at', 0) < self.ttl
+
+    def refresh(self, force: bool = False) -> bool:
+        """Перезапрашивает fabric-meta, если снимок устарел. Возвращает True, если данные обновились.
+
+        Сетевые ошибки пробрасываются — старый снимок при этом остаётся в силе.
+        """
+        if not force and self.is_fresh():
+            return False
+        game = self._fetch('versions/game')
+        loader = self._fetch('versions/loader')
+        data = {'fetched_at': time.time(), 'game': game, 'loader': loader}
+        with self._lock:
+            changed = self._data is None or self._data.get('game') != game or self._data.get('loader') != loader
+            self._set_data(data)
+        write_json(self.path, data)
+        return changed
+
+    def _fetch(self, endpoint: str) -> list:
+        import requests
+        r = requests.get(f"{self.meta_url}/{endpoint}", timeout=self.timeout)
+        r.raise_for_status()
+        return r.json()
+
+    def supports(self, mc_version: str) -> bool:
+        """Поддерживает ли Fabric эту версию игры (включая снапшоты)"""
+        return mc_version in self._game_versions
+
+    def latest_loader(self):
+        """Последний стабильный загрузчик из снимка или None, если снимка нет"""
+        loaders = (self._data or {}).get('loader', [])
+        stable = [entry for entry in loaders if entry.get('stable')]
+        return (stable or loaders or [{}])[0].get('version')
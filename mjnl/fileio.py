@@ -0,0 +1,140 @@
+"""Атомарная запись файлов (временный файл в той же папке и os.replace) и межпроцессная блокировка.
+
+Имя временного файла уникально (tempfile.mkstemp): окно лаунчера, консольный режим и фоновые
+потоки могут писать один и тот же файл одновременно и не должны портить чужую запись.
+"""
+import os
+import json
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+
+
+_default_mode = None
+_mode_lock = threading.Lock()
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _file_mode(path: str, directory: str) -> int:
+    """Права для файла вместо path: как у заменяемого файла, у нового — 0o666 с учётом umask"""
+    global _default_mode
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        pass
+    with _mode_lock:
+        if _default_mode is None:
+            # umask узнаём по пробному файлу: os.umask() поменял бы его на время для всех потоков процесса
+            probe = os.path.join(directory, f".mjnl-umask.{os.getpid()}.{threading.get_ident()}")
+            fd = os.open(probe, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            try:
+                _default_mode = os.fstat(fd).st_mode & 0o777
+            finally:
+                os.close(fd)
+                _remove(probe)
+        return _default_mode
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'wb', encoding: str = None):
+    """Файл для записи вместо path: при успехе целиком заменяет path, при ошибке удаляется"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+        # mkstemp создаёт файл с правами 0600
+        os.chmod(tmp_path, _file_mode(path, directory))
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove(tmp_path)
+        raise
+
+
+def write_bytes(path: str, data: bytes):
+    with atomic_write(path) as f:
+        f.write(data)
+
+
+def write_json(path: str, data, **dump_kwargs):
+    with atomic_write(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **dump_kwargs)
+
+
+def copy_file(src: str, dst: str):
+    with open(src, 'rb') as f_src, atomic_write(dst) as f_dst:
+        shutil.copyfileobj(f_src, f_dst)
+
+
+class FileLock:
+    """Межпроцессная блокировка: flock / msvcrt.locking по файлу path"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Захватывает блокировку; с blocking=False сразу возвращает False, если она занята"""
+        f = open(self.path, 'a+b')
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            if blocking:
+                raise
+            return False
+        self._file = f
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def link_file(src: str, dst: str, copy_fallback: bool = False):
+    """Заменяет dst жёсткой ссылкой на src; с copy_fallback там, где ссылок нет (FAT, другой диск), — копией"""
+    # mkstemp здесь не подходит: os.link требует, чтобы имени ещё не было
+    tmp_path = f"{dst}.{os.getpid()}.{threading.get_ident()}.mjnl-link"
+    try:
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            if not copy_fallback:
+                raise
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        _remove(tmp_path)
+        raise
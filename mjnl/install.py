@@ -0,0 +1,274 @@
+import os
+import re
+import sys
+import json
+import platform
+from typing import Optional
+
+from mjnl.download import DownloadEngine, DownloadTask, check_cancelled, _empty
+from mjnl.fileio import FileLock, write_json
+from mjnl.manifest import MANIFEST_URL
+
+
+LIBRARIES_URL = 'https://libraries.minecraft.net'
+RESOURCES_URL = 'https://resources.download.minecraft.net'
+FABRIC_META_URL = 'https://meta.fabricmc.net/v2'
+RUNTIME_MANIFEST_URL = ('https://launchermeta.mojang.com/v1/products/java-runtime/'
+                        '2ec0cc96c44e5a76b9c8b7c39df7210883d12871/all.json')
+
+# Пока версия ставится, её JSON лежит под этим суффиксом: <id>.json появляется последним и значит «установлена»
+INSTALLING_SUFFIX = '.installing'
+# Блокировка установки версии: <версия>.json.lock
+LOCK_SUFFIX = '.lock'
+
+# platform.architecture() запускает внешний `file`, поэтому разрядность считаем один раз
+IS_32BIT = sys.maxsize <= 2 ** 32
+
+
+class InstallError(Exception):
+    """Версию не удалось найти или установить"""
+
+
+def current_os_name() -> str:
+    if sys.platform.startswith('win'):
+        return 'windows'
+    if sys.platform == 'darwin':
+        return 'osx'
+    return 'linux'
+
+
+def rules_allow(rules: list) -> bool:
+    """Правила библиотек Mojang: побеждает последнее подходящее правило"""
+    allowed = False
+    os_name = current_os_name()
+    for rule in rules:
+        # Правила с features относятся к аргументам запуска, для библиотек их не бывает
+        if 'features' in rule:
+            continue
+        os_rule = rule.get('os', {})
+        if 'name' in os_rule and os_rule['name'] != os_name:
+            continue
+        if os_rule.get('arch') == 'x86' and not IS_32BIT:
+            continue
+        # Версия ОС — регулярное выражение, как в minecraft_launcher_lib (например, "^10\\." для Windows 10)
+        if 'version' in os_rule and not re.match(os_rule['version'], platform.version()):
+            continue
+        allowed = rule.get('action') == 'allow'
+    return allowed
+
+
+def maven_path(name: str) -> str:
+    """org.ow2.asm:asm:9.7 -> org/ow2/asm/asm/9.7/asm-9.7.jar"""
+    name, _, ext = name.partition('@')
+    parts = name.split(':')
+    group, artifact, version = parts[0:3]
+    classifier = ''.join(f'-{p}' for p in parts[3:])
+    return '/'.join(group.split('.') + [artifact, version, f"{artifact}-{version}{classifier}.{ext or 'jar'}"])
+
+
+def native_classifier(library: dict) -> str:
+    classifier = library.get('natives', {}).get(current_os_name(), '')
+    return classifier.replace('${arch}', '32' if IS_32BIT else '64')
+
+
+def library_tasks(libraries: list, minecraft_directory: str) -> tuple:
+    """Возвращает (задачи загрузки, список (jar с нативами, правила extract, sha1 jar))"""
+    libraries_dir = os.path.join(minecraft_directory, 'libraries')
+    tasks = []
+    natives = []
+    for lib in libraries:
+        if 'rules' in lib and not rules_allow(lib['rules']):
+            continue
+        downloads = lib.get('downloads')
+        classifier = native_classifier(lib)
+        if downloads is None:
+            # Формат fabric/maven: есть только name и базовый url репозитория
+            base_url = lib.get('url', LIBRARIES_URL).rstrip('/')
+            rel = maven_path(lib['name'])
+            tasks.append(DownloadTask(f"{base_url}/{rel}", os.path.join(libraries_dir, *rel.split('/')),
+                                      lib.get('sha1'), lib.get('size')))
+            continue
+        artifact = downloads.get('artifact')
+        if artifact and artifact.get('url') and artifact.get('path'):
+            tasks.append(DownloadTask(artifact['url'], os.path.join(libraries_dir, *artifact['path'].split('/')),
+                                      artifact.get('sha1'), artifact.get('size')))
+        native = downloads.get('classifiers', {}).get(classifier) if classifier else None
+        if native and native.get('url'):
+            path = os.path.join(libraries_dir, *native['path'].split('/'))
+            tasks.append(DownloadTask(native['url'], path, native.get('sha1'), native.get('size')))
+            natives.append((path, lib.get('extract', {}), native.get('sha1')))
+    return tasks, natives
+
+
+def library_paths(libraries: list, minecraft_directory: str) -> list:
+    """Пути всех библиотек JSON, включая те, что без url (Forge, OptiFine) или не для этой ОС"""
+    libraries_dir = os.path.join(minecraft_directory, 'libraries')
+    rels = []
+    for lib in libraries:
+        downloads = lib.get('downloads') or {}
+        artifact = downloads.get('artifact') or {}
+        if artifact.get('path'):
+            rels.append(artifact['path'])
+        elif lib.get('name'):
+            rels.append(maven_path(lib['name']))
+        rels += [native['path'] for native in downloads.get('classifiers', {}).values() if native.get('path')]
+    return [os.path.join(libraries_dir, *rel.split('/')) for rel in rels]
+
+
+def _load_json(path: str) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _fetch_json(url: str, timeout: float = 30):
+    import requests
+    r = requests.get(url, timeout=timeout)
+    r.raise_for_status()
+    return r.json()
+
+
+def asset_index_task(data: dict, minecraft_directory: str):
+    index = data.get('assetIndex')
+    if index is None:
+        return None
+    index_path = os.path.join(minecraft_directory, 'assets', 'indexes', f"{data.get('assets', index['id'])}.json")
+    return DownloadTask(index['url'], index_path, index.get('sha1'), index.get('size'))
+
+
+def version_file_tasks(version_id: str, data: dict, minecraft_directory: str,
+                       resources_url: str = RESOURCES_URL, include_assets: bool = True) -> tuple:
+    """Все файлы версии (без родителя): библиотеки, ассеты по локальному индексу, log-конфиг и клиент.
+
+    Возвращает (задачи загрузки, нативы для распаковки).
+    """
+    tasks, natives = library_tasks(data.get('libraries', []), minecraft_directory)
+
+    index_task = asset_index_task(data, minecraft_directory) if include_assets else None
+    if index_task is not None:
+        tasks.append(index_task)
+        objects_dir = os.path.join(minecraft_directory, 'assets', 'objects')
+        try:
+            objects = _load_json(index_task.path).get('objects', {})
+        except OSError:
+            objects = {}
+        for obj in objects.values():
+            h = obj['hash']
+            tasks.append(DownloadTask(f"{resources_url}/{h[:2]}/{h}", os.path.join(objects_dir, h[:2], h),
+                                      h, obj.get('size')))
+
+    logging_file = data.get('logging', {}).get('client', {}).get('file')
+    if logging_file:
+        tasks.append(DownloadTask(logging_file['url'],
+                                  os.path.join(minecraft_directory, 'assets', 'log_configs', logging_file['id']),
+                                  logging_file.get('sha1'), logging_file.get('size')))
+
+    client = data.get('downloads', {}).get('client')
+    if client:
+        tasks.append(DownloadTask(client['url'],
+                                  os.path.join(minecraft_directory, 'versions', version_id, f"{version_id}.jar"),
+                                  client.get('sha1'), client.get('size')))
+    return tasks, natives
+
+
+def install_version(version_id: str, minecraft_directory: str, callback: Optional[dict] = None,
+                    engine: Optional[DownloadEngine] = None, versions: Optional[list] = None,
+                    resources_url: str = RESOURCES_URL, manifest_url: str = MANIFEST_URL,
+                    with_parent: bool = True, cancel=None, runtime_url: str = RUNTIME_MANIFEST_URL):
+    """Устанавливает (и докачивает недостающее) версию вместе с родителем из inheritsFrom.
+
+    versions — записи манифеста (id/url/sha1); если не переданы, манифест скачивается.
+    cancel — threading.Event для отмены между файлами и этапами (DownloadCancelled).
+    Прерванная установка (отмена, Ctrl-C, сбой) оставляет версию неустановленной, и следующая
+    установка продолжает её с уже скачанных файлов.
+    """
+    version_dir = os.path.join(minecraft_directory, 'versions', version_id)
+    os.makedirs(version_dir, exist_ok=True)
+    # Одну версию ставит один поток или процесс; остальные ждут и затем только докачивают недостающее
+    with FileLock(os.path.join(version_dir, f"{version_id}.json{LOCK_SUFFIX}")):
+        _install_version(version_id, minecraft_directory, callback, engine, versions, resources_url, manifest_url,
+                         with_parent, cancel, runtime_url)
+
+
+def _install_version(version_id: str, minecraft_directory: str, callback: Optional[dict], engine, versions,
+                     resources_url: str, manifest_url: str, with_parent: bool, cancel, runtime_url: str):
+    callback = callback or {}
+    engine = engine or DownloadEngine()
+    set_status = callback.get('setStatus', _empty)
+
+    version_dir = os.path.join(minecraft_directory, 'versions', version_id)
+    json_path = os.path.join(version_dir, f"{version_id}.json")
+    staged_path = json_path + INSTALLING_SUFFIX
+    if not os.path.isfile(json_path) and not os.path.isfile(staged_path):
+        if versions is None:
+            versions = _fetch_json(manifest_url).get('versions', [])
+        entry = next((v for v in versions if v.get('id') == version_id), None)
+        if entry is None or not entry.get('url'):
+            raise InstallError(f"Версия {version_id} не найдена")
+        engine.download_all([DownloadTask(entry['url'], staged_path, entry.get('sha1'))],
+                            status=f"Загрузка {version_id}.json", cancel=cancel)
+    staged = os.path.isfile(staged_path)
+    data = _load_json(staged_path if staged else json_path)
+
+    # Сначала родитель (для fabric — ванильная версия)
+    if 'inheritsFrom' in data and with_parent:
+        install_version(data['inheritsFrom'], minecraft_directory, callback, engine, versions,
+                        resources_url, manifest_url, cancel=cancel, runtime_url=runtime_url)
+
+    index_task = asset_index_task(data, minecraft_directory)
+    if index_task is not None:
+        engine.download_all([index_task], status='Загрузка индекса ассетов', cancel=cancel)
+
+    tasks, natives = version_file_tasks(version_id, data, minecraft_directory, resources_url)
+
+    # Библиотеки, ассеты и клиент качаются одним пулом, без барьеров между этапами
+    engine.download_all(tasks, callback, status=f"Загрузка файлов {version_id}", cancel=cancel)
+
+    # Нативы и Java общие для всех версий: уже готовые не распаковываются и не проверяются заново
+    from mjnl.runtime import NativesCache, JavaRuntimes
+    check_cancelled(cancel)
+    NativesCache(minecraft_directory).ensure(natives, callback)
+
+    check_cancelled(cancel)
+    if 'javaVersion' in data:
+        set_status('Установка Java')
+        JavaRuntimes(minecraft_directory, runtime_url).ensure(data['javaVersion']['component'], callback, engine,
+                                                              cancel)
+
+    check_cancelled(cancel)
+    if staged:
+        os.replace(staged_path, json_path)
+    set_status('Установка завершена')
+
+
+def latest_fabric_loader(minecraft_version: str, meta_url: str = FABRIC_META_URL) -> str:
+    loaders = _fetch_json(f"{meta_url}/versions/loader/{minecraft_version}")
+    if not loaders:
+        raise InstallError(f"Fabric не поддерживает {minecraft_version}")
+    stable = [entry for entry in loaders if entry.get('loader', {}).get('stable')]
+    return (stable or loaders)[0]['loader']['version']
+
+
+def install_fabric(minecraft_version: str, minecraft_directory: str, callback: Optional[dict] = None,
+                   engine: Optional[DownloadEngine] = None, loader_version: Optional[str] = None,
+                   versions: Optional[list] = None, meta_url: str = FABRIC_META_URL, with_base: bool = True,
+                   **kwargs) -> str:
+    """Ставит fabric по профилю из fabric-meta (без запуска Java-установщика). Возвращает id версии.
+
+    with_base=False — базовую версию вызывающий уже поставил сам.
+    """
+    callback = callback or {}
+    callback.get('setStatus', _empty)('Получение профиля Fabric')
+    loader_version = loader_version or latest_fabric_loader(minecraft_version, meta_url)
+    profile = _fetch_json(f"{meta_url}/versions/loader/{minecraft_version}/{loader_version}/profile/json")
+    fabric_id = profile['id']
+
+    # JSON профиля пишем только после базовой версии, иначе «установленный» fabric окажется без родителя
+    if with_base:
+        install_version(minecraft_version, minecraft_directory, callback, engine, versions, **kwargs)
+
+    # Профиль станет <id>.json только после установки его библиотек
+    json_path = os.path.join(minecraft_directory, 'versions', fabric_id, f"{fabric_id}.json")
+    write_json(json_path + INSTALLING_SUFFIX, profile, indent=4, ensure_ascii=False)
+
+    install_version(fabric_id, minecraft_directory, callback, engine, versions, with_parent=False, **kwargs)
+    return fabric_id
@@ -0,0 +1,70 @@
+import os
+import threading
+
+
+class InstalledIndex:
+    """Индекс установленных версий: один проход scandir по versions/, сброс по mtime каталога.
+
+    mtime каталога versions/ меняется только при создании/удалении папок версий,
+    поэтому после установки вызывающий код должен явно вызвать invalidate().
+    """
+
+    def __init__(self, minecraft_directory: str):
+        self.versions_dir = os.path.join(minecraft_directory, 'versions')
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._ids = None
+        self._id_set = frozenset()
+
+    def invalidate(self):
+        with self._lock:
+            self._ids = None
+
+    def _scan(self) -> list:
+        ids = []
+        try:
+            with os.scandir(self.versions_dir) as it:
+                for entry in it:
+                    if not entry.is_dir():
+                        continue
+                    # Установленная версия обычно имеет файл <version>/<version>.json
+                    if os.path.isfile(os.path.join(entry.path, f"{entry.name}.json")):
+                        ids.append(entry.name)
+        except OSError:
+            pass
+        return ids
+
+    def ids(self) -> list:
+        """Возвращает id установленных версий, пересканируя каталог только при изменениях"""
+        with self._lock:
+            try:
+                mtime = os.stat(self.versions_dir).st_mtime_ns
+            except OSError:
+                mtime = None
+            if self._ids is None or mtime != self._mtime:
+                self._ids = self._scan()
+                self._id_set = frozenset(self._ids)
+                self._mtime = mtime
+            return self._ids
+
+    def installed_set(self) -> frozenset:
+        self.ids()
+        return self._id_set
+
+    def is_installed(self, version_id: str) -> bool:
+        return version_id in self.installed_set()
+
+    def find_mod_version(self, base_version: str, loader: str) -> str:
+        candidates = [
+            entry for entry in self.ids()
+            if base_version in entry and loader in entry.lower()
+        ]
+        if not candidates:
+            return ''
+
+        # Приоритет fabric-loader-* (реальная сборка), затем алиасы
+        def candidate_key(e: str) -> tuple:
+            is_loader = e.startswith('fabric-loader-')
+            return (0 if is_loader else 1, e)
+        candidates.sort(key=candidate_key)
+        return candidates[0]
@@ -0,0 +1,136 @@
+import os
+import sys
+import json
+import ctypes
+import hashlib
+
+from mjnl.fileio import write_bytes
+
+
+GIB = 1024 ** 3
+# Сколько памяти оставить системе и прочим программам
+SYSTEM_RESERVE = 2 * GIB
+
+
+def system_memory() -> int:
+    """Объём физической памяти в байтах (0 — не удалось определить)"""
+    if sys.platform == 'win32':
+        class MemoryStatusEx(ctypes.Structure):
+            _fields_ = [
+                ('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+            ]
+        status = MemoryStatusEx()
+        status.dwLength = ctypes.sizeof(MemoryStatusEx)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullTotalPhys
+        return 0
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+def java_major_version(version_id: str, minecraft_directory: str) -> int:
+    """Версия Java из javaVersion в JSON версии или её родителей; у старых версий его нет — это Java 8"""
+    current, seen = version_id, set()
+    while current and current not in seen:
+        seen.add(current)
+        try:
+            with open(os.path.join(minecraft_directory, 'versions', current, f"{current}.json"), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            break
+        if 'javaVersion' in data:
+            return int(data['javaVersion'].get('majorVersion', 8))
+        current = data.get('inheritsFrom')
+    return 8
+
+
+def heap_size(java_major: int, modded: bool, memory: int) -> int:
+    """-Xmx в МБ: четверть памяти в пределах, зависящих от эпохи версии и модов"""
+    if java_major < 16:
+        # До 1.17: мир и ресурсы заметно легче
+        low, high = (2 * GIB, 6 * GIB) if modded else (1 * GIB, 3 * GIB)
+    else:
+        low, high = (3 * GIB, 8 * GIB) if modded else (2 * GIB, 4 * GIB)
+    if not memory:
+        return low // (1024 ** 2)
+    heap = min(max(memory // 4, low), high)
+    # На слабых машинах не отнимаем память у системы, даже если не дотягиваем до нижней границы
+    heap = min(heap, max(memory - SYSTEM_RESERVE, memory // 2))
+    return max(heap // (1024 ** 2), 512)
+
+
+def tuned_arguments(java_major: int, modded: bool, memory: int = None, cores: int = None) -> list:
+    """Аргументы JVM: размер кучи и настройки G1 под память, ядра и эпоху версии"""
+    memory = system_memory() if memory is None else memory
+    cores = (os.cpu_count() or 2) if cores is None else cores
+    xmx = heap_size(java_major, modded, memory)
+    args = [f'-Xmx{xmx}M', f'-Xms{max(xmx // 2, 512)}M']
+    # Как у официального лаунчера для Java 8 и G1 с короткими паузами для новых версий
+    args += ['-XX:+UnlockExperimentalVMOptions', '-XX:+UseG1GC', '-XX:G1ReservePercent=20']
+    if java_major < 16:
+        args += ['-XX:G1NewSizePercent=20', '-XX:MaxGCPauseMillis=50', '-XX:G1HeapRegionSize=32M']
+    else:
+        args += ['-XX:G1NewSizePercent=30', '-XX:G1MaxNewSizePercent=40', '-XX:MaxGCPauseMillis=100',
+                 '-XX:G1HeapRegionSize=8M', '-XX:+ParallelRefProcEnabled', '-XX:+DisableExplicitGC']
+    if cores <= 4:
+        # Фоновые потоки GC не должны отнимать ядра у потока рендера
+        args.append('-XX:ConcGCThreads=1')
+    return args
+
+
+def _classpath(command: list) -> str:
+    for i, arg in enumerate(command[:-1]):
+        if arg in ('-cp', '-classpath', '--class-path'):
+            return command[i + 1]
+    return ''
+
+
+class CdsArchives:
+    """Архивы Class Data Sharing по версиям: cache/cds/<версия>.jsa.
+
+    Java 19+ сама создаёт и обновляет архив (AutoCreateSharedArchive). На Java 13–18 архив
+    пишется при выходе из игры и используется со следующего запуска; при смене Java или
+    classpath он пересоздаётся. Java 8/11 динамические архивы не поддерживают.
+    """
+
+    def __init__(self, minecraft_directory: str):
+        self.cds_dir = os.path.join(minecraft_directory, 'cache', 'cds')
+
+    @staticmethod
+    def supported(java_major: int) -> bool:
+        return java_major >= 13
+
+    def archive_path(self, version_id: str) -> str:
+        return os.path.join(self.cds_dir, f"{version_id}.jsa")
+
+    def arguments(self, version_id: str, java_major: int, command: list) -> list:
+        if not self.supported(java_major):
+            return []
+        os.makedirs(self.cds_dir, exist_ok=True)
+        archive = self.archive_path(version_id)
+        if java_major >= 19:
+            return ['-XX:+AutoCreateSharedArchive', f'-XX:SharedArchiveFile={archive}']
+
+        stamp_path = archive + '.stamp'
+        stamp = hashlib.sha1(f"{command[0]}\n{_classpath(command)}".encode('utf-8')).hexdigest()
+        try:
+            with open(stamp_path, 'r', encoding='utf-8') as f:
+                valid = f.read().strip() == stamp and os.path.isfile(archive)
+        except OSError:
+            valid = False
+        if valid:
+            return [f'-XX:SharedArchiveFile={archive}']
+        # Устаревший архив JVM просто проигнорирует — убираем его и пишем новый при выходе
+        for path in (archive, stamp_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        write_bytes(stamp_path, stamp.encode('utf-8'))
+        return [f'-XX:ArchiveClassesAtExit={archive}']
@@ -0,0 +1,308 @@
+import os
+
+from mjnl.manifest import ManifestCache, MANIFEST_URL
+from mjnl.installed import InstalledIndex
+from mjnl.fileio import write_json
+from mjnl.download import DownloadEngine, DownloadCancelled, DownloadError, _empty
+from mjnl.install import install_version, install_fabric, RESOURCES_URL, FABRIC_META_URL, RUNTIME_MANIFEST_URL
+from mjnl.command_cache import CommandCache
+from mjnl.verify import HashIndex, verify_version, repair_version, VERIFY_FAST
+from mjnl.store import BlobStore
+from mjnl.fabric_meta import FabricMetaCache
+from mjnl.jvm import CdsArchives, java_major_version, tuned_arguments
+from mjnl.mirror import open_mirror
+from mjnl.modpack import ModpackError, sync_modpack
+from mjnl.timing import LaunchTrace, TraceStore
+
+
+SUPPORTED_LOADERS = {'fabric'}
+
+
+class LaunchError(Exception):
+    """Ошибка подготовки запуска; title/text показываются пользователю как есть, cause — исходная ошибка"""
+
+    def __init__(self, title: str, text: str, cause: str = None):
+        super().__init__(text)
+        self.title = title
+        self.text = text
+        self.cause = cause
+
+
+def _is_network_error(error: Exception) -> bool:
+    import requests
+    return isinstance(error, (DownloadError, requests.ConnectionError, requests.Timeout))
+
+
+def split_version(version_id: str) -> tuple:
+    """Синтаксис отображаемых версий: "<base> <loader>" или просто "<base>" -> (base, loader)"""
+    if ' ' in version_id:
+        parts = version_id.split()
+        if len(parts) >= 2 and parts[-1].lower() in SUPPORTED_LOADERS:
+            return ' '.join(parts[:-1]), parts[-1].lower()
+    return version_id, ''
+
+
+class LauncherCore:
+    """Установка и подготовка запуска без Qt: общая для окна лаунчера и консольного режима"""
+
+    def __init__(self, minecraft_directory: str, download_engine: DownloadEngine = None,
+                 manifest_url: str = MANIFEST_URL, meta_url: str = FABRIC_META_URL,
+                 resources_url: str = RESOURCES_URL, mirror: str = None):
+        self.minecraft_directory = minecraft_directory
+        self.manifest_url = manifest_url
+        self.meta_url = meta_url
+        self.resources_url = resources_url
+        self.runtime_url = RUNTIME_MANIFEST_URL
+        self._upstream_urls = (manifest_url, meta_url, RUNTIME_MANIFEST_URL)
+        self.mirror = None
+        # Общий индекс установленных версий (список, офлайн-режим, поиск fabric)
+        self.installed_index = InstalledIndex(minecraft_directory)
+        # Пул потоков и keep-alive соединения переиспользуются между установками
+        self.download_engine = download_engine or DownloadEngine()
+        # Готовые шаблоны команды запуска по версиям
+        self.command_cache = CommandCache(minecraft_directory)
+        # Индекс хэшей установленных файлов для проверки целостности
+        self.hash_index = HashIndex(minecraft_directory)
+        # Одинаковые моды и ресурспаки профилей — жёсткие ссылки на один файл
+        self.blob_store = BlobStore(minecraft_directory, self.hash_index)
+        # Какие версии игры поддерживает Fabric и последний загрузчик
+        self.fabric_meta = FabricMetaCache(minecraft_directory, meta_url)
+        self.manifest_cache = ManifestCache(minecraft_directory, manifest_url)
+        # Архивы CDS для быстрого старта JVM
+        self.cds_archives = CdsArchives(minecraft_directory)
+        # История замеров этапов запуска
+        self.launch_traces = TraceStore(minecraft_directory)
+        if mirror:
+            self.set_mirror(mirror)
+
+    def set_mirror(self, root: str = None):
+        """Зеркало вместо серверов Mojang и fabric-meta: http(s)-адрес или папка другого лаунчера.
+
+        None отключает зеркало. Бросает MirrorError, если папка не подходит.
+        """
+        mirror = open_mirror(root, self.minecraft_directory) if root else None
+        if self.mirror is not None:
+            self.mirror.close()
+        self.mirror = mirror
+        self.download_engine.mirror = mirror
+        self.manifest_url, self.meta_url, self.runtime_url = \
+            (mirror.manifest_url, mirror.meta_url, mirror.runtime_url) if mirror else self._upstream_urls
+        self.manifest_cache.url = self.manifest_url
+        self.fabric_meta.meta_url = self.meta_url
+
+    def _install_kwargs(self, engine: DownloadEngine = None, cancel=None) -> dict:
+        # Записи манифеста из кэша: по ним берём url JSON версии без повторного запроса
+        return {
+            'engine': engine or self.download_engine,
+            'versions': self.manifest_cache.load(),
+            'resources_url': self.resources_url,
+            'manifest_url': self.manifest_url,
+            'runtime_url': self.runtime_url,
+            'cancel': cancel
+        }
+
+    def install_vanilla(self, version_id: str, callback: dict = None, engine: DownloadEngine = None, cancel=None):
+        install_version(version_id, self.minecraft_directory, callback, **self._install_kwargs(engine, cancel))
+        self.installed_index.invalidate()
+
+    def install_modded_if_needed(self, base_version: str, loader: str, callback: dict = None,
+                                 engine: DownloadEngine = None, cancel=None, trace: LaunchTrace = None) -> str:
+        # Возвращает реальный id установленной модифицированной версии (или пусто при неуспехе).
+        # Если установка не удалась и локальной версии нет, бросает LaunchError с настоящей причиной в cause
+        trace = trace or LaunchTrace()
+        kwargs = self._install_kwargs(engine, cancel)
+        error = None
+        try:
+            if loader == 'fabric':
+                # Базовая версия ставится до модлоадера: его профиль наследуется от неё
+                with trace.span('base_install'):
+                    install_version(base_version, self.minecraft_directory, callback, **kwargs)
+                # На зеркале есть не любой загрузчик: без версии берётся последний из установленных на нём
+                loader_version = self.fabric_meta.latest_loader() if self.mirror is None else None
+                with trace.span('loader_install'):
+                    install_fabric(base_version, self.minecraft_directory, callback,
+                                   loader_version=loader_version, meta_url=self.meta_url, with_base=False,
+                                   **kwargs)
+        except DownloadCancelled:
+            raise
+        except Exception as e:
+            # Ошибка осталась в спане; сначала попробуем найти локально установленную
+            error = e
+        self.installed_index.invalidate()
+        version_id = self.installed_index.find_mod_version(base_version, loader)
+        if not version_id and error is not None:
+            text = f'Не удалось установить {loader} для {base_version}'
+            text += '. Проверьте интернет.' if _is_network_error(error) else f': {error}'
+            raise LaunchError('Ошибка установки', text, f"{type(error).__name__}: {error}") from error
+        return version_id
+
+    def create_alias(self, base_version: str, loader: str, real_version: str):
+        # Алиас-версия с читаемым названием, например "1.21.8 fabric"; нужна только для списка
+        alias_id = f"{base_version} {loader}"
+        alias_dir = os.path.join(self.minecraft_directory, 'versions', alias_id)
+        alias_json_path = os.path.join(alias_dir, f"{alias_id}.json")
+        if not os.path.isfile(alias_json_path):
+            os.makedirs(alias_dir, exist_ok=True)
+            alias_data = {
+                'id': alias_id,
+                'inheritsFrom': real_version,
+                'type': 'release'
+            }
+            write_json(alias_json_path, alias_data, indent=4, ensure_ascii=False)
+            self.installed_index.invalidate()
+
+    def profile_dir(self, base_version: str, loader: str) -> str:
+        return os.path.join(self.minecraft_directory, 'profiles', f"{base_version}-{loader}")
+
+    def prepare_profile(self, base_version: str, loader: str, span=None) -> str:
+        # Для модовой версии используем отдельную папку профиля. Бросает LaunchError, если её не создать;
+        # ошибка дедупликации не мешает запуску и записывается в span (этап замера)
+        game_dir = self.profile_dir(base_version, loader)
+        try:
+            for sub in ['mods', 'config', 'resourcepacks', 'saves']:
+                os.makedirs(os.path.join(game_dir, sub), exist_ok=True)
+        except OSError as e:
+            raise LaunchError('Ошибка профиля', f'Не удалось создать папку профиля {game_dir}: {e}',
+                              f"{type(e).__name__}: {e}") from e
+        try:
+            self.blob_store.dedupe_profile(game_dir)
+        except Exception as e:
+            if span is not None:
+                span.error = f"dedupe_profile: {type(e).__name__}: {e}"
+        return game_dir
+
+    def install(self, version_id: str, callback: dict = None, engine: DownloadEngine = None, cancel=None,
+                trace: LaunchTrace = None) -> tuple:
+        """Устанавливает версию при необходимости. Возвращает (id для запуска, папка игры или None).
+
+        Бросает LaunchError с сообщением для пользователя и DownloadCancelled при отмене.
+        trace получает этапы resolve, fabric_lookup, base_install, loader_install и profile.
+        """
+        trace = trace or LaunchTrace(version_id)
+        with trace.span('resolve'):
+            base_version, loader = split_version(version_id)
+            installed = not loader and self.installed_index.is_installed(version_id)
+        if not loader:
+            # Обычная ванильная версия
+            if not installed:
+                with trace.span('base_install') as span:
+                    try:
+                        self.install_vanilla(version_id, callback, engine, cancel)
+                    except DownloadCancelled:
+                        raise
+                    except Exception as e:
+                        # Пользователю — понятное сообщение, в замерах и в cause — настоящая причина
+                        span.error = f"{type(e).__name__}: {e}"
+                        if _is_network_error(e):
+                            raise LaunchError(
+                                'Оффлайн режим',
+                                'Эта версия не установлена локально и не может быть скачана без интернета.',
+                                span.error
+                            ) from e
+                        raise LaunchError('Ошибка установки', f'Не удалось установить {version_id}: {e}',
+                                          span.error) from e
+            return version_id, None
+
+        find_installed_mod_version = self.installed_index.find_mod_version
+        with trace.span('fabric_lookup'):
+            # Неподдерживаемую версию отсекаем сразу, а не после долгой попытки установки
+            if self.fabric_meta.load() and not self.fabric_meta.supports(base_version) \
+                    and not find_installed_mod_version(base_version, loader):
+                raise LaunchError('Ошибка установки', f'Fabric не поддерживает версию {base_version}.')
+            # Пытаемся найти уже установленную мод-версию
+            version_to_launch = find_installed_mod_version(base_version, loader)
+        if not version_to_launch:
+            # Пытаемся установить мод-версию (если есть интернет/установщик)
+            version_to_launch = self.install_modded_if_needed(base_version, loader, callback, engine, cancel, trace)
+        if not version_to_launch:
+            raise LaunchError('Ошибка установки', f'Не удалось установить {loader} для {base_version}. Проверьте интернет или совместимость версии.')
+        with trace.span('profile') as span:
+            if loader in version_to_launch.lower():
+                try:
+                    self.create_alias(base_version, loader, version_to_launch)
+                except Exception as e:
+                    span.error = str(e)
+            return version_to_launch, self.prepare_profile(base_version, loader, span)
+
+    def sync_modpack(self, game_dir: str, callback: dict = None, engine: DownloadEngine = None, cancel=None):
+        """Приводит моды профиля к его modpack.json (если он есть). Бросает LaunchError."""
+        try:
+            return sync_modpack(game_dir, self.blob_store, engine or self.download_engine, callback, cancel)
+        except (ModpackError, DownloadError, OSError) as e:
+            raise LaunchError('Ошибка сборки модов', str(e))
+
+    def verify(self, version_id: str, mode: str = VERIFY_FAST, callback: dict = None, repair: bool = True,
+               engine: DownloadEngine = None, cancel=None) -> list:
+        """Проверка целостности; битые файлы докачиваются через установку. Возвращает найденные битые файлы."""
+        bad_files = verify_version(version_id, self.minecraft_directory, self.hash_index, mode,
+                                   self.resources_url)
+        if bad_files and repair:
+            if callback:
+                callback.get('setStatus', _empty)(f'Восстановление файлов: {len(bad_files)}')
+            repair_version(version_id, self.minecraft_directory, bad_files, self.hash_index, callback,
+                           **self._install_kwargs(engine, cancel))
+        return bad_files
+
+    def build_command(self, version_id: str, username: str, game_dir: str = None,
+                      jvm_tuning: bool = True, cds: bool = False, modded: bool = False) -> list:
+        # Запуск игры с ником (offline-режим)
+        options = {
+            'username': username,
+            'uuid': '',
+            'token': ''
+        }
+        if game_dir:
+            options['gameDirectory'] = game_dir
+        command = self.command_cache.get_command(version_id, options)
+
+        # Аргументы JVM не входят в кэшированный шаблон: они зависят от машины и состояния архива CDS
+        jvm_args = []
+        if jvm_tuning or cds:
+            java_major = java_major_version(version_id, self.minecraft_directory)
+            if jvm_tuning:
+                jvm_args += tuned_arguments(java_major, modded)
+            if cds:
+                try:
+                    jvm_args += self.cds_archives.arguments(version_id, java_major, command)
+                except OSError:
+                    pass
+        # Туда же, куда minecraft_launcher_lib кладёт jvmArguments: сразу после java
+        return command[:1] + jvm_args + command[1:]
+
+    def prepare_launch(self, version_id: str, username: str, callback: dict = None,
+                       verify_mode: str = VERIFY_FAST, jvm_tuning: bool = True, cds: bool = False,
+                       trace: LaunchTrace = None) -> list:
+        """Установка, проверка и сборка команды. Возвращает команду запуска.
+
+        Байты и файлы попадают в этапы trace, если callback получен из trace.callback().
+        """
+        trace = trace or LaunchTrace(version_id)
+        version_to_launch, game_dir = self.install(version_id, callback, trace=trace)
+        if game_dir:
+            with trace.span('modpack'):
+                self.sync_modpack(game_dir, callback)
+        # Проверка целостности перед запуском
+        with trace.span('verify') as span:
+            try:
+                if callback:
+                    callback.get('setStatus', _empty)('Проверка файлов')
+                self.verify(version_to_launch, verify_mode, callback)
+            except Exception as e:
+                # Без сети восстановить не получится — пробуем запустить как есть
+                span.error = str(e)
+        with trace.span('command'):
+            return self.build_command(version_to_launch, username, game_dir, jvm_tuning, cds,
+                                      modded=bool(split_version(version_id)[1]))
+
+    def prewarm(self, version_id: str, engine: DownloadEngine = None, cancel=None):
+        """Фоновая подготовка версии к запуску: установка, нативы, индекс хэшей и шаблон команды.
+
+        После неё prepare_launch почти ничего не делает. Бросает LaunchError и DownloadCancelled.
+        """
+        version_to_launch, game_dir = self.install(version_id, None, engine, cancel)
+        if game_dir:
+            self.sync_modpack(game_dir, None, engine, cancel)
+        # Прогреваем индекс хэшей, чтобы быстрая проверка при запуске не читала jar-файлы заново
+        self.verify(version_to_launch, VERIFY_FAST, engine=engine, cancel=cancel)
+        # Шаблон команды не зависит от ника; аргументы JVM и CDS добавляются только при запуске
+        self.build_command(version_to_launch, '', game_dir, jvm_tuning=False)
@@ -0,0 +1,443 @@
+import os
+import re
+import math
+import gzip
+import json
+import time
+import base64
+import queue
+import hashlib
+import threading
+from datetime import datetime
+
+from mjnl.fileio import FileLock, atomic_write, write_json
+
+
+LATEST_LOG = 'latest.log'
+# Второе окно лаунчера пишет свой latest-<pid>.log: в чужой latest.log не пишем и не переименовываем его
+PROCESS_LOG_RE = re.compile(r'^latest-\d+\.log$')
+LOCK_SUFFIX = '.lock'
+# Лог больше этого размера уходит в архив, не дожидаясь следующего запуска
+MAX_LATEST_SIZE = 10 * 1024 * 1024
+# Архив пишется отдельными gzip-членами такого размера (несжатый текст): читать можно по частям
+MEMBER_SIZE = 256 * 1024
+# Фильтр Блума куска подбирается по числу разных слов в нём: ~10 бит на слово при 1% ложных срабатываний
+BLOOM_FP_RATE = 0.01
+INDEX_SUFFIX = '.idx'
+INDEX_VERSION = 2
+
+CRASH_RE = re.compile(
+    r'---- Minecraft Crash Report ----|#@!@# Game crashed!|Exception in thread'
+    r'|A fatal error has been detected by the Java Runtime Environment|/FATAL\]'
+)
+TOKEN_RE = re.compile(r'\w+')
+ARCHIVE_RE = re.compile(r'^(\d{4}-\d{2}-\d{2})-(\d+)\.log\.gz$')
+
+
+def _bloom_positions(token: str, size: int, hashes: int):
+    # Двойное хэширование: k позиций из одного 8-байтового хэша
+    digest = hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+    h1 = int.from_bytes(digest[:4], 'little')
+    h2 = int.from_bytes(digest[4:], 'little') | 1
+    for i in range(hashes):
+        yield (h1 + i * h2) % size
+
+
+class Bloom:
+    """Фильтр Блума по словам куска лога: «точно нет» без распаковки"""
+
+    def __init__(self, data: bytes, hashes: int):
+        self.bits = bytearray(data)
+        self.hashes = hashes
+
+    @classmethod
+    def for_tokens(cls, count: int, fp_rate: float = BLOOM_FP_RATE) -> 'Bloom':
+        """Пустой фильтр на count слов с заданной долей ложных срабатываний"""
+        count = max(count, 1)
+        size = max(64, math.ceil(-count * math.log(fp_rate) / math.log(2) ** 2))
+        hashes = max(1, round(size / count * math.log(2)))
+        return cls(bytes((size + 7) // 8), hashes)
+
+    def add_tokens(self, tokens):
+        size = len(self.bits) * 8
+        for token in tokens:
+            for pos in _bloom_positions(token, size, self.hashes):
+                self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def may_contain(self, token: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7))
+                   for pos in _bloom_positions(token, len(self.bits) * 8, self.hashes))
+
+    def encode(self) -> str:
+        return base64.b64encode(self.bits).decode('ascii')
+
+
+def format_line(source: str, level: str, message: str) -> str:
+    """Строка в формате логов Minecraft: [чч:мм:сс] [источник/уровень]: сообщение"""
+    return f"[{time.strftime('%H:%M:%S')}] [{source}/{level}]: {message}"
+
+
+def _line_count(text: str) -> int:
+    return text.count('\n') + (1 if text and not text.endswith('\n') else 0)
+
+
+def _member_index(text: str, first_line: int, offset: int, length: int) -> tuple:
+    # Каждое слово хэшируется один раз на кусок, а не на строку
+    tokens = set(TOKEN_RE.findall(text.lower()))
+    bloom = Bloom.for_tokens(len(tokens))
+    bloom.add_tokens(tokens)
+    crashes = [{'line': first_line + line_no, 'text': line[:300]}
+               for line_no, line in _grep(text, CRASH_RE)]
+    member = {'offset': offset, 'length': length, 'first_line': first_line,
+              'lines': _line_count(text), 'bloom': bloom.encode(), 'bloom_hashes': bloom.hashes}
+    return member, crashes
+
+
+def _iter_chunks(f, size: int = MEMBER_SIZE):
+    # Куски целых строк примерно по size байт
+    chunk, chunk_size = [], 0
+    for raw in f:
+        chunk.append(raw)
+        chunk_size += len(raw)
+        if chunk_size >= size:
+            yield b''.join(chunk)
+            chunk, chunk_size = [], 0
+    if chunk:
+        yield b''.join(chunk)
+
+
+def _decode(data: bytes) -> str:
+    return data.decode('utf-8', errors='replace')
+
+
+def _grep(text: str, pattern, limit: int = None) -> list:
+    """[(номер строки, строка)] для строк text, где есть совпадение; регулярка идёт по всему тексту сразу"""
+    results = []
+    line_no = 0
+    counted_to = 0
+    next_start = 0
+    for match in pattern.finditer(text):
+        if match.start() < next_start:
+            continue
+        line_start = text.rfind('\n', 0, match.start()) + 1
+        line_end = text.find('\n', match.start())
+        if line_end < 0:
+            line_end = len(text)
+        line_no += text.count('\n', counted_to, line_start)
+        counted_to = line_start
+        results.append((line_no, text[line_start:line_end].rstrip('\r')))
+        next_start = line_end + 1
+        if limit is not None and len(results) >= limit:
+            break
+    return results
+
+
+def _lines_from(text: str, start: int, count: int) -> list:
+    return [line.rstrip('\r') for line in text.split('\n')[start:start + count]]
+
+
+def compress_log(src_path: str, dst_path: str) -> dict:
+    """Сжимает текстовый лог в gzip из нескольких членов и пишет рядом индекс. Возвращает индекс."""
+    members, crashes = [], []
+    line_no = 0
+    with open(src_path, 'rb') as src, atomic_write(dst_path) as dst:
+        for chunk in _iter_chunks(src):
+            data = gzip.compress(chunk, compresslevel=6)
+            member, member_crashes = _member_index(_decode(chunk), line_no, dst.tell(), len(data))
+            dst.write(data)
+            members.append(member)
+            crashes.extend(dict(crash, member=len(members) - 1) for crash in member_crashes)
+            line_no += member['lines']
+        # Индекс пишется раньше архива: архив без индекса не появится
+        index = {'version': INDEX_VERSION, 'lines': line_no, 'members': members, 'crashes': crashes}
+        _write_index(dst_path, index)
+    return index
+
+
+def _write_index(log_path: str, index: dict):
+    write_json(log_path + INDEX_SUFFIX, index)
+
+
+class LogPipeline:
+    """Фоновая запись логов лаунчера и игры в logs/latest.log.
+
+    write() только кладёт строку в очередь. Поток-писатель пишет пачками, а сжатие
+    в <дата>-N.log.gz с индексом идёт в отдельном потоке и не задерживает запись.
+
+    latest.log принадлежит окну, которое держит latest.log.lock; остальные окна пишут
+    latest-<pid>.log. Архивы сжимает только владелец latest.log, в том числе логи закрытых окон.
+    """
+
+    def __init__(self, logs_dir: str, max_size: int = MAX_LATEST_SIZE):
+        self.logs_dir = logs_dir
+        self.max_size = max_size
+        self._queue = queue.Queue()
+        self._compress_queue = queue.Queue()
+        self._file = None
+        self._lines = 0
+        # Краши текущего latest.log: номер строки и текст
+        self.crashes = []
+        self._crashes_lock = threading.Lock()
+        os.makedirs(logs_dir, exist_ok=True)
+
+        self.latest_path = os.path.join(logs_dir, LATEST_LOG)
+        self._lock = FileLock(self.latest_path + LOCK_SUFFIX)
+        self.primary = self._lock.acquire(blocking=False)
+        if not self.primary:
+            self.latest_path = os.path.join(logs_dir, f"latest-{os.getpid()}.log")
+            self._lock = FileLock(self.latest_path + LOCK_SUFFIX)
+            self._lock.acquire()
+        # Как и Minecraft, прошлую сессию архивируем при старте (свой файл мог остаться от процесса с тем же PID)
+        if os.path.isfile(self.latest_path) and os.path.getsize(self.latest_path) > 0:
+            self._detach(self.latest_path)
+        if self.primary:
+            self._collect_pending()
+        self._open_latest()
+
+        self._writer = threading.Thread(target=self._write_loop, daemon=True, name='mjnl-log-writer')
+        self._compressor = threading.Thread(target=self._compress_loop, daemon=True, name='mjnl-log-gzip')
+        self._writer.start()
+        self._compressor.start()
+
+    def write(self, line: str):
+        self._queue.put(line)
+
+    def log(self, message: str, level: str = 'INFO', source: str = 'MJNL'):
+        self.write(format_line(source, level, message))
+
+    def close(self):
+        """Дописывает очередь и ждёт сжатия архивов"""
+        self._queue.put(None)
+        self._writer.join()
+        self._compress_queue.put(None)
+        self._compressor.join()
+        self._lock.release()
+
+    def _collect_pending(self):
+        # Логи закрытых окон (их блокировка свободна) и недожатые архивы
+        for name in os.listdir(self.logs_dir):
+            if not PROCESS_LOG_RE.match(name):
+                continue
+            path = os.path.join(self.logs_dir, name)
+            lock = FileLock(path + LOCK_SUFFIX)
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                if os.path.getsize(path) == 0:
+                    os.remove(path)
+                elif self._detach(path) is None:
+                    continue
+            except OSError:
+                continue
+            finally:
+                lock.release()
+            try:
+                os.remove(path + LOCK_SUFFIX)
+            except OSError:
+                pass
+        for name in os.listdir(self.logs_dir):
+            if name.endswith('.pending'):
+                self._compress_queue.put(os.path.join(self.logs_dir, name))
+
+    def _open_latest(self):
+        self._file = open(self.latest_path, 'a', encoding='utf-8', newline='\n')
+        self._lines = 0
+        with self._crashes_lock:
+            self.crashes = []
+
+    def _detach(self, path: str):
+        """Переименовывает лог в .pending для сжатия; None — файл занят (на Windows — открыт другим процессом)"""
+        pending = os.path.join(self.logs_dir, f"{os.path.basename(path)}.{time.time_ns()}.pending")
+        try:
+            os.replace(path, pending)
+        except OSError:
+            return None
+        return pending
+
+    def _detach_latest(self):
+        # Быстрое переименование на пути записи; само сжатие — в фоне. Не вышло — пишем дальше в тот же файл.
+        pending = self._detach(self.latest_path)
+        # Архивы сжимает только владелец latest.log, иначе два окна выберут одно имя архива
+        if pending and self.primary:
+            self._compress_queue.put(pending)
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            # Всё, что накопилось, пишем одним вызовом
+            while len(batch) < 4096:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            closing = None in batch
+            lines = [line for line in batch if line is not None]
+            if lines:
+                new_crashes = [{'line': self._lines + i, 'text': line[:300]}
+                               for i, line in enumerate(lines) if CRASH_RE.search(line)]
+                self._file.write('\n'.join(lines) + '\n')
+                self._file.flush()
+                self._lines += len(lines)
+                if new_crashes:
+                    with self._crashes_lock:
+                        self.crashes.extend(new_crashes)
+                if self._file.tell() >= self.max_size:
+                    self._file.close()
+                    self._detach_latest()
+                    self._open_latest()
+            if closing:
+                self._file.close()
+                return
+
+    def _archive_path(self, mtime: float) -> str:
+        date = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d')
+        n = 1
+        while os.path.exists(os.path.join(self.logs_dir, f"{date}-{n}.log.gz")):
+            n += 1
+        return os.path.join(self.logs_dir, f"{date}-{n}.log.gz")
+
+    def _compress_loop(self):
+        while True:
+            pending = self._compress_queue.get()
+            if pending is None:
+                return
+            try:
+                compress_log(pending, self._archive_path(os.path.getmtime(pending)))
+                os.remove(pending)
+            except OSError:
+                # Оставляем .pending — дожмём при следующем запуске
+                pass
+
+
+class LogStore:
+    """Поиск по latest.log и архивам через индексы: распаковываются только нужные куски"""
+
+    def __init__(self, logs_dir: str):
+        self.logs_dir = logs_dir
+
+    def archives(self) -> list:
+        """Архивы от новых к старым"""
+        found = []
+        try:
+            names = os.listdir(self.logs_dir)
+        except OSError:
+            return []
+        for name in names:
+            match = ARCHIVE_RE.match(name)
+            if match:
+                found.append((match.group(1), int(match.group(2)), name))
+        return [os.path.join(self.logs_dir, name) for _, _, name in sorted(found, reverse=True)]
+
+    def index(self, archive_path: str) -> dict:
+        """Индекс архива; для архивов без индекса (старые, чужие) строится один раз"""
+        try:
+            with open(archive_path + INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') == INDEX_VERSION:
+                return index
+        except (OSError, ValueError):
+            pass
+        # Обычный gzip читается только целиком — весь файл будет одним куском индекса
+        with gzip.open(archive_path, 'rb') as f:
+            text = _decode(f.read())
+        member, crashes = _member_index(text, 0, 0, os.path.getsize(archive_path))
+        index = {'version': INDEX_VERSION, 'lines': member['lines'], 'members': [member],
+                 'crashes': [dict(crash, member=0) for crash in crashes]}
+        try:
+            _write_index(archive_path, index)
+        except OSError:
+            pass
+        return index
+
+    @staticmethod
+    def read_member(archive_path: str, member: dict) -> str:
+        with open(archive_path, 'rb') as f:
+            f.seek(member['offset'])
+            data = f.read(member['length'])
+        return _decode(gzip.decompress(data))
+
+    def _latest_text(self) -> str:
+        try:
+            with open(os.path.join(self.logs_dir, LATEST_LOG), 'rb') as f:
+                return _decode(f.read())
+        except OSError:
+            return ''
+
+    def search(self, query: str, regex: bool = False, whole_words: bool = True, limit: int = 100) -> list:
+        """Строки с query: слова целиком (по умолчанию), подстрока или регулярное выражение; без учёта регистра.
+
+        Возвращает [(файл, номер строки, текст)], сначала свежие файлы.
+        """
+        tokens = []
+        if regex:
+            pattern = re.compile(query, re.IGNORECASE | re.MULTILINE)
+        elif whole_words:
+            pattern = re.compile(r'(?<!\w)' + re.escape(query) + r'(?!\w)', re.IGNORECASE)
+            # Все слова запроса — целые слова строки, поэтому по фильтру Блума можно пропускать куски
+            tokens = TOKEN_RE.findall(query.lower())
+        else:
+            pattern = re.compile(re.escape(query), re.IGNORECASE)
+        results = [(LATEST_LOG, line_no, line) for line_no, line in _grep(self._latest_text(), pattern, limit)]
+        for path in self.archives():
+            for member in self.index(path)['members']:
+                if len(results) >= limit:
+                    return results
+                if tokens:
+                    bloom = Bloom(base64.b64decode(member['bloom']), member['bloom_hashes'])
+                    if not all(bloom.may_contain(token) for token in tokens):
+                        continue
+                found = _grep(self.read_member(path, member), pattern, limit - len(results))
+                name = os.path.basename(path)
+                results.extend((name, member['first_line'] + line_no, line) for line_no, line in found)
+        return results[:limit]
+
+    def last_crash(self, context: int = 40):
+        """Последний краш: (файл, номер строки, строки с этой и далее) или None"""
+        text = self._latest_text()
+        crashes = _grep(text, CRASH_RE)
+        if crashes:
+            line_no = crashes[-1][0]
+            return LATEST_LOG, line_no, _lines_from(text, line_no, context)
+        for path in self.archives():
+            index = self.index(path)
+            if not index['crashes']:
+                continue
+            crash = index['crashes'][-1]
+            members = index['members']
+            member_no = crash['member']
+            text = self.read_member(path, members[member_no])
+            start = crash['line'] - members[member_no]['first_line']
+            # Отчёт о краше может перейти в следующий кусок
+            if members[member_no]['lines'] - start < context and member_no + 1 < len(members):
+                text += self.read_member(path, members[member_no + 1])
+            return os.path.basename(path), crash['line'], _lines_from(text, start, context)
+        return None
+
+
+if __name__ == '__main__':
+    import argparse
+    from mjnl.paths import logs_directory
+
+    parser = argparse.ArgumentParser(description='Поиск по логам MJNL')
+    parser.add_argument('--logs-dir', default=logs_directory)
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('search', help='найти строки во всех логах, включая архивы')
+    p.add_argument('query')
+    p.add_argument('--regex', action='store_true')
+    p.add_argument('--substring', action='store_true', help='искать подстроку, а не слова целиком (без индекса)')
+    p.add_argument('--limit', type=int, default=100)
+    sub.add_parser('last-crash', help='показать последний краш')
+    args = parser.parse_args()
+
+    store = LogStore(args.logs_dir)
+    if args.command == 'search':
+        for name, line_no, text in store.search(args.query, args.regex, not args.substring, args.limit):
+            print(f"{name}:{line_no + 1}: {text}")
+    else:
+        crash = store.last_crash()
+        if crash is None:
+            print('Крашей не найдено')
+        else:
+            name, line_no, lines = crash
+            print(f"{name}:{line_no + 1}")
+            print('\n'.join(lines))
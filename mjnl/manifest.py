@@ -0,0 +1,74 @@
+import os
+import json
+import hashlib
+
+from mjnl.fileio import write_bytes, write_json
+
+
+MANIFEST_URL = 'https://launchermeta.mojang.com/mc/game/version_manifest_v2.json'
+
+
+class ManifestCache:
+    """Дисковый кэш манифеста версий с условным обновлением (ETag/Last-Modified)"""
+
+    def __init__(self, minecraft_directory: str, url: str = MANIFEST_URL, timeout: float = 10):
+        self.url = url
+        self.timeout = timeout
+        cache_dir = os.path.join(minecraft_directory, 'cache')
+        self.manifest_path = os.path.join(cache_dir, 'version_manifest_v2.json')
+        self.meta_path = os.path.join(cache_dir, 'version_manifest_v2.meta.json')
+        self._meta = None
+
+    def _read_meta(self) -> dict:
+        if self._meta is None:
+            try:
+                with open(self.meta_path, 'r', encoding='utf-8') as f:
+                    self._meta = json.load(f)
+            except Exception:
+                self._meta = {}
+        return self._meta
+
+    def load(self):
+        """Возвращает список версий из кэша или None, если кэша нет"""
+        try:
+            with open(self.manifest_path, 'rb') as f:
+                return json.loads(f.read()).get('versions', [])
+        except Exception:
+            return None
+
+    def refresh(self):
+        """Условно скачивает манифест. Возвращает (изменился ли список, список версий).
+
+        Сетевые ошибки пробрасываются наружу — решение об офлайн-режиме принимает вызывающий.
+        """
+        meta = self._read_meta()
+        cached = self.load()
+        headers = {}
+        if cached is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        import requests
+        r = requests.get(self.url, headers=headers, timeout=self.timeout)
+        if r.status_code == 304 and cached is not None:
+            return False, cached
+        r.raise_for_status()
+
+        body = r.content
+        digest = hashlib.sha1(body).hexdigest()
+        versions = json.loads(body).get('versions', [])
+        changed = cached is None or digest != meta.get('sha1')
+
+        new_meta = {
+            'etag': r.headers.get('ETag'),
+            'last_modified': r.headers.get('Last-Modified'),
+            'sha1': digest,
+        }
+        if changed:
+            write_bytes(self.manifest_path, body)
+        if changed or new_meta != meta:
+            write_json(self.meta_path, new_meta, indent=4)
+            self._meta = new_meta
+        return changed, versions
@@ -0,0 +1,138 @@
+"""Зеркало файлов игры: папка другого лаунчера или `python -m mjnl.cli serve` в локальной сети.
+
+Файлы на зеркале лежат по тем же относительным путям, что и в папке игры (versions/, libraries/,
+assets/, runtime/), поэтому адрес любой задачи загрузки получается из её локального пути. Манифест версий,
+fabric-meta и списки сборок Java отдаются из кэша и установленных версий и Java папки-зеркала.
+"""
+import os
+import json
+from typing import Optional
+from urllib.parse import quote
+
+from mjnl.install import INSTALLING_SUFFIX
+from mjnl.runtime import RUNTIME_STATE_FILE, RUNTIME_MANIFEST_FILE
+
+
+# Подпапки папки игры, которые отдаёт зеркало
+MIRRORED_DIRS = ('versions', 'libraries', 'assets', 'runtime')
+MANIFEST_PATH = '/mc/game/version_manifest_v2.json'
+FABRIC_PREFIX = '/fabric/v2'
+RUNTIME_PREFIX = '/java-runtime'
+DEFAULT_PORT = 8765
+
+
+class MirrorError(Exception):
+    pass
+
+
+class Mirror:
+    """Адреса зеркала для папки игры этого лаунчера"""
+
+    def __init__(self, base_url: str, minecraft_directory: str, server=None):
+        self.base_url = base_url.rstrip('/')
+        self.minecraft_directory = os.path.abspath(minecraft_directory)
+        # Локальный сервер для зеркала-папки; останавливается в close()
+        self.server = server
+
+    @property
+    def manifest_url(self) -> str:
+        return self.base_url + MANIFEST_PATH
+
+    @property
+    def meta_url(self) -> str:
+        return self.base_url + FABRIC_PREFIX
+
+    @property
+    def runtime_url(self) -> str:
+        return self.base_url + RUNTIME_PREFIX + '/all.json'
+
+    def url_for(self, path: str) -> Optional[str]:
+        """Адрес файла на зеркале или None, если файл лежит вне зеркалируемых папок"""
+        try:
+            rel = os.path.relpath(os.path.abspath(path), self.minecraft_directory)
+        except ValueError:
+            # Другой диск в Windows
+            return None
+        parts = rel.split(os.sep)
+        if parts[0] not in MIRRORED_DIRS:
+            return None
+        # JSON недоустановленной версии на зеркале лежит под обычным именем
+        if parts[-1].endswith(INSTALLING_SUFFIX):
+            parts[-1] = parts[-1][:-len(INSTALLING_SUFFIX)]
+        return f"{self.base_url}/{quote('/'.join(parts))}"
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def open_mirror(root: str, minecraft_directory: str) -> Mirror:
+    """Зеркало по адресу http(s)://… или по папке другого лаунчера (её отдаёт локальный сервер)"""
+    if root.startswith(('http://', 'https://')):
+        return Mirror(root, minecraft_directory)
+    if not os.path.isdir(os.path.join(root, 'versions')):
+        raise MirrorError(f"{root}: не папка лаунчера (нет versions/)")
+    if os.path.abspath(root) == os.path.abspath(minecraft_directory):
+        raise MirrorError(f"{root}: зеркало не может совпадать с папкой игры")
+    # http.server нужен только зеркалу-папке, поэтому и импортируется только здесь
+    from mjnl.mirror_server import MirrorServer
+    server = MirrorServer(root, ('127.0.0.1', 0)).start()
+    return Mirror(server.url, minecraft_directory, server)
+
+
+def _load_json(path: str):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def fabric_loaders(minecraft_directory: str, mc_version: str) -> list:
+    """Загрузчики Fabric, установленные в папке для версии игры: от новых к старым по fabric-meta"""
+    prefix, suffix = 'fabric-loader-', f'-{mc_version}'
+    try:
+        names = os.listdir(os.path.join(minecraft_directory, 'versions'))
+    except OSError:
+        return []
+    installed = {
+        name[len(prefix):-len(suffix)] for name in names
+        if name.startswith(prefix) and name.endswith(suffix) and len(name) > len(prefix) + len(suffix)
+        and os.path.isfile(os.path.join(minecraft_directory, 'versions', name, f'{name}.json'))
+    }
+    meta = _load_json(os.path.join(minecraft_directory, 'cache', 'fabric_meta.json')) or {}
+    known = [entry for entry in meta.get('loader', []) if entry.get('version') in installed]
+    unknown = sorted(installed - {entry['version'] for entry in known}, reverse=True)
+    return [{'loader': entry} for entry in known] + \
+           [{'loader': {'version': version, 'stable': True}} for version in unknown]
+
+
+def java_runtimes(minecraft_directory: str) -> dict:
+    """Список сборок Java в формате all.json Mojang: полностью установленные в runtime/ компоненты.
+
+    Адрес манифеста файлов — относительный (<платформа>/<компонент>/manifest.json от списка).
+    """
+    runtime_dir = os.path.join(minecraft_directory, 'runtime')
+    platforms = {}
+    try:
+        components = os.listdir(runtime_dir)
+    except OSError:
+        return platforms
+    for component in components:
+        try:
+            names = os.listdir(os.path.join(runtime_dir, component))
+        except OSError:
+            continue
+        for platform in names:
+            platform_dir = os.path.join(runtime_dir, component, platform)
+            state = _load_json(os.path.join(platform_dir, RUNTIME_STATE_FILE)) or {}
+            # Сборку, которая ещё ставится или поставлена без копии манифеста, не раздаём
+            if not state.get('files') or not os.path.isfile(os.path.join(platform_dir, RUNTIME_MANIFEST_FILE)):
+                continue
+            platforms.setdefault(platform, {})[component] = [{
+                'manifest': {'sha1': state.get('sha1'), 'url': f"{quote(platform)}/{quote(component)}/manifest.json"},
+                'version': {'name': state.get('version')},
+            }]
+    return platforms
@@ -0,0 +1,180 @@
+"""HTTP-сервер зеркала: `python -m mjnl.cli serve` и локальный сервер для зеркала-папки"""
+import os
+import re
+import json
+import threading
+from typing import Optional
+from email.utils import formatdate
+from urllib.parse import unquote, urlsplit
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from mjnl.mirror import (
+    MIRRORED_DIRS, MANIFEST_PATH, FABRIC_PREFIX, RUNTIME_PREFIX, DEFAULT_PORT, fabric_loaders, java_runtimes,
+    _load_json
+)
+from mjnl.runtime import RUNTIME_MANIFEST_FILE
+
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'bytes=(\d+)-(\d*)$')
+
+
+class MirrorHandler(BaseHTTPRequestHandler):
+    server_version = 'MJNL-mirror'
+    # keep-alive: пул загрузки переиспользует соединения
+    protocol_version = 'HTTP/1.1'
+    # Заголовки и тело уходят отдельными write: без TCP_NODELAY каждый ответ ждёт отложенный ACK (~40 мс)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._handle(True)
+
+    def do_HEAD(self):
+        self._handle(False)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _handle(self, with_body: bool):
+        path = unquote(urlsplit(self.path).path)
+        directory = self.server.minecraft_directory
+        try:
+            if path == MANIFEST_PATH:
+                self._send_file(os.path.join(directory, 'cache', 'version_manifest_v2.json'), with_body,
+                                'application/json')
+            elif path.startswith(FABRIC_PREFIX + '/'):
+                self._send_fabric(path[len(FABRIC_PREFIX) + 1:].strip('/').split('/'), with_body)
+            elif path.startswith(RUNTIME_PREFIX + '/'):
+                self._send_runtime(path[len(RUNTIME_PREFIX) + 1:].strip('/').split('/'), with_body)
+            else:
+                self._send_file(self._local_path(path), with_body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _local_path(self, path: str) -> Optional[str]:
+        parts = [part for part in path.split('/') if part]
+        if not parts or parts[0] not in MIRRORED_DIRS or not self._safe_parts(parts):
+            return None
+        return os.path.join(self.server.minecraft_directory, *parts)
+
+    @staticmethod
+    def _safe_parts(parts: list) -> bool:
+        # Никаких выходов за пределы папки, в том числе через разделители и диски Windows
+        return not any(part in ('.', '..') or '\\' in part or ':' in part for part in parts)
+
+    def _send_fabric(self, parts: list, with_body: bool):
+        directory = self.server.minecraft_directory
+        if len(parts) == 6 and parts[:2] == ['versions', 'loader'] and parts[4:] == ['profile', 'json']:
+            # Профиль — это JSON установленной fabric-версии
+            version_id = f'fabric-loader-{parts[3]}-{parts[2]}'
+            if '..' in version_id or '/' in version_id or '\\' in version_id:
+                self.send_error(404)
+                return
+            self._send_file(os.path.join(directory, 'versions', version_id, f'{version_id}.json'), with_body,
+                            'application/json')
+            return
+        if len(parts) == 3 and parts[:2] == ['versions', 'loader']:
+            data = fabric_loaders(directory, parts[2]) or None
+        elif parts in (['versions', 'game'], ['versions', 'loader']):
+            meta = _load_json(os.path.join(directory, 'cache', 'fabric_meta.json')) or {}
+            data = meta.get(parts[1])
+        else:
+            data = None
+        self._send_json(data, with_body)
+
+    def _send_runtime(self, parts: list, with_body: bool):
+        if parts == ['all.json']:
+            self._send_json(java_runtimes(self.server.minecraft_directory), with_body)
+        elif len(parts) == 3 and parts[2] == 'manifest.json' and self._safe_parts(parts):
+            # Манифест файлов Java той сборки, что установлена на зеркале
+            platform, component = parts[:2]
+            self._send_file(os.path.join(self.server.minecraft_directory, 'runtime', component, platform,
+                                         RUNTIME_MANIFEST_FILE), with_body, 'application/json')
+        else:
+            self.send_error(404)
+
+    def _send_json(self, data, with_body: bool):
+        if data is None:
+            self.send_error(404)
+            return
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if with_body:
+            self.wfile.write(body)
+
+    def _send_file(self, path: Optional[str], with_body: bool, content_type: str = 'application/octet-stream'):
+        try:
+            if path is None:
+                raise FileNotFoundError()
+            f = open(path, 'rb')
+        except OSError:
+            self.send_error(404)
+            return
+        with f:
+            st = os.fstat(f.fileno())
+            etag = f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            start, end = 0, st.st_size - 1
+            match = RANGE_RE.match(self.headers.get('Range', ''))
+            if match:
+                start = int(match.group(1))
+                if match.group(2):
+                    end = min(int(match.group(2)), end)
+                if start >= st.st_size or start > end:
+                    self.send_response(416)
+                    self.send_header('Content-Range', f'bytes */{st.st_size}')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {start}-{end}/{st.st_size}')
+            else:
+                self.send_response(200)
+            length = end - start + 1
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(length))
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', formatdate(st.st_mtime, usegmt=True))
+            self.end_headers()
+            if not with_body:
+                return
+            f.seek(start)
+            while length > 0:
+                chunk = f.read(min(CHUNK_SIZE, length))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                length -= len(chunk)
+
+
+class MirrorServer(ThreadingHTTPServer):
+    """HTTP-сервер, отдающий папку лаунчера как зеркало для других машин"""
+
+    daemon_threads = True
+
+    def __init__(self, minecraft_directory: str, address: tuple = ('0.0.0.0', DEFAULT_PORT), verbose: bool = False):
+        self.minecraft_directory = os.path.abspath(minecraft_directory)
+        self.verbose = verbose
+        super().__init__(address, MirrorHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        if host in ('0.0.0.0', ''):
+            host = '127.0.0.1'
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True, name='mjnl-mirror').start()
+        return self
@@ -0,0 +1,206 @@
+"""Сборки модов для профилей: profiles/<версия>-<загрузчик>/modpack.json.
+
+    {
+        "name": "Моя сборка",
+        "mods": [
+            {"name": "sodium.jar", "url": "https://cdn.modrinth.com/...", "sha1": "...", "size": 123},
+            {"name": "local.jar", "path": "extra/local.jar", "sha1": "..."}
+        ],
+        "resourcepacks": [...],
+        "shaderpacks": [...]
+    }
+
+Относительные url и path берутся относительно самого файла сборки. Файлы скачиваются один раз
+в общее хранилище store/objects и попадают в профили жёсткими ссылками, поэтому переключение
+профиля между сборками не качает заново уже виденные моды.
+"""
+import os
+import json
+from typing import NamedTuple, Optional
+from urllib.parse import urljoin
+
+from mjnl.download import DownloadTask, sha1_of_file, check_cancelled, _empty
+from mjnl.fileio import write_json, copy_file, link_file
+from mjnl.store import PROFILE_CONTENT_DIRS
+
+
+MODPACK_FILE = 'modpack.json'
+# Какие файлы профиля положила синхронизация: только их она может удалить
+STATE_FILE = '.modpack-state.json'
+
+
+class ModpackError(Exception):
+    pass
+
+
+class ModFile(NamedTuple):
+    dir: str
+    name: str
+    sha1: str
+    url: Optional[str] = None
+    path: Optional[str] = None
+    size: Optional[int] = None
+
+    @property
+    def rel_path(self) -> str:
+        return f"{self.dir}/{self.name}"
+
+
+def _is_url(source: str) -> bool:
+    return source.startswith(('http://', 'https://'))
+
+
+def _read_source(source: str) -> dict:
+    import requests
+    try:
+        if _is_url(source):
+            r = requests.get(source, timeout=30)
+            r.raise_for_status()
+            return r.json()
+        with open(source, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (requests.RequestException, OSError, ValueError) as e:
+        raise ModpackError(f"Не удалось прочитать сборку {source}: {e}")
+
+
+def parse_modpack(data: dict, base: str = '') -> tuple:
+    """Проверяет сборку и приводит url/path к абсолютным. Возвращает (название, список ModFile)."""
+    if not isinstance(data, dict):
+        raise ModpackError('Сборка должна быть JSON-объектом')
+    files = []
+    seen = set()
+    for folder in PROFILE_CONTENT_DIRS:
+        for entry in data.get(folder, []):
+            name = entry.get('name') or os.path.basename((entry.get('path') or entry.get('url') or '').split('?')[0])
+            # Только имя файла: сборка не может писать за пределы своей папки
+            if not name or name in ('.', '..') or '/' in name or '\\' in name or ':' in name:
+                raise ModpackError(f"Недопустимое имя файла в {folder}: {name!r}")
+            sha1 = (entry.get('sha1') or '').lower()
+            if len(sha1) != 40:
+                raise ModpackError(f"{folder}/{name}: нужен sha1")
+            url, path = entry.get('url'), entry.get('path')
+            if not url and not path:
+                raise ModpackError(f"{folder}/{name}: нужен url или path")
+            if url and base and _is_url(base):
+                url = urljoin(base, url)
+            if path and base and not _is_url(base) and not os.path.isabs(path):
+                path = os.path.join(os.path.dirname(os.path.abspath(base)), path)
+            key = f"{folder}/{name}".lower()
+            if key in seen:
+                raise ModpackError(f"Файл {folder}/{name} указан дважды")
+            seen.add(key)
+            files.append(ModFile(folder, name, sha1, url, path, entry.get('size')))
+    return data.get('name', ''), files
+
+
+def set_modpack(profile_dir: str, source: str) -> str:
+    """Записывает сборку из файла или по адресу в профиль (пути уже абсолютные). Возвращает её название."""
+    name, files = parse_modpack(_read_source(source), source)
+    data = {'name': name, 'source': source}
+    for folder in PROFILE_CONTENT_DIRS:
+        data[folder] = [
+            {key: value for key, value in (('name', f.name), ('sha1', f.sha1), ('url', f.url),
+                                           ('path', f.path), ('size', f.size)) if value is not None}
+            for f in files if f.dir == folder
+        ]
+    write_json(os.path.join(profile_dir, MODPACK_FILE), data, indent=4, ensure_ascii=False)
+    return name
+
+
+def load_modpack(profile_dir: str):
+    """Сборка профиля: (название, список ModFile) или None, если сборки нет"""
+    path = os.path.join(profile_dir, MODPACK_FILE)
+    if not os.path.isfile(path):
+        return None
+    return parse_modpack(_read_source(path))
+
+
+def _load_state(profile_dir: str) -> dict:
+    try:
+        with open(os.path.join(profile_dir, STATE_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(profile_dir: str, state: dict):
+    write_json(os.path.join(profile_dir, STATE_FILE), state, indent=4, ensure_ascii=False)
+
+
+def _place(blob: str, target: str):
+    # Жёсткая ссылка на blob; там, где их нет (FAT, другой диск), — копия
+    link_file(blob, target, copy_fallback=True)
+
+
+def sync_modpack(profile_dir: str, blob_store, engine, callback: dict = None, cancel=None):
+    """Приводит файлы профиля к сборке. Возвращает отчёт или None, если у профиля нет сборки.
+
+    Совпадающие файлы не трогаются, недостающие берутся из общего хранилища, а чего там нет —
+    скачиваются параллельно с проверкой sha1. Удаляются только файлы, которые положила
+    предыдущая синхронизация; моды, добавленные вручную, остаются.
+    """
+    modpack = load_modpack(profile_dir)
+    if modpack is None:
+        return None
+    _, files = modpack
+    callback = callback or {}
+    set_status = callback.get('setStatus', _empty)
+    hash_index = blob_store.hash_index
+    report = {'unchanged': 0, 'linked': 0, 'downloaded': 0, 'removed': 0}
+
+    set_status('Проверка модов')
+    changed = []
+    for mod in files:
+        target = os.path.join(profile_dir, mod.dir, mod.name)
+        try:
+            st = os.stat(target)
+            if hash_index.sha1(target, st) == mod.sha1:
+                report['unchanged'] += 1
+                continue
+        except OSError:
+            pass
+        changed.append(mod)
+
+    # Чего нет в общем хранилище: по url — качаем туда пулом, по path — копируем с проверкой
+    missing = [mod for mod in changed if not os.path.isfile(blob_store.blob_path(mod.sha1))]
+    tasks = [DownloadTask(mod.url, blob_store.blob_path(mod.sha1), mod.sha1, mod.size) for mod in missing if mod.url]
+    if tasks:
+        engine.download_all(tasks, callback, status='Загрузка модов', cancel=cancel)
+        report['downloaded'] = len(tasks)
+    for mod in missing:
+        if mod.url:
+            continue
+        check_cancelled(cancel)
+        if sha1_of_file(mod.path) != mod.sha1:
+            raise ModpackError(f"{mod.path}: sha1 не совпадает со сборкой")
+        blob = blob_store.blob_path(mod.sha1)
+        copy_file(mod.path, blob)
+        report['downloaded'] += 1
+
+    if changed:
+        set_status('Установка модов')
+    for mod in changed:
+        target = os.path.join(profile_dir, mod.dir, mod.name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        _place(blob_store.blob_path(mod.sha1), target)
+        hash_index.forget(target)
+        report['linked'] += 1
+
+    desired = {mod.rel_path: mod.sha1 for mod in files}
+    state = _load_state(profile_dir)
+    for rel_path, sha1 in state.get('files', {}).items():
+        if rel_path in desired:
+            continue
+        target = os.path.join(profile_dir, *rel_path.split('/'))
+        try:
+            # Файл, который пользователь с тех пор заменил своим, не удаляем
+            if hash_index.sha1(target) != sha1:
+                continue
+            os.remove(target)
+        except OSError:
+            continue
+        hash_index.forget(target)
+        report['removed'] += 1
+    _save_state(profile_dir, {'files': desired})
+    hash_index.save()
+    return report
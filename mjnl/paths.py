@@ -0,0 +1,23 @@
+import os
+import sys
+
+
+def get_minecraft_directory() -> str:
+    # Как minecraft_launcher_lib.utils.get_minecraft_directory, но без импорта всей библиотеки при старте
+    if sys.platform == 'win32':
+        return os.path.join(os.getenv('APPDATA', os.path.join(os.path.expanduser('~'), 'AppData', 'Roaming')),
+                            '.minecraft')
+    if sys.platform == 'darwin':
+        return os.path.join(os.path.expanduser('~'), 'Library', 'Application Support', 'minecraft')
+    return os.path.join(os.path.expanduser('~'), '.minecraft')
+
+
+def get_launcher_directory() -> str:
+    # Данные самого лаунчера (аккаунты, конфиг, логи) — не в папке игры: там свои logs/latest.log у Minecraft
+    return os.path.join(os.getenv('APPDATA', os.path.expanduser('~')), '.MjnLauncher')
+
+
+# Путь установки Minecraft для MjnLauncher
+minecraft_directory = get_minecraft_directory().replace('minecraft', 'mjnlauncher')
+launcher_directory = get_launcher_directory()
+logs_directory = os.path.join(launcher_directory, 'logs')
@@ -0,0 +1,170 @@
+import time
+import threading
+import subprocess
+from collections import deque
+from itertools import count
+
+
+# Сколько последних строк вывода игры хранится в памяти на экземпляр
+OUTPUT_LINES = 2000
+
+
+class RingBuffer:
+    """Последние N строк вывода; старые вытесняются, запись не блокирует читателя"""
+
+    def __init__(self, max_lines: int = OUTPUT_LINES):
+        self._lines = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def append(self, line: str):
+        with self._lock:
+            self._lines.append(line)
+            self.total += 1
+
+    def lines(self, last: int = None) -> list:
+        with self._lock:
+            lines = list(self._lines)
+        return lines[-last:] if last else lines
+
+
+class GameInstance:
+    """Запущенный процесс игры: версия, аккаунт, время работы, код выхода и хвост вывода"""
+
+    def __init__(self, instance_id: int, cmd: list, version_id: str, username: str, cwd: str = None):
+        self.id = instance_id
+        self.cmd = cmd
+        self.version_id = version_id
+        self.username = username
+        self.cwd = cwd
+        self.output = RingBuffer()
+        self.process = None
+        self.started_at = 0.0
+        # Когда игра вывела первую строку (time.monotonic()); сбрасывается при перезапуске
+        self.first_output_at = None
+        self.finished_at = None
+        self.exit_code = None
+        self.restart_requested = False
+        self.stop_requested = False
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid if self.process else 0
+
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.exit_code is None
+
+    @property
+    def uptime(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at if self.started_at else 0.0
+
+
+class ProcessManager:
+    """Запуск игр через Popen без ожидания завершения; несколько экземпляров одновременно.
+
+    Вывод каждого процесса читает маленький поток-читатель (select по pipe не работает в Windows);
+    он же фиксирует код выхода. Остановка и перезапуск ничего не ждут.
+    on_change(instance) вызывается из потока-читателя при запуске и завершении экземпляра,
+    on_output(instance, line) — на каждую строку вывода; оба не должны блокировать.
+    """
+
+    def __init__(self, on_change=None, on_output=None):
+        self.on_change = on_change
+        self.on_output = on_output
+        self._ids = count(1)
+        self._lock = threading.Lock()
+        self._instances = {}
+
+    def launch(self, cmd: list, version_id: str, username: str, cwd: str = None) -> GameInstance:
+        instance = GameInstance(next(self._ids), cmd, version_id, username, cwd)
+        with self._lock:
+            self._instances[instance.id] = instance
+        try:
+            self._start(instance)
+        except OSError:
+            with self._lock:
+                del self._instances[instance.id]
+            raise
+        return instance
+
+    def _start(self, instance: GameInstance):
+        instance.exit_code = None
+        instance.first_output_at = None
+        instance.finished_at = None
+        instance.restart_requested = False
+        instance.stop_requested = False
+        instance.process = subprocess.Popen(
+            instance.cmd, cwd=instance.cwd,
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        instance.started_at = time.monotonic()
+        threading.Thread(target=self._pump, args=(instance, instance.process), daemon=True,
+                         name=f"mjnl-game-{instance.id}").start()
+        self._notify(instance)
+
+    def _pump(self, instance: GameInstance, process: subprocess.Popen):
+        # Java пишет в кодировке системы; битые байты не должны ронять чтение
+        for raw in iter(process.stdout.readline, b''):
+            line = raw.decode('utf-8', errors='replace').rstrip('\r\n')
+            if instance.first_output_at is None:
+                instance.first_output_at = time.monotonic()
+            instance.output.append(line)
+            if self.on_output is not None:
+                self.on_output(instance, line)
+        process.stdout.close()
+        instance.exit_code = process.wait()
+        instance.finished_at = time.monotonic()
+        if instance.restart_requested:
+            try:
+                self._start(instance)
+                return
+            except OSError as e:
+                instance.output.append(f"Не удалось перезапустить: {e}")
+        self._notify(instance)
+
+    def _notify(self, instance: GameInstance):
+        if self.on_change is not None:
+            self.on_change(instance)
+
+    def instances(self) -> list:
+        with self._lock:
+            return list(self._instances.values())
+
+    def running(self) -> list:
+        return [instance for instance in self.instances() if instance.running]
+
+    def get(self, instance_id: int):
+        with self._lock:
+            return self._instances.get(instance_id)
+
+    def stop(self, instance_id: int, force: bool = False):
+        """Просит процесс завершиться; повторный вызов (или force) убивает его. Выхода не ждёт."""
+        instance = self.get(instance_id)
+        if instance is None or not instance.running:
+            return
+        instance.restart_requested = False
+        if force or instance.stop_requested:
+            instance.process.kill()
+        else:
+            instance.stop_requested = True
+            instance.process.terminate()
+
+    def restart(self, instance_id: int):
+        """Перезапуск с той же командой: новый процесс стартует, когда старый завершится"""
+        instance = self.get(instance_id)
+        if instance is None:
+            return
+        if instance.running:
+            instance.restart_requested = True
+            instance.process.terminate()
+        else:
+            self._start(instance)
+
+    def forget(self, instance_id: int):
+        """Убирает завершившийся экземпляр из списка"""
+        with self._lock:
+            instance = self._instances.get(instance_id)
+            if instance is not None and not instance.running:
+                del self._instances[instance_id]
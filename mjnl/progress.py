@@ -0,0 +1,132 @@
+import time
+import threading
+from collections import deque
+from typing import NamedTuple
+
+
+# Окно, по которому считается скорость загрузки (с)
+SPEED_WINDOW = 3.0
+
+
+class ProgressSnapshot(NamedTuple):
+    progress: int
+    max_progress: int
+    label: str
+    speed: float  # байт/с, 0 — неизвестно
+    eta: float  # секунд до конца загрузки, -1 — неизвестно
+
+
+class ProgressAggregator:
+    """Собирает колбэки установки в рабочем потоке и публикует состояние не чаще rate раз в секунду.
+
+    Смена статуса и завершение этапа публикуются сразу, чтобы не терять подписи и 100%.
+    """
+
+    def __init__(self, publish, rate: float = 30):
+        self.publish = publish
+        self.interval = 1 / rate
+        self._lock = threading.Lock()
+        self._progress = 0
+        self._max = 0
+        self._label = ''
+        self._bytes_done = 0
+        self._bytes_total = 0
+        self._samples = deque()
+        self._last_publish = 0.0
+        # Номер снимка: снимок, обогнанный более новым (например, принудительным 100%), не публикуется
+        self._seq = 0
+        self._published_seq = 0
+        self._publish_lock = threading.Lock()
+
+    def callback(self) -> dict:
+        """Словарь колбэков для установки: setStatus/setProgress/setMax и байтовые addBytes/addBytesTotal"""
+        return {
+            'setStatus': self.set_status,
+            'setProgress': self.set_progress,
+            'setMax': self.set_max,
+            'addBytes': self.add_bytes,
+            'addBytesTotal': self.add_bytes_total
+        }
+
+    def set_status(self, value: str):
+        with self._lock:
+            self._label = value
+            # Новый этап: скорость считается заново, чтобы не показывать устаревшую
+            self._samples.clear()
+        self._maybe_publish(force=True)
+
+    def set_progress(self, value: int):
+        with self._lock:
+            self._progress = value
+            done = value >= self._max
+        self._maybe_publish(force=done)
+
+    def set_max(self, value: int):
+        with self._lock:
+            self._max = value
+        self._maybe_publish()
+
+    def add_bytes(self, amount: int):
+        with self._lock:
+            self._bytes_done += amount
+        self._maybe_publish()
+
+    def add_bytes_total(self, amount: int):
+        with self._lock:
+            self._bytes_total += amount
+
+    def snapshot(self, now: float = None) -> ProgressSnapshot:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return self._snapshot(now)
+
+    def _snapshot(self, now: float) -> ProgressSnapshot:
+        samples = self._samples
+        samples.append((now, self._bytes_done))
+        while len(samples) > 2 and now - samples[0][0] > SPEED_WINDOW:
+            samples.popleft()
+        elapsed = now - samples[0][0]
+        speed = (self._bytes_done - samples[0][1]) / elapsed if elapsed > 0 else 0.0
+        remaining = self._bytes_total - self._bytes_done
+        eta = remaining / speed if speed > 0 and remaining > 0 else -1.0
+        return ProgressSnapshot(self._progress, self._max, self._label, speed, eta)
+
+    def _maybe_publish(self, force: bool = False):
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_publish < self.interval:
+                return
+            self._last_publish = now
+            # Снимок и его номер берутся вместе с состоянием: порядок номеров — порядок изменений
+            snapshot = self._snapshot(now)
+            self._seq += 1
+            seq = self._seq
+        with self._publish_lock:
+            if seq < self._published_seq:
+                return
+            self._published_seq = seq
+            self.publish(snapshot)
+
+
+def format_speed(speed: float) -> str:
+    for unit in ('Б/с', 'КБ/с', 'МБ/с'):
+        if speed < 1024 or unit == 'МБ/с':
+            return f"{speed:.0f} {unit}" if unit == 'Б/с' else f"{speed:.1f} {unit}"
+        speed /= 1024
+
+
+def format_eta(seconds: float) -> str:
+    seconds = int(seconds + 0.5)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}" if hours else f"{minutes}:{seconds:02}"
+
+
+def format_transfer(snapshot: ProgressSnapshot) -> str:
+    """Строка для пользователя: скорость и оставшееся время, пусто — если ничего не качается"""
+    if snapshot.speed <= 0:
+        return ''
+    text = format_speed(snapshot.speed)
+    if snapshot.eta >= 0:
+        text += f" · осталось {format_eta(snapshot.eta)}"
+    return text
@@ -0,0 +1,249 @@
+"""Общие для всех версий Java и нативные библиотеки.
+
+Java лежит там же, где её ищет minecraft_launcher_lib: runtime/<компонент>/<платформа>/<компонент>,
+по одной копии на компонент. Установленная сборка запоминается по sha1 манифеста Mojang, поэтому
+установка версии не ходит в сеть и не пересчитывает хэши Java, пока проверка свежая. Состояние
+(.mjnl-runtime.json) со списком файлов пишется только после полной установки: по нему быстрая
+проверка перед запуском находит недокачанную или повреждённую Java.
+
+Нативы распаковываются один раз в store/natives/<ключ>: ключ — хэш содержимого jar-файлов с нативами
+и правил exclude, так что версии с одинаковым LWJGL используют одну папку.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import zipfile
+import platform
+import threading
+from typing import Optional
+from urllib.parse import urljoin
+
+from mjnl.download import DownloadEngine, DownloadTask, check_cancelled, sha1_of_file, _empty
+from mjnl.fileio import write_bytes, write_json
+from mjnl.install import InstallError, IS_32BIT, RUNTIME_MANIFEST_URL, library_tasks, _fetch_json, _load_json
+
+
+# Как часто сверять установленную Java с манифестом Mojang
+RUNTIME_CHECK_INTERVAL = 24 * 3600
+RUNTIME_STATE_FILE = '.mjnl-runtime.json'
+# Копия манифеста файлов установленной сборки: её раздаёт зеркало
+RUNTIME_MANIFEST_FILE = '.mjnl-manifest.json'
+
+
+def jvm_platform() -> str:
+    """Имя платформы в манифесте Java; совпадает с тем, что использует minecraft_launcher_lib"""
+    if sys.platform.startswith('win'):
+        return 'windows-x86' if IS_32BIT else 'windows-x64'
+    if sys.platform == 'darwin':
+        return 'mac-os-arm64' if platform.machine() == 'arm64' else 'mac-os'
+    if sys.platform.startswith('linux'):
+        return 'linux-i386' if IS_32BIT else 'linux'
+    return 'gamecore'
+
+
+def _inside(root: str, path: str) -> bool:
+    return os.path.abspath(path).startswith(os.path.abspath(root) + os.sep)
+
+
+class JavaRuntimes:
+    """Установка компонентов Java (java-runtime-gamma и т.п.) из манифеста Mojang.
+
+    manifest_url — список сборок: Mojang или зеркало. Чего нет на зеркале, ищется у Mojang.
+    """
+
+    def __init__(self, minecraft_directory: str, manifest_url: str = RUNTIME_MANIFEST_URL,
+                 check_interval: float = RUNTIME_CHECK_INTERVAL):
+        self.minecraft_directory = minecraft_directory
+        self.manifest_url = manifest_url
+        self.check_interval = check_interval
+
+    def platform_dir(self, component: str) -> str:
+        return os.path.join(self.minecraft_directory, 'runtime', component, jvm_platform())
+
+    def executable(self, component: str) -> Optional[str]:
+        java = os.path.join(self.platform_dir(component), component, 'bin', 'java')
+        for path in (java, java + '.exe',
+                     java.replace(os.path.join('bin', 'java'), os.path.join('jre.bundle', 'Contents', 'Home', 'bin', 'java'))):
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def state_path(self, component: str) -> str:
+        return os.path.join(self.platform_dir(component), RUNTIME_STATE_FILE)
+
+    def state(self, component: str) -> dict:
+        try:
+            return _load_json(self.state_path(component))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, component: str, state: dict):
+        write_json(self.state_path(component), state, indent=4)
+
+    def is_complete(self, component: str, hash_index=None) -> bool:
+        """Все файлы последней установки на месте: по размеру, а с hash_index (HashIndex) — и по sha1"""
+        files = self.state(component).get('files')
+        if not files:
+            return False
+        base = os.path.join(self.platform_dir(component), component)
+        for rel, (size, sha1) in files.items():
+            path = os.path.join(base, *rel.split('/'))
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False
+            if (size is not None and st.st_size != size) or (hash_index is not None and sha1 and hash_index.sha1(path, st) != sha1):
+                return False
+        return True
+
+    def ensure(self, component: str, callback: Optional[dict] = None, engine: Optional[DownloadEngine] = None,
+               cancel=None):
+        """Ставит или обновляет компонент. Без сети оставляет уже установленную сборку."""
+        state = self.state(component)
+        installed = self.executable(component) is not None
+        if installed and state and time.time() - state.get('checked_at', 0) < self.check_interval:
+            return
+        builds, index_url, error = None, None, None
+        for url in dict.fromkeys([self.manifest_url, RUNTIME_MANIFEST_URL]):
+            try:
+                builds = _fetch_json(url).get(jvm_platform(), {}).get(component)
+            except Exception as e:
+                error = e
+                continue
+            if builds is not None:
+                index_url = url
+                break
+        if index_url is None:
+            if installed:
+                # Без сети остаётся установленная сборка
+                return
+            raise error or InstallError(f"Java {component} не найдена для {jvm_platform()}")
+        if not builds:
+            # Для платформы нет сборки: игра запустится с системной Java
+            return
+        entry = builds[0]
+        manifest_sha1 = entry['manifest'].get('sha1')
+        # Зеркало отдаёт адрес манифеста относительно списка сборок
+        manifest = _fetch_json(urljoin(index_url, entry['manifest']['url']))
+        # Прерванная установка не должна выглядеть законченной: состояние появится только в конце
+        try:
+            os.remove(self.state_path(component))
+        except OSError:
+            pass
+        # Сборка не менялась — хватит проверки размеров; новая или чужая (без состояния) — сверяем sha1
+        files = self._install(component, manifest, verify=state.get('sha1') != manifest_sha1,
+                              callback=callback, engine=engine, cancel=cancel)
+        write_json(os.path.join(self.platform_dir(component), RUNTIME_MANIFEST_FILE), manifest)
+        write_bytes(os.path.join(self.platform_dir(component), '.version'),
+                    entry.get('version', {}).get('name', '').encode('utf-8'))
+        self._save_state(component, {'sha1': manifest_sha1, 'version': entry.get('version', {}).get('name'),
+                                     'checked_at': time.time(), 'files': files})
+
+    def _install(self, component: str, manifest: dict, verify: bool, callback: Optional[dict] = None,
+                 engine: Optional[DownloadEngine] = None, cancel=None) -> dict:
+        """Докачивает файлы компонента. Возвращает {путь: [размер, sha1]} для проверки перед запуском."""
+        base = os.path.join(self.platform_dir(component), component)
+        tasks, executables, links, files = [], [], [], {}
+        for rel, info in manifest.get('files', {}).items():
+            path = os.path.join(base, *rel.split('/'))
+            if not _inside(base, path):
+                raise InstallError(f"Java {component}: путь вне папки {rel}")
+            if info['type'] == 'directory':
+                os.makedirs(path, exist_ok=True)
+            elif info['type'] == 'file':
+                raw = info['downloads']['raw']
+                tasks.append(DownloadTask(raw['url'], path, raw.get('sha1'), None if verify else raw.get('size')))
+                files[rel] = [raw.get('size'), raw.get('sha1')]
+                if info.get('executable'):
+                    executables.append(path)
+            elif info['type'] == 'link':
+                if not _inside(base, os.path.join(os.path.dirname(path), info['target'])):
+                    raise InstallError(f"Java {component}: ссылка вне папки {rel}")
+                links.append((path, info['target']))
+        (engine or DownloadEngine()).download_all(tasks, callback, status=f"Загрузка Java {component}",
+                                                  cancel=cancel)
+        check_cancelled(cancel)
+        for path in executables:
+            mode = os.stat(path).st_mode
+            if mode & 0o111 != 0o111:
+                os.chmod(path, mode | 0o111)
+        for path, target in links:
+            if not os.path.lexists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                try:
+                    os.symlink(target, path)
+                except OSError:
+                    # Без прав на симлинки (Windows) java запускается и без них
+                    pass
+        return files
+
+
+def natives_key(natives: list) -> str:
+    """Ключ набора нативов: sha1 jar-файлов (из JSON версии, иначе по содержимому) и правила exclude"""
+    items = sorted([sha1 or sha1_of_file(path), sorted(extract.get('exclude', []))]
+                   for path, extract, sha1 in natives)
+    return hashlib.sha1(json.dumps(items).encode('utf-8')).hexdigest()[:20]
+
+
+def extract_natives(natives: list, target_dir: str):
+    os.makedirs(target_dir, exist_ok=True)
+    for jar_path, extract, _ in natives:
+        exclude = extract.get('exclude', [])
+        with zipfile.ZipFile(jar_path) as zf:
+            for name in zf.namelist():
+                if any(name.startswith(e) for e in exclude):
+                    continue
+                zf.extract(name, target_dir)
+
+
+def version_natives(version_id: str, minecraft_directory: str) -> list:
+    """Нативы версии вместе с родителями из inheritsFrom"""
+    natives = []
+    chain = []
+    while version_id and version_id not in chain:
+        chain.append(version_id)
+        data = _load_json(os.path.join(minecraft_directory, 'versions', version_id, f"{version_id}.json"))
+        natives += library_tasks(data.get('libraries', []), minecraft_directory)[1]
+        version_id = data.get('inheritsFrom')
+    return natives
+
+
+class NativesCache:
+    """Распакованные нативы в store/natives/<ключ>, общие для всех версий с тем же набором"""
+
+    def __init__(self, minecraft_directory: str):
+        self.minecraft_directory = minecraft_directory
+        self.root = os.path.join(minecraft_directory, 'store', 'natives')
+
+    def path(self, natives: list) -> str:
+        return os.path.join(self.root, natives_key(natives))
+
+    def ensure(self, natives: list, callback: Optional[dict] = None) -> Optional[str]:
+        """Папка с нативами; распаковка — только если такого набора ещё нет. None — у версии нет нативов."""
+        if not natives:
+            return None
+        path = self.path(natives)
+        if os.path.isdir(path):
+            return path
+        if callback:
+            callback.get('setStatus', _empty)('Распаковка нативных библиотек')
+        # Во временную папку и переименованием: недораспакованный набор никогда не виден под ключом
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        try:
+            extract_natives(natives, tmp_path)
+            try:
+                os.rename(tmp_path, path)
+            except OSError:
+                # Тот же набор успел распаковать другой поток или процесс
+                if not os.path.isdir(path):
+                    raise
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        return path
+
+    def for_version(self, version_id: str) -> Optional[str]:
+        return self.ensure(version_natives(version_id, self.minecraft_directory))
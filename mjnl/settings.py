@@ -0,0 +1,193 @@
+"""Настройки и аккаунты лаунчера: config.json и users.json в %APPDATA%/.MjnLauncher/client.
+
+Файл читается один раз и живёт в памяти; изменения, сделанные другим окном лаунчера, подхватываются
+по mtime/размеру файла. Запись откладывается на DEBOUNCE секунд, так что подряд идущие изменения
+уходят одной записью: под межпроцессной блокировкой, через временный файл и os.replace, поверх
+свежей версии с диска — чужие ключи и аккаунты не затираются.
+"""
+import os
+import json
+import threading
+from abc import ABC, abstractmethod
+
+from mjnl.fileio import FileLock, write_json
+
+
+DEBOUNCE = 1.0
+_MISSING = object()
+
+
+class JsonStore(ABC):
+    """JSON-файл в памяти с отложенной атомарной записью. Наследники задают пустое значение и слияние."""
+
+    def __init__(self, path: str, debounce: float = DEBOUNCE):
+        self.path = path
+        self.debounce = debounce
+        self._lock = threading.RLock()
+        self._data = None
+        self._stamp = None
+        self._timer = None
+
+    @abstractmethod
+    def _empty(self):
+        """Значение для отсутствующего или битого файла"""
+
+    @abstractmethod
+    def _merge(self, disk):
+        """Данные с диска плюс несохранённые изменения"""
+
+    @abstractmethod
+    def _has_pending(self) -> bool:
+        """Есть ли изменения, ещё не записанные на диск"""
+
+    @abstractmethod
+    def _clear_pending(self):
+        """Забывает записанные изменения"""
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        # После os.replace у файла новый inode, даже если mtime совпал до тика
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self._empty()
+        return data if isinstance(data, type(self._empty())) else self._empty()
+
+    def _current(self):
+        # Один stat на обращение; файл перечитывается, только если его поменяли снаружи
+        with self._lock:
+            stamp = self._stat()
+            if self._data is None or stamp != self._stamp:
+                self._stamp = stamp
+                self._data = self._merge(self._read())
+            return self._data
+
+    def reload(self) -> bool:
+        """Подхватывает изменения файла другим процессом. Возвращает, поменялись ли данные."""
+        with self._lock:
+            before = self._data
+            return self._current() != before
+
+    def _schedule(self):
+        # Каждое изменение откладывает запись заново: пачка изменений — одна запись
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._flush_later)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_later(self):
+        try:
+            self.flush()
+        except OSError:
+            # Изменения остаются несохранёнными: уйдут со следующей записью или при выходе
+            pass
+
+    def flush(self):
+        """Сразу записывает несохранённые изменения. Бросает OSError."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._has_pending():
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with FileLock(self.path + '.lock'):
+                # Пока мы ждали блокировку, файл могло переписать другое окно лаунчера
+                data = self._merge(self._read())
+                write_json(self.path, data, indent=4, ensure_ascii=False)
+                self._stamp = self._stat()
+            self._data = data
+            self._clear_pending()
+
+
+class Settings(JsonStore):
+    """config.json: словарь настроек; при слиянии с диском побеждают ключи, изменённые в этом окне"""
+
+    def __init__(self, path: str, debounce: float = DEBOUNCE):
+        super().__init__(path, debounce)
+        self._pending = {}
+
+    def _empty(self):
+        return {}
+
+    def _merge(self, disk):
+        merged = dict(disk)
+        merged.update(self._pending)
+        return merged
+
+    def _has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def _clear_pending(self):
+        self._pending = {}
+
+    def get(self, key: str, default=None):
+        return self._current().get(key, default)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._current()
+
+    def snapshot(self) -> dict:
+        return dict(self._current())
+
+    def update(self, values: dict):
+        """Меняет настройки; запись будет, только если что-то действительно изменилось"""
+        with self._lock:
+            data = self._current()
+            changed = {key: value for key, value in values.items() if data.get(key, _MISSING) != value}
+            if not changed:
+                return
+            self._pending.update(changed)
+            data.update(changed)
+            self._schedule()
+
+    def set(self, key: str, value):
+        self.update({key: value})
+
+
+class Accounts(JsonStore):
+    """users.json: список аккаунтов [{"nickname": ...}]; новые аккаунты дописываются к версии с диска"""
+
+    def __init__(self, path: str, debounce: float = DEBOUNCE):
+        super().__init__(path, debounce)
+        self._pending = []
+
+    def _empty(self):
+        return []
+
+    def _merge(self, disk):
+        merged = [account for account in disk if isinstance(account, dict)]
+        known = {account.get('nickname') for account in merged}
+        merged += [account for account in self._pending if account['nickname'] not in known]
+        return merged
+
+    def _has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def _clear_pending(self):
+        self._pending = []
+
+    def nicknames(self) -> list:
+        return [account.get('nickname', 'Unknown') for account in self._current()]
+
+    def add(self, nickname: str) -> bool:
+        """Добавляет аккаунт и сразу сохраняет. False — такой уже есть. Бросает OSError."""
+        with self._lock:
+            data = self._current()
+            if any(account.get('nickname') == nickname for account in data):
+                return False
+            account = {'nickname': nickname}
+            self._pending.append(account)
+            data.append(account)
+        # Аккаунты меняются редко, а терять их при сбое обиднее, чем настройки — без отсрочки
+        self.flush()
+        return True
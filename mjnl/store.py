@@ -0,0 +1,212 @@
+import os
+import json
+import shutil
+
+from mjnl.fileio import link_file
+from mjnl.installed import InstalledIndex
+from mjnl.install import INSTALLING_SUFFIX, version_file_tasks, asset_index_task, library_paths
+from mjnl.runtime import NativesCache
+from mjnl.verify import HashIndex
+
+
+# Каталоги профилей, файлы в которых не редактируются на месте и безопасны для жёстких ссылок
+PROFILE_CONTENT_DIRS = ('mods', 'resourcepacks', 'shaderpacks')
+LINKABLE_EXTENSIONS = ('.jar', '.zip')
+
+
+def _walk_files(root: str):
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            yield os.path.join(dirpath, name)
+
+
+def _remove_empty_dirs(root: str):
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        if dirpath != root and not dirnames and not filenames:
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                pass
+
+
+class BlobStore:
+    """Контентно-адресуемое хранилище: store/objects/<sha1[:2]>/<sha1>.
+
+    Одинаковые файлы в профилях и библиотеках заменяются жёсткими ссылками на один blob.
+    Если ФС не умеет жёсткие ссылки, файлы просто остаются как есть.
+    """
+
+    def __init__(self, minecraft_directory: str, hash_index: HashIndex = None):
+        self.minecraft_directory = minecraft_directory
+        self.objects_dir = os.path.join(minecraft_directory, 'store', 'objects')
+        self.hash_index = hash_index or HashIndex(minecraft_directory)
+
+    def blob_path(self, sha1: str) -> str:
+        return os.path.join(self.objects_dir, sha1[:2], sha1)
+
+    def link(self, path: str) -> int:
+        """Связывает файл с blob'ом. Возвращает число освобождённых байт."""
+        st = os.stat(path)
+        blob = self.blob_path(self.hash_index.sha1(path, st))
+        try:
+            blob_st = os.stat(blob)
+        except FileNotFoundError:
+            # Первый экземпляр содержимого становится blob'ом
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            os.link(path, blob)
+            return 0
+        if (blob_st.st_dev, blob_st.st_ino) == (st.st_dev, st.st_ino) or blob_st.st_size != st.st_size:
+            return 0
+        link_file(blob, path)
+        self.hash_index.forget(path)
+        return st.st_size if st.st_nlink == 1 else 0
+
+    def linkable_files(self) -> list:
+        files = []
+        profiles_dir = os.path.join(self.minecraft_directory, 'profiles')
+        try:
+            profiles = [entry.path for entry in os.scandir(profiles_dir) if entry.is_dir()]
+        except OSError:
+            profiles = []
+        for profile in profiles:
+            for sub in PROFILE_CONTENT_DIRS:
+                files.extend(_walk_files(os.path.join(profile, sub)))
+        files.extend(_walk_files(os.path.join(self.minecraft_directory, 'libraries')))
+        return [path for path in files if path.lower().endswith(LINKABLE_EXTENSIONS)]
+
+    def dedupe(self, paths: list = None) -> dict:
+        """Заменяет дубликаты жёсткими ссылками на blob'ы; по умолчанию — профили и библиотеки"""
+        report = {'files': 0, 'linked': 0, 'errors': 0, 'bytes_reclaimed': 0}
+        for path in (self.linkable_files() if paths is None else paths):
+            report['files'] += 1
+            try:
+                reclaimed = self.link(path)
+            except OSError:
+                report['errors'] += 1
+                continue
+            if reclaimed:
+                report['linked'] += 1
+                report['bytes_reclaimed'] += reclaimed
+        self.hash_index.save()
+        return report
+
+    def dedupe_profile(self, profile_dir: str) -> dict:
+        paths = []
+        for sub in PROFILE_CONTENT_DIRS:
+            paths.extend(p for p in _walk_files(os.path.join(profile_dir, sub))
+                         if p.lower().endswith(LINKABLE_EXTENSIONS))
+        return self.dedupe(paths)
+
+    def live_versions(self) -> list:
+        """[(id, путь к JSON)] установленных версий и тех, что сейчас ставятся (<id>.json.installing)"""
+        versions_dir = os.path.join(self.minecraft_directory, 'versions')
+        live = [(version_id, os.path.join(versions_dir, version_id, f"{version_id}.json"))
+                for version_id in InstalledIndex(self.minecraft_directory).ids()]
+        installed = {version_id for version_id, _ in live}
+        try:
+            entries = [entry for entry in os.scandir(versions_dir) if entry.is_dir() and entry.name not in installed]
+        except OSError:
+            entries = []
+        for entry in entries:
+            staged_path = os.path.join(entry.path, f"{entry.name}.json{INSTALLING_SUFFIX}")
+            if os.path.isfile(staged_path):
+                live.append((entry.name, staged_path))
+        return live
+
+    def referenced_files(self) -> tuple:
+        """Файлы libraries/, assets/ и папки store/natives/, нужные хотя бы одной установленной версии.
+
+        Возвращает (множество путей, известны ли все индексы ассетов).
+        """
+        referenced = set()
+        assets_known = True
+        natives_cache = NativesCache(self.minecraft_directory)
+        for version_id, json_path in self.live_versions():
+            # Нечитаемый JSON — не знаем, что нужно версии, поэтому gc прерывается целиком
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            index_task = asset_index_task(data, self.minecraft_directory)
+            if index_task is not None and not os.path.isfile(index_task.path):
+                assets_known = False
+            tasks, natives = version_file_tasks(version_id, data, self.minecraft_directory)
+            referenced.update(os.path.normcase(os.path.abspath(task.path)) for task in tasks)
+            # Библиотеки без url не попадают в задачи загрузки, но нужны версии так же
+            referenced.update(os.path.normcase(os.path.abspath(path))
+                              for path in library_paths(data.get('libraries', []), self.minecraft_directory))
+            # Наследники (fabric) своих нативов не добавляют: их набор совпадает с набором родителя
+            if natives:
+                try:
+                    referenced.add(os.path.normcase(os.path.abspath(natives_cache.path(natives))))
+                except OSError:
+                    # jar с нативами без sha1 в JSON и без файла — его набор и так не распакуешь
+                    pass
+        return referenced, assets_known
+
+    def gc(self, dry_run: bool = False) -> dict:
+        """Удаляет blob'ы без ссылок и библиотеки/ассеты/нативы, которые не использует ни одна версия"""
+        report = {'blobs_removed': 0, 'libraries_removed': 0, 'assets_removed': 0, 'natives_removed': 0,
+                  'bytes_reclaimed': 0}
+
+        def remove(path: str, key: str, st: os.stat_result):
+            if not dry_run:
+                try:
+                    os.remove(path)
+                except OSError:
+                    return
+                self.hash_index.forget(path)
+            report[key] += 1
+            if st.st_nlink == 1:
+                report['bytes_reclaimed'] += st.st_size
+
+        referenced, assets_known = self.referenced_files()
+        roots = [('libraries_removed', os.path.join(self.minecraft_directory, 'libraries'))]
+        # Без индекса ассетов какой-то версии неизвестно, какие объекты ей нужны — ассеты не трогаем
+        if assets_known:
+            roots.append(('assets_removed', os.path.join(self.minecraft_directory, 'assets', 'objects')))
+        for key, root in roots:
+            for path in _walk_files(root):
+                if os.path.normcase(os.path.abspath(path)) not in referenced:
+                    remove(path, key, os.stat(path))
+            if not dry_run:
+                _remove_empty_dirs(root)
+
+        # Наборы нативов без версий и распакованные по старинке в versions/<id>/natives
+        natives_dirs = []
+        for root, pattern in ((NativesCache(self.minecraft_directory).root, None),
+                              (os.path.join(self.minecraft_directory, 'versions'), 'natives')):
+            try:
+                entries = [entry.path for entry in os.scandir(root) if entry.is_dir()]
+            except OSError:
+                continue
+            natives_dirs += [os.path.join(path, pattern) for path in entries] if pattern else entries
+        for path in natives_dirs:
+            if not os.path.isdir(path) or os.path.normcase(os.path.abspath(path)) in referenced:
+                continue
+            report['natives_removed'] += 1
+            report['bytes_reclaimed'] += sum(os.path.getsize(p) for p in _walk_files(path))
+            if not dry_run:
+                shutil.rmtree(path, ignore_errors=True)
+
+        # После чистки библиотек у части blob'ов могло не остаться ссылок
+        for path in _walk_files(self.objects_dir):
+            st = os.stat(path)
+            if st.st_nlink == 1:
+                remove(path, 'blobs_removed', st)
+        if not dry_run:
+            _remove_empty_dirs(self.objects_dir)
+            self.hash_index.save()
+        return report
+
+
+if __name__ == '__main__':
+    import argparse
+    from mjnl.paths import minecraft_directory
+
+    parser = argparse.ArgumentParser(description='Дедупликация и очистка директории MJNL')
+    parser.add_argument('command', choices=['dedupe', 'gc'])
+    parser.add_argument('--dry-run', action='store_true', help='только посчитать, ничего не удалять (для gc)')
+    args = parser.parse_args()
+
+    store = BlobStore(minecraft_directory)
+    result = store.dedupe() if args.command == 'dedupe' else store.gc(dry_run=args.dry_run)
+    print(json.dumps(result, indent=4, ensure_ascii=False))
@@ -0,0 +1,299 @@
+"""Замеры этапов запуска: спаны с длительностью, объёмом загрузок и числом файлов.
+
+Каждый запуск — LaunchTrace. Законченные трассы пишутся в лог лаунчера и в историю
+cache/launch_traces.jsonl (последние MAX_TRACES), из неё строится сводка по этапам
+и собирается архив диагностики.
+"""
+import os
+import json
+import time
+import zipfile
+import platform
+import threading
+import statistics
+from contextlib import contextmanager
+
+from mjnl.download import _empty
+from mjnl.fileio import atomic_write
+from mjnl.logs import LATEST_LOG
+
+
+TRACES_FILE = 'launch_traces.jsonl'
+MAX_TRACES = 50
+
+# Этапы в порядке выполнения и их подписи в сводке
+PHASES = {
+    'prewarm_wait': 'Остановка фоновой подготовки',
+    'resolve': 'Выбор версии',
+    'fabric_lookup': 'Поиск Fabric',
+    'base_install': 'Установка версии',
+    'loader_install': 'Установка загрузчика',
+    'profile': 'Алиас и профиль',
+    'modpack': 'Сборка модов',
+    'verify': 'Проверка файлов',
+    'command': 'Команда запуска',
+    'spawn': 'Запуск JVM',
+    'first_output': 'Первая строка лога игры',
+}
+
+
+def format_size(size: int) -> str:
+    for unit in ('Б', 'КБ', 'МБ', 'ГБ'):
+        if size < 1024 or unit == 'ГБ':
+            return f"{size} {unit}" if unit == 'Б' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class Span:
+    __slots__ = ('name', 'duration', 'bytes', 'files', 'error')
+
+    def __init__(self, name: str, duration: float = 0.0, error: str = None):
+        self.name = name
+        self.duration = duration
+        self.bytes = 0
+        self.files = 0
+        # Ошибка этапа, в том числе проглоченная: запуск мог продолжиться без него
+        self.error = error
+
+    def to_dict(self) -> dict:
+        data = {'name': self.name, 'duration': round(self.duration, 4), 'bytes': self.bytes, 'files': self.files}
+        if self.error:
+            data['error'] = self.error
+        return data
+
+    def format(self) -> str:
+        text = f"{self.name} {self.duration:.2f} с"
+        if self.files:
+            text += f", файлов: {self.files}"
+        if self.bytes:
+            text += f", {format_size(self.bytes)}"
+        if self.error:
+            text += f" (ошибка: {self.error})"
+        return text
+
+
+class LaunchTrace:
+    """Трасса одного запуска. Байты и файлы загрузок достаются текущему спану через callback()."""
+
+    def __init__(self, version_id: str = ''):
+        self.version_id = version_id
+        self.started_at = time.time()
+        self._started = time.monotonic()
+        self.spans = []
+        self.duration = None
+        # None — запуск идёт, 'ok' — игра вывела первую строку, иначе 'error'
+        self.status = None
+        self.error = None
+        self._current = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str):
+        span = Span(name)
+        previous, self._current = self._current, span
+        started = time.monotonic()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = span.error or f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration = time.monotonic() - started
+            self._current = previous
+            with self._lock:
+                self.spans.append(span)
+
+    def add_span(self, name: str, duration: float, error: str = None):
+        """Этап, замеренный снаружи (например, ожидание первой строки вывода игры)"""
+        with self._lock:
+            self.spans.append(Span(name, duration, error))
+
+    def _count(self, field: str, amount: int):
+        span = self._current
+        if span is not None:
+            with self._lock:
+                setattr(span, field, getattr(span, field) + amount)
+
+    def callback(self, callback: dict = None) -> dict:
+        """Словарь колбэков установки, который вдобавок считает байты и файлы текущего этапа"""
+        callback = dict(callback or {})
+        add_bytes = callback.get('addBytes', _empty)
+        add_files = callback.get('addFiles', _empty)
+
+        def on_bytes(amount: int):
+            self._count('bytes', amount)
+            add_bytes(amount)
+
+        def on_files(amount: int):
+            self._count('files', amount)
+            add_files(amount)
+
+        callback['addBytes'] = on_bytes
+        callback['addFiles'] = on_files
+        return callback
+
+    def finish(self, status: str, error: str = None):
+        self.status = status
+        self.error = error
+        self.duration = time.monotonic() - self._started
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = [span.to_dict() for span in self.spans]
+        return {
+            'version': self.version_id,
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at)),
+            'status': self.status,
+            'error': self.error,
+            'duration': round(self.duration, 4) if self.duration is not None else None,
+            'spans': spans,
+        }
+
+    def format(self) -> str:
+        """Одна строка для лога лаунчера"""
+        with self._lock:
+            spans = '; '.join(span.format() for span in self.spans)
+        total = f" за {self.duration:.1f} с" if self.duration is not None else ''
+        result = f" — ошибка: {self.error}" if self.error else ''
+        return f"Этапы запуска {self.version_id}{total}: {spans}{result}"
+
+
+class TraceStore:
+    """История трасс запусков в cache/launch_traces.jsonl: последние MAX_TRACES, по строке на запуск"""
+
+    def __init__(self, minecraft_directory: str, limit: int = MAX_TRACES):
+        self.path = os.path.join(minecraft_directory, 'cache', TRACES_FILE)
+        self.limit = limit
+        self._lock = threading.Lock()
+
+    def recent(self, limit: int = None) -> list:
+        traces = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        traces.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        return traces[-(limit or self.limit):]
+
+    def append(self, trace: LaunchTrace):
+        with self._lock:
+            traces = self.recent(self.limit - 1) + [trace.to_dict()]
+            with atomic_write(self.path, 'w', encoding='utf-8') as f:
+                for data in traces:
+                    f.write(json.dumps(data, ensure_ascii=False) + '\n')
+
+
+class LaunchRecorder:
+    """Доводит трассы запусков до первой строки вывода игры и сохраняет их.
+
+    started() вызывается после запуска процесса, on_output() и on_exit() — из потока-читателя
+    ProcessManager. Трассу забирает тот, кто первым вынет её из словаря, поэтому первая строка,
+    пришедшая раньше started(), тоже не теряется.
+    """
+
+    def __init__(self, store: TraceStore, log=None):
+        self.store = store
+        self.log = log or _empty
+        self._pending = {}
+
+    def started(self, instance, trace: LaunchTrace):
+        self._pending[instance.id] = trace
+        if instance.first_output_at is not None:
+            self.on_output(instance)
+        elif not instance.running:
+            self.on_exit(instance)
+
+    def on_output(self, instance):
+        trace = self._pending.pop(instance.id, None)
+        if trace is not None:
+            trace.add_span('first_output', instance.first_output_at - instance.started_at)
+            self.finish(trace, 'ok')
+
+    def on_exit(self, instance):
+        trace = self._pending.pop(instance.id, None)
+        if trace is not None:
+            error = f"игра завершилась с кодом {instance.exit_code} без вывода"
+            trace.add_span('first_output', instance.uptime, error)
+            self.finish(trace, 'error', error)
+
+    def finish(self, trace: LaunchTrace, status: str, error: str = None):
+        trace.finish(status, error)
+        self.log(trace.format())
+        try:
+            self.store.append(trace)
+        except OSError as e:
+            self.log(f"Не удалось сохранить замеры запуска: {e}")
+
+
+def summarize(traces: list) -> dict:
+    """Медиана и максимум длительности, средние байты и файлы по каждому этапу"""
+    phases = {}
+    for trace in traces:
+        for span in trace.get('spans', []):
+            phases.setdefault(span['name'], []).append(span)
+    order = list(PHASES) + sorted(set(phases) - set(PHASES))
+    summary = {}
+    for name in order:
+        spans = phases.get(name)
+        if not spans:
+            continue
+        durations = [span['duration'] for span in spans]
+        summary[name] = {
+            'count': len(spans),
+            'median': statistics.median(durations),
+            'max': max(durations),
+            'bytes': sum(span.get('bytes', 0) for span in spans) // len(spans),
+            'files': sum(span.get('files', 0) for span in spans) // len(spans),
+            'errors': sum(1 for span in spans if span.get('error')),
+        }
+    return summary
+
+
+def format_summary(traces: list, last: int = 10) -> str:
+    """Текстовая сводка: последние запуски и таблица этапов"""
+    if not traces:
+        return 'Запусков ещё не было.'
+    lines = ['Последние запуски:']
+    for trace in traces[-last:][::-1]:
+        duration = f"{trace['duration']:.1f} с" if trace.get('duration') is not None else '—'
+        state = 'ок' if trace.get('status') == 'ok' else f"ошибка: {trace.get('error') or trace.get('status')}"
+        slowest = max(trace.get('spans', []), key=lambda span: span['duration'], default=None)
+        hint = f", дольше всего — {PHASES.get(slowest['name'], slowest['name'])}" if slowest else ''
+        lines.append(f"  {trace.get('started_at', '')}  {trace.get('version', '')}: {duration}{hint} ({state})")
+    lines += ['', f"Этапы, запусков: {len(traces)} (медиана / максимум, с):"]
+    for name, row in summarize(traces).items():
+        text = f"  {PHASES.get(name, name)}: {row['median']:.2f} / {row['max']:.2f}"
+        if row['files']:
+            text += f", в среднем файлов: {row['files']}"
+        if row['bytes']:
+            text += f", {format_size(row['bytes'])}"
+        if row['errors']:
+            text += f", ошибок: {row['errors']}"
+        lines.append(text)
+    return '\n'.join(lines)
+
+
+def export_diagnostics(path: str, minecraft_directory: str, traces: list, logs_dir: str = None,
+                       extra: dict = None) -> str:
+    """Архив диагностики: трассы, сводка, сведения о системе и текущий лог лаунчера. Возвращает путь."""
+    system = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'minecraft_directory': minecraft_directory,
+    }
+    system.update(extra or {})
+    with atomic_write(path) as f, zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('launch_traces.json', json.dumps(traces, indent=4, ensure_ascii=False))
+        archive.writestr('summary.json', json.dumps(summarize(traces), indent=4, ensure_ascii=False))
+        archive.writestr('summary.txt', format_summary(traces, last=len(traces)))
+        archive.writestr('system.json', json.dumps(system, indent=4, ensure_ascii=False))
+        latest = os.path.join(logs_dir, LATEST_LOG) if logs_dir else None
+        if latest and os.path.isfile(latest):
+            archive.write(latest, f'logs/{LATEST_LOG}')
+    return path
@@ -0,0 +1,115 @@
+import os
+import json
+import threading
+
+from mjnl.download import DownloadTask, sha1_of_file
+from mjnl.fileio import write_json
+from mjnl.install import version_file_tasks, install_version, RESOURCES_URL
+from mjnl.runtime import JavaRuntimes
+
+
+# Режимы проверки перед запуском
+VERIFY_OFF = 'off'
+VERIFY_FAST = 'fast'  # библиотеки, клиент, log-конфиг и размеры файлов Java; ассеты не трогаем
+VERIFY_FULL = 'full'  # все файлы версии, включая ассеты и sha1 файлов Java
+
+
+class HashIndex:
+    """Постоянный индекс (путь, размер, mtime) -> sha1: неизменённые файлы повторно не хэшируются"""
+
+    def __init__(self, minecraft_directory: str):
+        self.minecraft_directory = minecraft_directory
+        self.path = os.path.join(minecraft_directory, 'cache', 'hash_index.json')
+        self._lock = threading.Lock()
+        self._entries = None
+        self._dirty = False
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except Exception:
+                self._entries = {}
+        return self._entries
+
+    def sha1(self, path: str, st: os.stat_result = None) -> str:
+        """sha1 файла: из индекса, если размер и mtime не менялись, иначе пересчитывается"""
+        st = st or os.stat(path)
+        key = os.path.relpath(path, self.minecraft_directory)
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is not None and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+        digest = sha1_of_file(path)
+        with self._lock:
+            self._load()[key] = [st.st_size, st.st_mtime_ns, digest]
+            self._dirty = True
+        return digest
+
+    def forget(self, path: str):
+        with self._lock:
+            if self._load().pop(os.path.relpath(path, self.minecraft_directory), None) is not None:
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            write_json(self.path, self._entries)
+            self._dirty = False
+
+
+def _version_chain(version_id: str, minecraft_directory: str) -> list:
+    chain = []
+    current = version_id
+    while current and current not in [v for v, _ in chain]:
+        with open(os.path.join(minecraft_directory, 'versions', current, f"{current}.json"), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        chain.append((current, data))
+        current = data.get('inheritsFrom')
+    return chain
+
+
+def verify_version(version_id: str, minecraft_directory: str, hash_index: HashIndex,
+                   mode: str = VERIFY_FULL, resources_url: str = RESOURCES_URL) -> list:
+    """Проверяет файлы версии и её родителей. Возвращает список битых/отсутствующих DownloadTask.
+
+    Недоустановленная Java попадает в список задачей с путём её состояния: repair_version удаляет
+    его, и установка ставит компонент заново со сверкой sha1.
+    """
+    if mode == VERIFY_OFF:
+        return []
+    bad = []
+    runtimes = JavaRuntimes(minecraft_directory)
+    for chain_id, data in _version_chain(version_id, minecraft_directory):
+        component = data.get('javaVersion', {}).get('component')
+        if component and not runtimes.is_complete(component, hash_index if mode == VERIFY_FULL else None):
+            bad.append(DownloadTask('', runtimes.state_path(component)))
+        tasks, _ = version_file_tasks(chain_id, data, minecraft_directory, resources_url,
+                                      include_assets=mode == VERIFY_FULL)
+        for task in tasks:
+            try:
+                st = os.stat(task.path)
+            except OSError:
+                bad.append(task)
+                continue
+            if task.size is not None and st.st_size != task.size:
+                bad.append(task)
+            elif task.sha1 is not None and hash_index.sha1(task.path, st) != task.sha1:
+                bad.append(task)
+    hash_index.save()
+    return bad
+
+
+def repair_version(version_id: str, minecraft_directory: str, bad: list, hash_index: HashIndex,
+                   callback: dict = None, **install_kwargs):
+    """Удаляет битые файлы и докачивает их обычной установкой (она же заново распакует нативы)"""
+    for task in bad:
+        hash_index.forget(task.path)
+        try:
+            os.remove(task.path)
+        except OSError:
+            pass
+    hash_index.save()
+    install_version(version_id, minecraft_directory, callback, **install_kwargs)
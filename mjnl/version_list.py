@@ -0,0 +1,75 @@
+from bisect import bisect_left
+from typing import NamedTuple, Optional
+
+
+class VersionRecord(NamedTuple):
+    version_id: str
+    type: Optional[str]
+    installed: bool
+    loader: str = ''
+
+    @property
+    def key(self) -> str:
+        """Имя, под которым версия запускается и сохраняется в конфиге: "1.21.8" или "1.21.8 fabric" """
+        return f"{self.version_id} {self.loader}" if self.loader else self.version_id
+
+    @property
+    def display(self) -> str:
+        status_icon = "✅" if self.installed else "⬇️"
+        return f"{status_icon} {self.key}"
+
+
+def build_records(versions: list, installed: frozenset, offline: bool, fabric_supported) -> list:
+    """Записи списка версий: базовая версия и, в онлайне, «виртуальная» fabric-строка"""
+    records = []
+    for version in versions:
+        vid = version.get('id')
+        if not vid:
+            continue
+        record = VersionRecord(vid, version.get('type'), vid in installed)
+        records.append(record)
+        if not offline and fabric_supported(vid):
+            records.append(record._replace(loader='fabric'))
+    return records
+
+
+def _is_subsequence(query: str, text: str) -> bool:
+    it = iter(text)
+    return all(ch in it for ch in query)
+
+
+class VersionSearchIndex:
+    """Поиск по ключам версий: префикс через бинарный поиск, нечёткий — по подпоследовательности.
+
+    Поиск инкрементальный: если запрос дополняет предыдущий, перебираются только прошлые совпадения.
+    """
+
+    def __init__(self, keys: list):
+        self._keys = list(keys)
+        self._sorted = sorted(key.lower() for key in self._keys)
+        self._lower = {key.lower(): key for key in self._keys}
+        self._last_query = ''
+        self._last_result = None
+
+    def prefix(self, query: str) -> set:
+        result = set()
+        i = bisect_left(self._sorted, query)
+        while i < len(self._sorted) and self._sorted[i].startswith(query):
+            result.add(self._lower[self._sorted[i]])
+            i += 1
+        return result
+
+    def match(self, query: str) -> Optional[set]:
+        """Множество подходящих ключей или None для пустого запроса (без фильтра)"""
+        query = query.strip().lower()
+        if not query:
+            self._last_query, self._last_result = '', None
+            return None
+        if self._last_result is not None and query.startswith(self._last_query):
+            candidates = self._last_result
+        else:
+            candidates = self._keys
+        result = self.prefix(query)
+        result.update(key for key in candidates if key not in result and _is_subsequence(query, key.lower()))
+        self._last_query, self._last_result = query, result
+        return result
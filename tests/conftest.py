@@ -0,0 +1,82 @@
+import os
+import re
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import synthetic
+from mjnl.mirror import MANIFEST_PATH, FABRIC_PREFIX
+from mjnl.mirror_server import MirrorServer
+
+
+@pytest.fixture(scope='session')
+def upstream(tmp_path_factory):
+    """Локальная заглушка серверов Mojang и fabric-meta: синтетические версии за MirrorServer"""
+    root = str(tmp_path_factory.mktemp('upstream'))
+    server = MirrorServer(root, ('127.0.0.1', 0)).start()
+    info = synthetic.build_upstream(root, server.url, versions=6, assets=40, libraries=8, libraries_per_version=4,
+                                    fabric_every=2)
+    info.update(root=root, url=server.url, manifest_url=server.url + MANIFEST_PATH,
+                meta_url=server.url + FABRIC_PREFIX, resources_url=server.url + '/assets/objects')
+    yield info
+    server.shutdown()
+
+
+class FileServer:
+    """HTTP-сервер из словаря {путь: байты или объект JSON} с Range и журналом запросов"""
+
+    def __init__(self):
+        self.files = {}
+        self.requests = []
+        self.delay = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append((self.path, self.headers.get('Range')))
+                if server.delay:
+                    time.sleep(server.delay)
+                data = server.files.get(self.path)
+                if data is None:
+                    self.send_error(404)
+                    return
+                if not isinstance(data, bytes):
+                    data = json.dumps(data).encode('utf-8')
+                start = 0
+                match = re.match(r'bytes=(\d+)-$', self.headers.get('Range') or '')
+                if match:
+                    start = int(match.group(1))
+                    self.send_response(206)
+                    self.send_header('Content-Range', f'bytes {start}-{len(data) - 1}/{len(data)}')
+                else:
+                    self.send_response(200)
+                self.send_header('Content-Length', str(len(data) - start))
+                self.end_headers()
+                self.wfile.write(data[start:])
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def hits(self, path: str) -> int:
+        return sum(1 for requested, _ in self.requests if requested == path)
+
+
+@pytest.fixture
+def file_server():
+    server = FileServer()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from mjnl import cli
+from mjnl.launch import LauncherCore, LaunchError
+
+
+def _events(output: str) -> list:
+    return [json.loads(line) for line in output.splitlines()]
+
+
+def _args(upstream, tmp_path, meta_url=None) -> list:
+    return ['--json', '--minecraft-directory', str(tmp_path), '--manifest-url', upstream['manifest_url'],
+            '--fabric-meta-url', meta_url or upstream['meta_url'], '--resources-url', upstream['resources_url']]
+
+
+def test_launch_reports_unexpected_error_as_json(upstream, tmp_path, monkeypatch, capsys):
+    def fail(*args, **kwargs):
+        raise KeyError('libraries')
+
+    monkeypatch.setattr(LauncherCore, 'prepare_launch', fail)
+    code = cli.main(_args(upstream, tmp_path) + ['launch', upstream['versions'][0], '--username', 'Steve'])
+    assert code == 1
+    events = _events(capsys.readouterr().out)
+    assert events[-1]['event'] == 'error'
+    assert events[-1]['cause'] == "KeyError: 'libraries'"
+    trace = LauncherCore(str(tmp_path)).launch_traces.recent()[-1]
+    assert trace['status'] == 'error'
+
+
+def test_failed_fabric_install_has_cause(upstream, tmp_path):
+    core = LauncherCore(str(tmp_path), manifest_url=upstream['manifest_url'], meta_url='http://127.0.0.1:1/meta',
+                        resources_url=upstream['resources_url'])
+    with pytest.raises(LaunchError) as info:
+        core.install(f"{upstream['fabric'][0]} fabric")
+    assert info.value.cause.startswith('ConnectionError')
+    assert isinstance(info.value.__cause__, Exception)
+
+
+def test_failed_install_in_cli_json(upstream, tmp_path, capsys):
+    code = cli.main(_args(upstream, tmp_path, 'http://127.0.0.1:1/meta') + ['install', f"{upstream['fabric'][0]} fabric"])
+    assert code == 1
+    errors = [event for event in _events(capsys.readouterr().out) if event['event'] == 'error']
+    assert errors and errors[0]['cause']
@@ -0,0 +1,91 @@
+import os
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mjnl.download import DownloadEngine, DownloadTask, DownloadCancelled, DownloadError
+from mjnl.install import install_version
+from mjnl.mirror import Mirror
+
+
+def test_dead_mirror_is_tried_once(upstream, tmp_path):
+    md = str(tmp_path)
+    mirror = Mirror('http://127.0.0.1:1', md)
+    engine = DownloadEngine(max_workers=2, mirror=mirror)
+    started = time.monotonic()
+    install_version(upstream['versions'][0], md, engine=engine, resources_url=upstream['resources_url'],
+                    manifest_url=upstream['manifest_url'])
+    # Без отключения зеркала каждый файл ждал бы повторов с паузами 0.5 + 1 + 2 с
+    assert time.monotonic() - started < 5
+    assert engine._dead_mirror is mirror
+    assert os.path.isfile(os.path.join(md, 'versions', upstream['versions'][0], f"{upstream['versions'][0]}.json"))
+
+
+def _task(server, tmp_path, name: str, data: bytes) -> DownloadTask:
+    server.files[f'/{name}'] = data
+    return DownloadTask(f"{server.url}/{name}", str(tmp_path / name), hashlib.sha1(data).hexdigest(), len(data))
+
+
+def test_part_file_is_resumed_with_range(file_server, tmp_path):
+    data = os.urandom(300_000)
+    task = _task(file_server, tmp_path, 'lib.jar', data)
+    with open(task.path + '.part', 'wb') as f:
+        f.write(data[:100_000])
+    received = []
+    DownloadEngine().download_all([task], {'addBytes': received.append})
+    assert file_server.requests == [('/lib.jar', 'bytes=100000-')]
+    assert sum(received) == 200_000
+    with open(task.path, 'rb') as f:
+        assert f.read() == data
+    assert not os.path.exists(task.path + '.part')
+
+
+def test_corrupt_part_file_is_downloaded_again(file_server, tmp_path):
+    data = os.urandom(50_000)
+    task = _task(file_server, tmp_path, 'lib.jar', data)
+    with open(task.path + '.part', 'wb') as f:
+        f.write(b'x' * 10_000)
+    DownloadEngine(retries=1).download_all([task])
+    with open(task.path, 'rb') as f:
+        assert f.read() == data
+    assert file_server.requests[-1] == ('/lib.jar', None)
+
+
+def test_bandwidth_limit(file_server, tmp_path):
+    task = _task(file_server, tmp_path, 'asset', os.urandom(250_000))
+    started = time.monotonic()
+    # Первую секунду ограничитель отдаёт запасом (rate байт), остальное — по 100 КБ/с
+    DownloadEngine(bandwidth_limit=100_000).download_all([task])
+    assert time.monotonic() - started >= 1.3
+
+
+def test_same_file_is_downloaded_once(file_server, tmp_path):
+    task = _task(file_server, tmp_path, 'shared.jar', os.urandom(10_000))
+    file_server.delay = 0.3
+    engine = DownloadEngine()
+    # Повтор в одном списке и та же задача в параллельной установке
+    with ThreadPoolExecutor(2) as pool:
+        for future in [pool.submit(engine.download_all, [task, task]) for _ in range(2)]:
+            future.result()
+    assert file_server.hits('/shared.jar') == 1
+    assert os.path.isfile(task.path)
+
+
+def test_cancel_keeps_part_file(file_server, tmp_path):
+    task = _task(file_server, tmp_path, 'client.jar', os.urandom(2_000_000))
+    cancel = threading.Event()
+    with pytest.raises(DownloadCancelled):
+        DownloadEngine(bandwidth_limit=500_000).download_all([task], {'addBytes': lambda n: cancel.set()},
+                                                             cancel=cancel)
+    assert not os.path.exists(task.path)
+    assert 0 < os.path.getsize(task.path + '.part') < 2_000_000
+
+
+def test_missing_file_is_not_retried(file_server, tmp_path):
+    task = DownloadTask(f"{file_server.url}/missing.jar", str(tmp_path / 'missing.jar'))
+    with pytest.raises(DownloadError):
+        DownloadEngine(retries=3).download_all([task])
+    assert file_server.hits('/missing.jar') == 1
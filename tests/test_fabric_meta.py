@@ -0,0 +1,53 @@
+import pytest
+
+from mjnl.fabric_meta import FabricMetaCache
+
+
+GAME = [{'version': '1.21.8', 'stable': True}, {'version': '25w14a', 'stable': False}]
+LOADER = [{'version': '0.17.0', 'stable': False}, {'version': '0.16.14', 'stable': True}]
+
+
+@pytest.fixture
+def meta(file_server):
+    file_server.files['/meta/versions/game'] = GAME
+    file_server.files['/meta/versions/loader'] = LOADER
+    return file_server
+
+
+def test_refresh_saves_snapshot(meta, tmp_path):
+    cache = FabricMetaCache(str(tmp_path), meta.url + '/meta')
+    assert cache.refresh()
+    assert cache.supports('1.21.8') and cache.supports('25w14a')
+    assert not cache.supports('1.21.9')
+    assert cache.latest_loader() == '0.16.14'
+    # Новый экземпляр берёт снимок с диска, без сети
+    restored = FabricMetaCache(str(tmp_path), 'http://127.0.0.1:1/meta')
+    assert restored.load()
+    assert restored.supports('1.21.8')
+
+
+def test_fresh_snapshot_is_not_refetched(meta, tmp_path):
+    cache = FabricMetaCache(str(tmp_path), meta.url + '/meta')
+    cache.refresh()
+    assert not cache.refresh()
+    assert meta.hits('/meta/versions/game') == 1
+    # Принудительное обновление с теми же данными ничего не меняет
+    assert not cache.refresh(force=True)
+    assert meta.hits('/meta/versions/game') == 2
+
+
+def test_expired_snapshot_is_refetched(meta, tmp_path):
+    cache = FabricMetaCache(str(tmp_path), meta.url + '/meta', ttl=0)
+    cache.refresh()
+    meta.files['/meta/versions/game'] = GAME + [{'version': '1.22', 'stable': True}]
+    assert cache.refresh()
+    assert cache.supports('1.22')
+
+
+def test_offline_keeps_old_snapshot(meta, tmp_path):
+    FabricMetaCache(str(tmp_path), meta.url + '/meta').refresh()
+    offline = FabricMetaCache(str(tmp_path), 'http://127.0.0.1:1/meta', ttl=0, timeout=2)
+    with pytest.raises(Exception):
+        offline.refresh()
+    assert offline.supports('1.21.8')
+    assert offline.latest_loader() == '0.16.14'
@@ -0,0 +1,33 @@
+import os
+import stat
+
+import pytest
+
+from mjnl.fileio import atomic_write, write_json
+
+
+def test_atomic_write_leaves_no_temp_file_on_error(tmp_path):
+    path = tmp_path / 'data.json'
+    write_json(str(path), {'a': 1})
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path), 'w', encoding='utf-8') as f:
+            f.write('{"a": ')
+            raise RuntimeError('interrupted')
+    assert path.read_text(encoding='utf-8') == '{"a": 1}'
+    assert os.listdir(tmp_path) == ['data.json']
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='права POSIX')
+def test_atomic_write_modes(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        new_path = tmp_path / 'new.json'
+        write_json(str(new_path), {})
+        assert stat.S_IMODE(os.stat(new_path).st_mode) == 0o644
+        kept_path = tmp_path / 'kept.sh'
+        kept_path.write_text('')
+        os.chmod(kept_path, 0o755)
+        write_json(str(kept_path), {})
+        assert stat.S_IMODE(os.stat(kept_path).st_mode) == 0o755
+    finally:
+        os.umask(umask)
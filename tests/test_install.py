@@ -0,0 +1,57 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from mjnl.download import DownloadEngine, DownloadCancelled
+from mjnl.install import INSTALLING_SUFFIX, install_version
+from mjnl.launch import LauncherCore
+
+
+def _core(upstream, minecraft_directory) -> LauncherCore:
+    return LauncherCore(str(minecraft_directory), DownloadEngine(max_workers=2), manifest_url=upstream['manifest_url'],
+                        meta_url=upstream['meta_url'], resources_url=upstream['resources_url'])
+
+
+def test_concurrent_installs_of_one_version(upstream, tmp_path):
+    version_id = upstream['fabric'][0]
+    core = _core(upstream, tmp_path)
+    with ThreadPoolExecutor(2) as pool:
+        results = list(pool.map(core.install, [version_id, f"{version_id} fabric"]))
+    assert results[0] == (version_id, None)
+    assert results[1][0].startswith('fabric-loader-')
+    version_dir = tmp_path / 'versions' / version_id
+    assert (version_dir / f"{version_id}.json").is_file()
+    assert not (version_dir / f"{version_id}.json{INSTALLING_SUFFIX}").exists()
+    assert core.verify(version_id, 'full', repair=False) == []
+
+
+def test_concurrent_install_version_calls(upstream, tmp_path):
+    version_id = upstream['versions'][1]
+    barrier = threading.Barrier(3)
+
+    def install():
+        barrier.wait()
+        install_version(version_id, str(tmp_path), resources_url=upstream['resources_url'],
+                        manifest_url=upstream['manifest_url'])
+
+    with ThreadPoolExecutor(3) as pool:
+        for future in [pool.submit(install) for _ in range(3)]:
+            future.result()
+    assert (tmp_path / 'versions' / version_id / f"{version_id}.json").is_file()
+
+
+def test_cancelled_install_resumes(upstream, tmp_path):
+    version_id = upstream['versions'][2]
+    core = _core(upstream, tmp_path)
+    cancel = threading.Event()
+    try:
+        core.install(version_id, {'addFiles': lambda n: cancel.set()}, cancel=cancel)
+    except DownloadCancelled:
+        pass
+    json_path = os.path.join(str(tmp_path), 'versions', version_id, f"{version_id}.json")
+    assert not os.path.isfile(json_path)
+    assert os.path.isfile(json_path + INSTALLING_SUFFIX)
+    core.installed_index.invalidate()
+    assert core.install(version_id) == (version_id, None)
+    assert os.path.isfile(json_path)
+    assert core.verify(version_id, 'full', repair=False) == []
@@ -0,0 +1,20 @@
+import re
+import sys
+
+import jvm_startup
+
+
+def _script(code: str) -> list:
+    return [sys.executable, '-c', code]
+
+
+def test_time_to_marker_stops_at_marker():
+    cmd = _script("import time; print('loading', flush=True); time.sleep(0.3); "
+                  "print('[Sound Library Loader/INFO]: Sound engine started', flush=True); time.sleep(30)")
+    elapsed = jvm_startup.time_to_marker(cmd, re.compile('Sound engine started'), timeout=20)
+    assert 0.3 <= elapsed < 10
+
+
+def test_time_to_marker_without_marker():
+    cmd = _script("print('crashed', flush=True)")
+    assert jvm_startup.time_to_marker(cmd, re.compile('Sound engine started'), timeout=20) is None
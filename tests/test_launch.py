@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from mjnl.launch import LauncherCore, LaunchError
+from mjnl.timing import LaunchTrace
+
+
+def test_prepare_profile_reports_unusable_folder(tmp_path):
+    core = LauncherCore(str(tmp_path))
+    game_dir = core.profile_dir('1.20.1', 'fabric')
+    os.makedirs(os.path.dirname(game_dir), exist_ok=True)
+    with open(game_dir, 'w') as f:
+        f.write('not a folder')
+    with pytest.raises(LaunchError) as info:
+        core.prepare_profile('1.20.1', 'fabric')
+    assert info.value.cause
+
+
+def test_prepare_profile_records_dedupe_error(tmp_path, monkeypatch):
+    core = LauncherCore(str(tmp_path))
+
+    def fail(game_dir):
+        raise PermissionError('store is read-only')
+
+    monkeypatch.setattr(core.blob_store, 'dedupe_profile', fail)
+    trace = LaunchTrace('1.20.1 fabric')
+    with trace.span('profile') as span:
+        game_dir = core.prepare_profile('1.20.1', 'fabric', span)
+    assert os.path.isdir(os.path.join(game_dir, 'mods'))
+    assert 'PermissionError' in trace.spans[-1].error
@@ -0,0 +1,58 @@
+import os
+import json
+import random
+
+from mjnl.logs import INDEX_SUFFIX, LATEST_LOG, Bloom, LogPipeline, LogStore, compress_log
+
+
+def _write_log(path, lines: int):
+    rng = random.Random(1)
+    words = ['Loading', 'chunk', 'entity', 'Render', 'thread', 'texture', 'sound', 'resource', 'block', 'item']
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(lines):
+            f.write(f"[12:00:{i % 60:02}] [Render thread/INFO]: {' '.join(rng.choice(words) for _ in range(5))} #{i}\n")
+        f.write('java.lang.OutOfMemoryError: Java heap space\n')
+
+
+def test_bloom_false_positive_rate():
+    tokens = [f"token{i}" for i in range(2000)]
+    bloom = Bloom.for_tokens(len(tokens))
+    bloom.add_tokens(tokens)
+    assert all(bloom.may_contain(token) for token in tokens)
+    false_positives = sum(bloom.may_contain(f"other{i}") for i in range(10000))
+    assert false_positives < 300
+    # ~10 бит на слово при 1% ложных срабатываний
+    assert len(bloom.bits) * 8 < 12 * len(tokens)
+
+
+def test_compressed_log_search_and_index_size(tmp_path):
+    src = tmp_path / 'src.log'
+    _write_log(src, 60000)
+    archive = str(tmp_path / '2026-01-01-1.log.gz')
+    compress_log(str(src), archive)
+    assert len(json.load(open(archive + INDEX_SUFFIX, encoding='utf-8'))['members']) > 1
+    assert os.path.getsize(archive + INDEX_SUFFIX) < os.path.getsize(archive) / 4
+
+    store = LogStore(str(tmp_path))
+    assert store.search('OutOfMemoryError') == [(os.path.basename(archive), 60000,
+                                                 'java.lang.OutOfMemoryError: Java heap space')]
+    assert store.search('#12345', whole_words=False)[0][1] == 12345
+    assert store.search('nothing-like-this') == []
+
+
+def test_second_pipeline_does_not_take_latest_log(tmp_path):
+    logs_dir = str(tmp_path)
+    first = LogPipeline(logs_dir)
+    first.log('first window')
+    second = LogPipeline(logs_dir)
+    second.log('second window')
+    assert first.primary and not second.primary
+    second.close()
+    first.close()
+    with open(os.path.join(logs_dir, LATEST_LOG), encoding='utf-8') as f:
+        assert 'first window' in f.read()
+
+    # Следующий старт архивирует оба лога
+    LogPipeline(logs_dir).close()
+    results = LogStore(logs_dir).search('window')
+    assert sorted(text.split(': ')[-1] for _, _, text in results) == ['first window', 'second window']
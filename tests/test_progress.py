@@ -0,0 +1,71 @@
+import time
+import threading
+
+from mjnl.progress import ProgressAggregator
+
+
+def test_published_progress_never_goes_back():
+    published = []
+    aggregator = ProgressAggregator(published.append, rate=1000)
+    callback = aggregator.callback()
+    total = 2000
+    callback['setMax'](total)
+    stop = threading.Event()
+
+    def download():
+        # Потоки загрузки сообщают байты, пока основной поток двигает счётчик файлов
+        while not stop.is_set():
+            callback['addBytes'](1)
+
+    workers = [threading.Thread(target=download) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for done in range(1, total + 1):
+        callback['setProgress'](done)
+    stop.set()
+    for worker in workers:
+        worker.join()
+
+    progress = [snapshot.progress for snapshot in published]
+    assert progress == sorted(progress)
+    assert progress[-1] == total
+
+
+def test_final_progress_is_published_immediately():
+    published = []
+    aggregator = ProgressAggregator(published.append, rate=1)
+    callback = aggregator.callback()
+    callback['setMax'](10)
+    for done in range(1, 11):
+        callback['setProgress'](done)
+    assert published[-1].progress == 10
+
+
+def test_stale_snapshot_does_not_overtake_final():
+    published = []
+    worker_ident = []
+
+    def publish(snapshot):
+        # Подписчик медленно принимает снимок из потока загрузки; тем временем основной поток шлёт 100%
+        if threading.get_ident() in worker_ident:
+            time.sleep(0.2)
+        published.append(snapshot)
+
+    aggregator = ProgressAggregator(publish, rate=1000)
+    callback = aggregator.callback()
+    callback['setMax'](2)
+    callback['setProgress'](1)
+
+    def download():
+        worker_ident.append(threading.get_ident())
+        time.sleep(0.01)
+        callback['addBytes'](100)
+
+    worker = threading.Thread(target=download)
+    worker.start()
+    time.sleep(0.05)
+    callback['setProgress'](2)
+    worker.join()
+    progress = [snapshot.progress for snapshot in published]
+    assert progress == sorted(progress)
+    assert progress[-1] == 2
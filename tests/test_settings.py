@@ -0,0 +1,28 @@
+import pytest
+
+from mjnl.settings import Accounts, JsonStore, Settings
+
+
+def test_json_store_requires_hooks(tmp_path):
+    with pytest.raises(TypeError):
+        JsonStore(str(tmp_path / 'store.json'))
+
+
+def test_two_windows_keep_each_others_settings(tmp_path):
+    path = str(tmp_path / 'config.json')
+    first, second = Settings(path), Settings(path)
+    first.set('mirror', 'http://127.0.0.1:8765')
+    second.set('selected_version', '1.21.8')
+    first.flush()
+    second.flush()
+    assert Settings(path).snapshot() == {'mirror': 'http://127.0.0.1:8765', 'selected_version': '1.21.8'}
+
+
+def test_accounts_are_merged(tmp_path):
+    path = str(tmp_path / 'users.json')
+    first, second = Accounts(path), Accounts(path)
+    assert first.add('Alex')
+    assert second.add('Steve')
+    first.flush()
+    second.flush()
+    assert sorted(Accounts(path).nicknames()) == ['Alex', 'Steve']
@@ -0,0 +1,53 @@
+import os
+import json
+
+from mjnl.download import DownloadEngine
+from mjnl.install import INSTALLING_SUFFIX, install_version
+from mjnl.store import BlobStore
+
+
+def _write_version(minecraft_directory, version_id: str, data: dict, suffix: str = ''):
+    version_dir = os.path.join(minecraft_directory, 'versions', version_id)
+    os.makedirs(version_dir, exist_ok=True)
+    with open(os.path.join(version_dir, f"{version_id}.json{suffix}"), 'w', encoding='utf-8') as f:
+        json.dump(dict(data, id=version_id), f)
+
+
+def _write_library(minecraft_directory, rel: str) -> str:
+    path = os.path.join(minecraft_directory, 'libraries', *rel.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'jar')
+    return path
+
+
+def test_gc_keeps_libraries_without_url(upstream, tmp_path):
+    md = str(tmp_path)
+    base = upstream['versions'][0]
+    install_version(base, md, engine=DownloadEngine(max_workers=2), resources_url=upstream['resources_url'],
+                    manifest_url=upstream['manifest_url'])
+    forge_jar = _write_library(md, 'net/minecraftforge/forge/1.0/forge-1.0.jar')
+    maven_jar = _write_library(md, 'optifine/OptiFine/1.0/OptiFine-1.0.jar')
+    _write_version(md, 'forge', {'inheritsFrom': base, 'libraries': [
+        {'name': 'net.minecraftforge:forge:1.0', 'downloads': {'artifact': {
+            'path': 'net/minecraftforge/forge/1.0/forge-1.0.jar', 'url': '', 'sha1': 'x', 'size': 3}}},
+        {'name': 'optifine:OptiFine:1.0'},
+    ]})
+    orphan = _write_library(md, 'org/unused/unused/1.0/unused-1.0.jar')
+
+    report = BlobStore(md).gc()
+    assert os.path.isfile(forge_jar)
+    assert os.path.isfile(maven_jar)
+    assert not os.path.isfile(orphan)
+    assert report['libraries_removed'] == 1
+
+
+def test_gc_keeps_files_of_version_being_installed(tmp_path):
+    md = str(tmp_path)
+    jar = _write_library(md, 'org/example/lib/1.0/lib-1.0.jar')
+    _write_version(md, 'staged', {'libraries': [{'name': 'org.example:lib:1.0', 'downloads': {'artifact': {
+        'path': 'org/example/lib/1.0/lib-1.0.jar', 'url': 'http://127.0.0.1:1/lib-1.0.jar'}}}]},
+                   suffix=INSTALLING_SUFFIX)
+
+    BlobStore(md).gc()
+    assert os.path.isfile(jar)